@@ -49,6 +49,31 @@ if not SECRET_KEY and not DEBUG:
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
 TELEGRAM_BOT_NAME = os.getenv("TELEGRAM_BOT_NAME", "pulse_zone_tech_bot")
+# Клиент Bot API (integrations/telegram_client.py): базовый URL можно
+# направить на локальную заглушку для тестов и бенчмарков
+TELEGRAM_API_BASE_URL = os.getenv("TELEGRAM_API_BASE_URL", "https://api.telegram.org")
+TELEGRAM_TIMEOUT_SECONDS = float(os.getenv("TELEGRAM_TIMEOUT_SECONDS", "5"))
+TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", "3"))
+TELEGRAM_RETRY_BACKOFF_SECONDS = float(os.getenv("TELEGRAM_RETRY_BACKOFF_SECONDS", "0.5"))
+TELEGRAM_MAX_RETRY_AFTER_SECONDS = float(os.getenv("TELEGRAM_MAX_RETRY_AFTER_SECONDS", "10"))
+TELEGRAM_POOL_SIZE = int(os.getenv("TELEGRAM_POOL_SIZE", "10"))
+# Лимиты исходящих сообщений (integrations/rate_limit.py): token bucket
+# на бота и на чат, ведра в Redis общие для всех воркеров Celery
+TELEGRAM_RATE_LIMIT_REDIS_URL = os.getenv(
+    "TELEGRAM_RATE_LIMIT_REDIS_URL", os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/1")
+)
+TELEGRAM_RATE_GLOBAL_PER_SECOND = float(os.getenv("TELEGRAM_RATE_GLOBAL_PER_SECOND", "30"))
+TELEGRAM_RATE_GLOBAL_BURST = float(os.getenv("TELEGRAM_RATE_GLOBAL_BURST", "30"))
+TELEGRAM_RATE_PER_CHAT_PER_SECOND = float(os.getenv("TELEGRAM_RATE_PER_CHAT_PER_SECOND", "1"))
+TELEGRAM_RATE_PER_CHAT_BURST = float(os.getenv("TELEGRAM_RATE_PER_CHAT_BURST", "1"))
+# Outbox уведомлений (integrations/outbox.py): размер пачки диспетчера,
+# аренда забранной строки (продлевается перед её отправкой) и число попыток до статуса failed
+TELEGRAM_OUTBOX_BATCH_SIZE = int(os.getenv("TELEGRAM_OUTBOX_BATCH_SIZE", "50"))
+TELEGRAM_OUTBOX_LEASE_SECONDS = int(os.getenv("TELEGRAM_OUTBOX_LEASE_SECONDS", "60"))
+TELEGRAM_OUTBOX_MAX_ATTEMPTS = int(os.getenv("TELEGRAM_OUTBOX_MAX_ATTEMPTS", "5"))
+# Окно сводки уведомлений чата задачи по умолчанию, сек (0 — каждое сообщение
+# отдельно); пользователь может переопределить в TelegramProfile
+TELEGRAM_CHAT_DIGEST_SECONDS = int(os.getenv("TELEGRAM_CHAT_DIGEST_SECONDS", "30"))
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.mail.ru")
@@ -74,6 +99,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     # TaskPUle
     "rest_framework",
@@ -117,8 +143,37 @@ CELERY_BEAT_SCHEDULE = {
         "task": "tasks.tasks_reminders.send_due_soon_reminders",
         "schedule": crontab(minute="*/1"),  # каждые 10 минут
     },
+    "tasks.snapshot_task_states": {
+        "task": "tasks.tasks_reports.snapshot_task_states",
+        "schedule": crontab(minute=5, hour=0),  # снимок прошедшего дня, 00:05
+    },
+    "integrations.dispatch_telegram_outbox": {
+        "task": "integrations.tasks.dispatch_telegram_outbox",
+        "schedule": crontab(minute="*/1"),  # страховка: отложенные и брошенные строки outbox
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/1"),
+        "KEY_PREFIX": "taskpulse",
+    }
 }
 
+# KPI-кэш: страховочный TTL (основная инвалидация — по записям задач)
+KPI_CACHE_TTL_SECONDS = int(os.getenv("KPI_CACHE_TTL_SECONDS", "900"))
+# Прогрев KPI-кэша в начале месяца (Celery beat)
+KPI_CACHE_WARMUP = os.getenv("KPI_CACHE_WARMUP", "False").lower() in ("1", "true", "yes")
+if KPI_CACHE_WARMUP:
+    CELERY_BEAT_SCHEDULE["tasks.warm_kpi_cache"] = {
+        "task": "tasks.tasks_reports.warm_kpi_cache",
+        "schedule": crontab(minute=1, hour=0, day_of_month=1),  # первое число, 00:01
+    }
+
+# Сколько секунд одинаковые запросы фоновых отчётов переиспользуют готовый файл
+REPORT_JOB_TTL_SECONDS = int(os.getenv("REPORT_JOB_TTL_SECONDS", "3600"))
+
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -128,6 +183,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "tasks.log_buffer.TaskLogBufferMiddleware",
 ]
 
 FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://localhost:3000")
@@ -10,8 +10,17 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 CELERY_TASK_ALWAYS_EAGER = True
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# лимитер Telegram — ведра в памяти процесса
+TELEGRAM_RATE_LIMIT_REDIS_URL = ""
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 MEDIA_ROOT = BASE_DIR / ".pytest_media"
@@ -10,6 +10,7 @@ from django.urls import include, path
 from integrations.telegram_api import telegram_connect_start  # можно оставить, если используешь
 from integrations.telegram_webhook import telegram_webhook
 from integrations.views_api import telegram_profile, telegram_link_start
+from tasks.views_search import UnifiedSearchView
 
 app_name = "TaskPulse"
 
@@ -20,6 +21,8 @@ urlpatterns = [
 
     path("api/tasks/", include("tasks.urls")),
 
+    path("api/search/", UnifiedSearchView.as_view(), name="search"),
+
     path(
         "api/integrations/telegram/profile/",
         telegram_profile,
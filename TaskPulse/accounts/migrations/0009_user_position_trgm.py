@@ -0,0 +1,25 @@
+from django.db import migrations
+
+# Триграммный индекс под фильтр ?position= (assignee__position__icontains).
+# Создаётся, только если в БД доступно расширение pg_trgm.
+POSITION_TRGM_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS idx_user_position_trgm
+            ON accounts_user USING gin (UPPER(position::text) gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_user_avatar"),
+    ]
+
+    operations = [
+        migrations.RunSQL(POSITION_TRGM_SQL, "DROP INDEX IF EXISTS idx_user_position_trgm;"),
+    ]
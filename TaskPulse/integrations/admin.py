@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from .models import TelegramProfile, TelegramUpdate, TelegramLinkToken
+from .models import TelegramLinkToken, TelegramOutbox, TelegramProfile, TelegramUpdate
 
 
 @admin.register(TelegramProfile)
@@ -16,6 +16,7 @@ class TelegramProfileAdmin(admin.ModelAdmin):
         "chat_id",
         "created_at",
         "last_activity_at",
+        "chat_digest_seconds",
     )
     search_fields = ("user__email", "telegram_user_id")
     list_filter = ("created_at",)
@@ -42,3 +43,19 @@ class TelegramLinkTokenAdmin(admin.ModelAdmin):
     search_fields = ("user__email", "token")
     list_filter = ("is_used", "created_at")
     ordering = ("-created_at",)
+
+
+@admin.register(TelegramOutbox)
+class TelegramOutboxAdmin(admin.ModelAdmin):
+    """
+    Outbox исходящих сообщений Telegram: бэклог диспетчера
+    (pending/sending), отправленные и упавшие с последней ошибкой.
+    """
+
+    list_display = (
+        "id", "chat_id", "status", "coalesced", "attempts", "available_at", "created_at", "sent_at", "last_error",
+    )
+    search_fields = ("chat_id", "text")
+    list_filter = ("status", "created_at")
+    ordering = ("-id",)
+    readonly_fields = ("message_id", "created_at", "throttled_since", "sent_at")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:20
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0002_telegram_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="telegramoutbox",
+            name="coalesce_key",
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="telegramoutbox",
+            name="coalesced",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="telegramprofile",
+            name="chat_digest_seconds",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                validators=[django.core.validators.MaxValueValidator(3600)],
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0003_chat_digest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="telegramoutbox",
+            name="throttled_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
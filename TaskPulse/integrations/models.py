@@ -2,8 +2,11 @@
 
 import uuid
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.validators import MaxValueValidator
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -21,12 +24,25 @@ class TelegramProfile(models.Model):
     chat_id = models.BigIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     last_activity_at = models.DateTimeField(null=True, blank=True)
+    # окно сводки уведомлений чата задачи, сек: сообщения за окно приходят
+    # одним уведомлением; None — TELEGRAM_CHAT_DIGEST_SECONDS, 0 — без сводки
+    chat_digest_seconds = models.PositiveIntegerField(
+        null=True, blank=True, validators=[MaxValueValidator(3600)]
+    )
 
     def __str__(self):
         """Строковое представление объекта, удобно для админки и логов."""
 
         return f"{self.user.email} (telegram {self.telegram_user_id})"  # pylint: disable=no-member
 
+    @property
+    def chat_digest_window(self) -> int:
+        """Действующее окно сводки (с учётом настройки по умолчанию)."""
+
+        if self.chat_digest_seconds is not None:
+            return self.chat_digest_seconds
+        return getattr(settings, "TELEGRAM_CHAT_DIGEST_SECONDS", 30)
+
 
 class TelegramUpdate(models.Model):
     """TelegramUpdate - Хранит уже обработанные update_id для обеспечения идемпотентности."""
@@ -61,3 +77,56 @@ class TelegramLinkToken(models.Model):
         """Строковое представление токена."""
 
         return f"{self.user.email} -> {self.token}"  # pylint: disable=no-member
+
+
+class TelegramOutbox(models.Model):
+    """
+    TelegramOutbox:
+    Исходящее сообщение Telegram. Пишется в той же транзакции, что и
+    изменение задачи/сообщения, отправляется диспетчером (integrations.outbox).
+    Неотправленные строки остаются в таблице — бэклог видно в админке.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает отправки"
+        SENDING = "sending", "Отправляется"
+        SENT = "sent", "Отправлено"
+        FAILED = "failed", "Ошибка"
+
+    chat_id = models.BigIntegerField()
+    text = models.TextField()
+    reply_markup = models.JSONField(null=True, blank=True)
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    # когда строку можно забрать: для pending — не раньше этого момента
+    # (отложена лимитером/backoff), для sending — истечение аренды диспетчера
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True)
+    # первая отсрочка лимитером/429: sent_at - throttled_since идёт в метрику троттлинга
+    throttled_since = models.DateTimeField(null=True, blank=True)
+
+    # сводка: пока строка не забрана диспетчером, новые сообщения с тем же
+    # ключом не создают строк, а увеличивают coalesced (ключ снимается при claim
+    # и возвращается, если строку отложили)
+    coalesce_key = models.CharField(max_length=64, null=True, blank=True, unique=True)
+    coalesced = models.PositiveIntegerField(default=1)
+
+    message_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # очередь диспетчера: только незавершённые строки
+            models.Index(
+                fields=["available_at", "id"],
+                name="idx_tg_outbox_ready",
+                condition=models.Q(status__in=["pending", "sending"]),
+            ),
+        ]
+
+    def __str__(self):
+        """Строковое представление для админки и логов."""
+
+        return f"outbox #{self.pk} → {self.chat_id} ({self.status})"
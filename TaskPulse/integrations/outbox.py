@@ -0,0 +1,329 @@
+"""integrations/outbox.py"""
+"""
+Transactional outbox для сообщений Telegram.
+
+- enqueue_telegram_message(s) пишет строки TelegramOutbox в текущей
+  транзакции (вместе с изменением задачи/сообщения) и после коммита
+  будит диспетчер; откат транзакции — нет строк, нет отправки.
+- dispatch_batch забирает пачку готовых строк (FOR UPDATE SKIP LOCKED,
+  несколько диспетчеров не мешают друг другу), сразу переводит их в
+  sending с арендой и коммитит; отправка идёт уже вне транзакции.
+  Перед отправкой каждой строки аренда продлевается, а итог пишется
+  только если аренда всё ещё своя (status=sending и available_at = наша
+  аренда): строку, которую успел перехватить другой диспетчер, не
+  отправляем и не перезаписываем. Если воркер умер посреди отправки, по
+  истечении аренды строку заберёт следующий диспетчер (доставка «почти
+  ровно один раз»: повтор возможен только для сообщения, которое ушло,
+  но не успело отметиться).
+- enqueue_coalesced_message копит сообщения с одним ключом (чат задачи →
+  получатель) в одной строке до окна сводки; окно закрывает отложенный
+  (countdown) запуск диспетчера. Ключ снимается при claim (сообщение,
+  пришедшее во время отправки, начинает новую сводку) и возвращается,
+  если строку отложили, — иначе следующее сообщение создало бы вторую.
+- Лимиты Telegram (integrations.rate_limit) и 429 откладывают строку
+  (available_at). Остальные строки того же чата в пачке лимитер больше
+  не спрашивают: они встают следом с шагом лимита чата, поэтому N строк
+  в один чат забираются ~2N раз, а не ~N²/2. Время задержки идёт в
+  метрику один раз на строку — от первой отсрочки до отправки.
+  Временные ошибки откладываются с экспоненциальным backoff; после
+  TELEGRAM_OUTBOX_MAX_ATTEMPTS строка получает статус failed.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from integrations import rate_limit
+from integrations.models import TelegramOutbox
+from integrations.utils_telegram import send_telegram_message
+
+logger = logging.getLogger(__name__)
+
+# временные ошибки клиента — строку стоит попробовать позже
+RETRYABLE_ERRORS = {"timeout", "connection", "server_error"}
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 15 * 60
+
+# ключ сводки снимается, но возвращается из CTE — его восстановит _defer
+CLAIM_SQL = """
+WITH claimed AS (
+    SELECT "id", "coalesce_key" FROM "integrations_telegramoutbox"
+    WHERE "status" IN ('pending', 'sending') AND "available_at" <= %s
+    ORDER BY "available_at", "id"
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE "integrations_telegramoutbox" AS o
+SET "status" = 'sending', "available_at" = %s, "coalesce_key" = NULL
+FROM claimed AS c
+WHERE o."id" = c."id"
+RETURNING o."id", o."chat_id", o."text", o."reply_markup", o."attempts", o."available_at",
+    o."throttled_since", c."coalesce_key"
+"""
+
+# первая строка окна или +1 к уже ожидающей (ключ есть только у незабранных строк)
+COALESCE_SQL = """
+INSERT INTO "integrations_telegramoutbox"
+    ("chat_id", "text", "status", "available_at", "attempts", "last_error",
+     "created_at", "coalesce_key", "coalesced")
+VALUES (%s, '', 'pending', %s, 0, '', %s, %s, 1)
+ON CONFLICT ("coalesce_key") DO UPDATE
+SET "coalesced" = "integrations_telegramoutbox"."coalesced" + 1
+RETURNING "id", "coalesced"
+"""
+
+
+def _kick_dispatcher(countdown: Optional[float] = None) -> None:
+    from integrations.tasks import dispatch_telegram_outbox
+
+    if countdown:
+        # ETA-запуск к закрытию окна сводки
+        dispatch_telegram_outbox.apply_async(countdown=countdown)
+    else:
+        dispatch_telegram_outbox.delay()
+
+
+def enqueue_telegram_messages(messages: Iterable[Tuple[int, str, Optional[dict]]]) -> int:
+    """
+    Кладёт сообщения (chat_id, text, reply_markup) в outbox одним INSERT
+    и ставит один запуск диспетчера после коммита. Возвращает число строк.
+    """
+
+    rows = [
+        TelegramOutbox(chat_id=chat_id, text=text, reply_markup=reply_markup)
+        for chat_id, text, reply_markup in messages
+    ]
+    if not rows:
+        return 0
+    TelegramOutbox.objects.bulk_create(rows, batch_size=500)
+    transaction.on_commit(_kick_dispatcher)
+    return len(rows)
+
+
+def enqueue_telegram_message(chat_id: int, text: str, reply_markup: Optional[dict] = None) -> None:
+    """Одно сообщение в outbox (см. enqueue_telegram_messages)."""
+
+    enqueue_telegram_messages([(chat_id, text, reply_markup)])
+
+
+def enqueue_coalesced_message(
+        chat_id: int,
+        coalesce_key: str,
+        window_seconds: int,
+        render: Callable[[int], str],
+) -> int:
+    """
+    Сообщение со сводкой: первое за окно создаёт строку, которую диспетчер
+    заберёт не раньше чем через window_seconds, следующие только
+    увеличивают счётчик. render(n) — текст для n накопленных сообщений.
+    window_seconds=0 — обычная отправка без сводки. Возвращает n.
+    """
+
+    if window_seconds <= 0:
+        enqueue_telegram_message(chat_id, render(1))
+        return 1
+
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(COALESCE_SQL, [chat_id, now + timedelta(seconds=window_seconds), now, coalesce_key])
+        outbox_id, count = cursor.fetchone()
+        TelegramOutbox.objects.filter(pk=outbox_id).update(text=render(count))
+
+    if count == 1:
+        transaction.on_commit(lambda: _kick_dispatcher(countdown=window_seconds))
+    return count
+
+
+def claim_batch(limit: int, lease_seconds: int) -> List[tuple]:
+    """
+    Забирает до limit готовых строк (pending с наступившим available_at
+    или sending с истёкшей арендой) и коммитит аренду.
+    Строки: (id, chat_id, text, reply_markup, attempts, lease_until,
+    throttled_since, coalesce_key).
+    """
+
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(CLAIM_SQL, [now, limit, now + timedelta(seconds=lease_seconds)])
+        rows = cursor.fetchall()
+    return sorted(rows)
+
+
+def _owned(outbox_id: int, lease_until: datetime):
+    """Строка, пока аренда на ней наша (её не перехватил другой диспетчер)."""
+
+    return TelegramOutbox.objects.filter(
+        pk=outbox_id, status=TelegramOutbox.Status.SENDING, available_at=lease_until
+    )
+
+
+def _renew_lease(outbox_id: int, lease_until: datetime, lease_seconds: int) -> Optional[datetime]:
+    """Продлевает свою аренду перед отправкой; None — аренду уже перехватили."""
+
+    renewed = timezone.now() + timedelta(seconds=lease_seconds)
+    if not _owned(outbox_id, lease_until).update(available_at=renewed):
+        return None
+    return renewed
+
+
+def _defer(
+        outbox_id: int, lease_until: datetime, until: datetime, coalesce_key: Optional[str] = None, **fields
+) -> None:
+    """
+    Возвращает строку в pending до until. Сводке возвращается ключ, снятый
+    при claim; если его уже заняла новая сводка, строка остаётся без ключа.
+    """
+
+    if coalesce_key:
+        try:
+            with transaction.atomic():
+                _owned(outbox_id, lease_until).update(
+                    status=TelegramOutbox.Status.PENDING, available_at=until, coalesce_key=coalesce_key, **fields
+                )
+            return
+        except IntegrityError:
+            pass
+    _owned(outbox_id, lease_until).update(status=TelegramOutbox.Status.PENDING, available_at=until, **fields)
+
+
+def _after(seconds: float) -> datetime:
+    return timezone.now() + timedelta(seconds=seconds)
+
+
+def _send_one(
+        outbox_id: int,
+        chat_id: int,
+        text: str,
+        reply_markup: Optional[dict],
+        attempts: int,
+        lease_until: datetime,
+        lease_seconds: int,
+        throttled_since: Optional[datetime] = None,
+        chat_slots: Optional[Dict[int, datetime]] = None,
+        coalesce_key: Optional[str] = None,
+) -> str:
+    """
+    Отправляет одну забранную строку и фиксирует итог.
+    Возвращает sent/deferred/failed или lost (аренду перехватили — не отправляем).
+    chat_slots — очередь чатов, упёршихся в лимит в этой пачке: момент,
+    на который ставить следующую строку чата без обращения к лимитеру.
+    """
+
+    chat_slots = {} if chat_slots is None else chat_slots
+    lease_until = _renew_lease(outbox_id, lease_until, lease_seconds)
+    if lease_until is None:
+        logger.warning("Outbox #%s: аренда перехвачена другим диспетчером, пропускаем", outbox_id)
+        return "lost"
+
+    def throttle(until: datetime, **fields) -> str:
+        # следующая строка этого чата — через интервал лимита чата после этой
+        chat_slots[chat_id] = until + timedelta(seconds=rate_limit.chat_interval())
+        _defer(
+            outbox_id, lease_until, until, coalesce_key,
+            throttled_since=throttled_since or timezone.now(), **fields,
+        )
+        return "deferred"
+
+    slot = chat_slots.get(chat_id)
+    if slot is not None:
+        return throttle(slot)
+    wait = rate_limit.acquire(chat_id)
+    if wait > 0:
+        return throttle(_after(wait))
+
+    # по 429 внутри клиента не ждём: строку отложит _defer на retry_after
+    result = send_telegram_message(chat_id, text, reply_markup=reply_markup, max_retry_after=0)
+    if result.ok:
+        sent_at = timezone.now()
+        marked = _owned(outbox_id, lease_until).update(
+            status=TelegramOutbox.Status.SENT,
+            sent_at=sent_at,
+            message_id=result.message_id,
+            attempts=attempts + 1,
+            last_error="",
+        )
+        if not marked:
+            logger.warning("Outbox #%s: отправлено, но аренда уже перехвачена — возможен повтор", outbox_id)
+        if throttled_since is not None:
+            rate_limit.record_throttle(chat_id, (sent_at - throttled_since).total_seconds())
+        return "sent"
+
+    error = f"{result.error}: {result.description}"[:255] if result.description else (result.error or "")
+    if result.error == "rate_limited" and result.retry_after:
+        # ответ 429 — не ошибка сообщения, попытку не засчитываем
+        return throttle(_after(result.retry_after), last_error=error)
+
+    attempts += 1
+    max_attempts = getattr(settings, "TELEGRAM_OUTBOX_MAX_ATTEMPTS", 5)
+    if result.error in RETRYABLE_ERRORS and attempts < max_attempts:
+        _defer(
+            outbox_id,
+            lease_until,
+            _after(min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)),
+            coalesce_key,
+            attempts=attempts,
+            last_error=error,
+        )
+        return "deferred"
+
+    _owned(outbox_id, lease_until).update(
+        status=TelegramOutbox.Status.FAILED, attempts=attempts, last_error=error
+    )
+    return "failed"
+
+
+def dispatch_batch(limit: Optional[int] = None) -> Dict[str, int]:
+    """Одна пачка диспетчера: забрать, отправить, отметить. Возвращает счётчики."""
+
+    limit = limit or getattr(settings, "TELEGRAM_OUTBOX_BATCH_SIZE", 50)
+    lease = getattr(settings, "TELEGRAM_OUTBOX_LEASE_SECONDS", 60)
+
+    counts = {"claimed": 0, "sent": 0, "deferred": 0, "failed": 0, "lost": 0}
+    chat_slots: Dict[int, datetime] = {}
+    for row in claim_batch(limit, lease):
+        outbox_id, chat_id, text, reply_markup, attempts, lease_until, throttled_since, coalesce_key = row
+        counts["claimed"] += 1
+        if isinstance(reply_markup, str):  # jsonb из сырого курсора приходит строкой
+            reply_markup = json.loads(reply_markup)
+        try:
+            outcome = _send_one(
+                outbox_id, chat_id, text, reply_markup, attempts, lease_until, lease,
+                throttled_since=throttled_since, chat_slots=chat_slots, coalesce_key=coalesce_key,
+            )
+        except Exception:  # noqa: BLE001
+            # строка останется sending и вернётся в работу по истечении аренды
+            logger.exception("Outbox #%s: ошибка при отправке", outbox_id)
+            continue
+        counts[outcome] += 1
+    return counts
+
+
+def next_ready_in() -> Optional[float]:
+    """Через сколько секунд появится следующая готовая строка (None — очередь пуста)."""
+
+    next_at = (
+        TelegramOutbox.objects.filter(
+            status__in=[TelegramOutbox.Status.PENDING, TelegramOutbox.Status.SENDING]
+        )
+        .order_by("available_at")
+        .values_list("available_at", flat=True)
+        .first()
+    )
+    if next_at is None:
+        return None
+    return max(0.0, (next_at - timezone.now()).total_seconds())
+
+
+def backlog_stats() -> Dict[str, int]:
+    """Размер очереди по статусам (для мониторинга/админки)."""
+
+    stats = {status: 0 for status in TelegramOutbox.Status.values}
+    for row in TelegramOutbox.objects.order_by().values("status").annotate(n=Count("id")):
+        stats[row["status"]] = row["n"]
+    return stats
@@ -0,0 +1,223 @@
+"""integrations/rate_limit.py"""
+"""
+Ограничение частоты исходящих сообщений Telegram: token bucket на бота
+целиком (~30 сообщений/с) и на каждый чат (~1 сообщение/с).
+
+Ведра лежат в Redis и общие для всех воркеров Celery — проверка и
+списание токенов делаются одним Lua-скриптом, время берётся из Redis
+(TIME), поэтому расхождение часов на воркерах не мешает. Без
+TELEGRAM_RATE_LIMIT_REDIS_URL (тесты, локальный запуск) ведра живут в
+памяти процесса с тем же алгоритмом.
+
+acquire() не ждёт: возвращает 0, если токены списаны, иначе — сколько
+секунд подождать; вызывающий откладывает отправку (см. integrations.outbox._send_one).
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis есть в requirements
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "taskpulse:tg:rl"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+
+# KEYS[1] — ведро бота, KEYS[2] — ведро чата;
+# ARGV: rate/burst бота, rate/burst чата (токенов в секунду / ёмкость).
+# Возвращает 0 (токены списаны из обоих ведер) или ожидание в мс.
+ACQUIRE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local function refill(key, rate, burst)
+  local b = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(b[1]) or burst
+  local ts = tonumber(b[2]) or now
+  return math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+end
+
+local g_rate, g_burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local c_rate, c_burst = tonumber(ARGV[3]), tonumber(ARGV[4])
+local g = refill(KEYS[1], g_rate, g_burst)
+local c = refill(KEYS[2], c_rate, c_burst)
+
+if g >= 1 and c >= 1 then
+  redis.call('HSET', KEYS[1], 'tokens', tostring(g - 1), 'ts', now)
+  redis.call('PEXPIRE', KEYS[1], math.ceil(g_burst / g_rate * 1000) + 1000)
+  redis.call('HSET', KEYS[2], 'tokens', tostring(c - 1), 'ts', now)
+  redis.call('PEXPIRE', KEYS[2], math.ceil(c_burst / c_rate * 1000) + 1000)
+  return 0
+end
+
+local wait = 0
+if g < 1 then wait = math.max(wait, (1 - g) * 1000 / g_rate) end
+if c < 1 then wait = math.max(wait, (1 - c) * 1000 / c_rate) end
+return math.ceil(wait)
+"""
+
+
+class RedisTokenBuckets:
+    """Ведра в Redis, общие для всех процессов."""
+
+    def __init__(self, url: str, rates: Tuple[float, float, float, float]) -> None:
+        self.client = redis.Redis.from_url(url)
+        self.rates = rates
+        self.script = self.client.register_script(ACQUIRE_LUA)
+
+    def acquire(self, chat_id: int) -> float:
+        wait_ms = self.script(keys=[f"{KEY_PREFIX}:bot", f"{KEY_PREFIX}:chat:{chat_id}"], args=list(self.rates))
+        return int(wait_ms) / 1000
+
+    def record_throttle(self, seconds: float) -> None:
+        pipe = self.client.pipeline()
+        pipe.hincrby(STATS_KEY, "throttled", 1)
+        pipe.hincrbyfloat(STATS_KEY, "throttled_seconds", seconds)
+        pipe.execute()
+
+    def stats(self) -> Dict[str, float]:
+        raw = self.client.hgetall(STATS_KEY)
+        return {
+            "throttled": int(raw.get(b"throttled", 0)),
+            "throttled_seconds": round(float(raw.get(b"throttled_seconds", 0)), 3),
+        }
+
+
+class LocalTokenBuckets:
+    """Те же ведра в памяти процесса — без Redis (тесты, разработка)."""
+
+    def __init__(self, rates: Tuple[float, float, float, float]) -> None:
+        self.rates = rates
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.lock = threading.Lock()
+        self.clock = time.monotonic
+
+    def _refill(self, key: str, rate: float, burst: float, now: float) -> float:
+        tokens, ts = self.buckets.get(key, (burst, now))
+        return min(burst, tokens + max(0.0, now - ts) * rate)
+
+    def acquire(self, chat_id: int) -> float:
+        g_rate, g_burst, c_rate, c_burst = self.rates
+        bot_key, chat_key = "bot", f"chat:{chat_id}"
+        with self.lock:
+            now = self.clock()
+            g = self._refill(bot_key, g_rate, g_burst, now)
+            c = self._refill(chat_key, c_rate, c_burst, now)
+            if g >= 1 and c >= 1:
+                self.buckets[bot_key] = (g - 1, now)
+                self.buckets[chat_key] = (c - 1, now)
+                return 0.0
+        wait = 0.0
+        if g < 1:
+            wait = max(wait, (1 - g) / g_rate)
+        if c < 1:
+            wait = max(wait, (1 - c) / c_rate)
+        # вверх до мс, отбросив шум float (0.6000000001 → 0.6)
+        return math.ceil(round(wait * 1000, 6)) / 1000
+
+    def record_throttle(self, seconds: float) -> None:
+        with self.lock:
+            self.throttled += 1
+            self.throttled_seconds += seconds
+
+    def stats(self) -> Dict[str, float]:
+        return {"throttled": self.throttled, "throttled_seconds": round(self.throttled_seconds, 3)}
+
+
+_buckets: Optional[object] = None
+_buckets_pid: Optional[int] = None
+_buckets_lock = threading.Lock()
+
+
+def _rates() -> Tuple[float, float, float, float]:
+    return (
+        float(getattr(settings, "TELEGRAM_RATE_GLOBAL_PER_SECOND", 30)),
+        float(getattr(settings, "TELEGRAM_RATE_GLOBAL_BURST", 30)),
+        float(getattr(settings, "TELEGRAM_RATE_PER_CHAT_PER_SECOND", 1)),
+        float(getattr(settings, "TELEGRAM_RATE_PER_CHAT_BURST", 1)),
+    )
+
+
+def get_buckets():
+    """Ведра процесса: Redis, если задан TELEGRAM_RATE_LIMIT_REDIS_URL, иначе в памяти."""
+
+    global _buckets, _buckets_pid
+    pid = os.getpid()
+    if _buckets is None or _buckets_pid != pid:
+        with _buckets_lock:
+            if _buckets is None or _buckets_pid != pid:
+                url = getattr(settings, "TELEGRAM_RATE_LIMIT_REDIS_URL", "")
+                if url and redis is not None:
+                    _buckets = RedisTokenBuckets(url, _rates())
+                else:
+                    _buckets = LocalTokenBuckets(_rates())
+                _buckets_pid = pid
+    return _buckets
+
+
+def reset_buckets() -> None:
+    global _buckets, _buckets_pid
+    with _buckets_lock:
+        _buckets = None
+        _buckets_pid = None
+
+
+def acquire(chat_id: int) -> float:
+    """
+    Пытается взять токен из ведра бота и ведра чата. 0 — можно отправлять,
+    иначе секунды до появления токенов. Если Redis недоступен, сообщение
+    не задерживаем (лучше поймать 429 от Telegram, чем потерять отправку).
+    """
+
+    try:
+        return get_buckets().acquire(chat_id)
+    except Exception:  # noqa: BLE001
+        logger.exception("Лимитер Telegram недоступен, отправка без ограничения")
+        return 0.0
+
+
+def chat_interval() -> float:
+    """Шаг между сообщениями в один чат по лимиту, секунды."""
+
+    return 1 / _rates()[2]
+
+
+def record_throttle(chat_id: int, seconds: float) -> None:
+    """
+    Учитывает в метриках сообщение, задержанное лимитом: одно на сообщение,
+    seconds — фактическая задержка (от первой отсрочки до отправки).
+    """
+
+    logger.info(
+        "Telegram: сообщение в чат %s ушло с задержкой лимита %.3f с", chat_id, seconds,
+        extra={"chat_id": chat_id, "throttled_seconds": seconds},
+    )
+    try:
+        get_buckets().record_throttle(seconds)
+    except Exception:  # noqa: BLE001
+        logger.exception("Не удалось записать метрику троттлинга Telegram")
+
+
+def throttle_stats() -> Dict[str, float]:
+    """Сколько сообщений задержано лимитом и на сколько секунд суммарно."""
+
+    return get_buckets().stats()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting: str, **kwargs) -> None:  # noqa: ANN003
+    if setting.startswith("TELEGRAM_RATE_"):
+        reset_buckets()
@@ -11,5 +11,5 @@ class TelegramProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = TelegramProfile
         # user мы обычно не отдаём — он и так «текущий» (request.user)
-        fields = ("id", "telegram_user_id", "chat_id", "created_at", "last_activity_at")
-        read_only_fields = fields
+        fields = ("id", "telegram_user_id", "chat_id", "created_at", "last_activity_at", "chat_digest_seconds")
+        read_only_fields = ("id", "telegram_user_id", "chat_id", "created_at", "last_activity_at")
@@ -2,13 +2,45 @@
 
 from __future__ import annotations
 
+from collections import Counter
+
 from celery import shared_task
+from django.core.cache import cache
 
+from . import outbox
 from .telegram_webhook import handle_telegram_update
 
+# дальше этого горизонта повторный запуск не планируем — хватит beat
+RERUN_HORIZON_SECONDS = 60
+RERUN_LOCK_KEY = "integrations:tg_outbox_rerun"
+
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={"max_retries": 5})
 def process_telegram_update(self, update: dict) -> None:
     """Обрабатывает Telegram update в фоне (Celery)."""
 
     handle_telegram_update(update)
+
+
+@shared_task(bind=True, ignore_result=True)
+def dispatch_telegram_outbox(self, max_batches: int = 20) -> dict:
+    """
+    Диспетчер outbox: отправляет готовые строки пачками, пока они есть
+    (не больше max_batches за запуск). Будится после коммита новых строк
+    и раз в минуту из beat; если остались отложенные строки, ставит
+    один повторный запуск к моменту готовности ближайшей.
+    """
+
+    totals = Counter()
+    for _ in range(max_batches):
+        counts = outbox.dispatch_batch()
+        totals.update(counts)
+        if not counts["claimed"]:
+            break
+
+    wait = outbox.next_ready_in()
+    # в eager-режиме очереди нет — отложенные строки подберёт следующий запуск
+    if wait is not None and wait < RERUN_HORIZON_SECONDS and not self.request.is_eager:
+        if cache.add(RERUN_LOCK_KEY, 1, timeout=max(1, int(wait))):
+            dispatch_telegram_outbox.apply_async(countdown=wait)
+    return dict(totals)
@@ -0,0 +1,213 @@
+"""integrations/telegram_client.py"""
+"""
+Клиент Telegram Bot API: один на процесс, keep-alive Session с пулом
+соединений, ограниченные повторы с backoff (429 — по retry_after из ответа)
+и структурированный результат каждой отправки.
+
+Базовый URL настраивается (TELEGRAM_API_BASE_URL) — в тестах и бенчмарках
+вместо api.telegram.org можно поднять локальную заглушку.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SendResult:
+    """Итог вызова Bot API (после всех повторов)."""
+
+    ok: bool
+    message_id: Optional[int] = None
+    latency_ms: float = 0.0
+    attempts: int = 0
+    status_code: Optional[int] = None
+    # класс ошибки: not_configured / timeout / connection / rate_limited / server_error / api_error
+    error: Optional[str] = None
+    description: str = ""
+    # для rate_limited: сколько секунд Telegram просит подождать
+    retry_after: Optional[float] = None
+
+
+class TelegramClient:
+    """Клиент Bot API поверх общей requests.Session."""
+
+    def __init__(
+            self,
+            token: str,
+            base_url: str = "https://api.telegram.org",
+            timeout: float = 5.0,
+            max_retries: int = 3,
+            backoff: float = 0.5,
+            max_retry_after: float = 10.0,
+            pool_size: int = 10,
+    ) -> None:
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_settings(cls) -> "TelegramClient":
+        return cls(
+            token=getattr(settings, "TELEGRAM_BOT_TOKEN", "") or "",
+            base_url=getattr(settings, "TELEGRAM_API_BASE_URL", "https://api.telegram.org"),
+            timeout=getattr(settings, "TELEGRAM_TIMEOUT_SECONDS", 5.0),
+            max_retries=getattr(settings, "TELEGRAM_MAX_RETRIES", 3),
+            backoff=getattr(settings, "TELEGRAM_RETRY_BACKOFF_SECONDS", 0.5),
+            max_retry_after=getattr(settings, "TELEGRAM_MAX_RETRY_AFTER_SECONDS", 10.0),
+            pool_size=getattr(settings, "TELEGRAM_POOL_SIZE", 10),
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+    def send_message(
+            self,
+            chat_id: int,
+            text: str,
+            reply_markup: Optional[dict] = None,
+            parse_mode: str = "HTML",
+            max_retry_after: Optional[float] = None,
+    ) -> SendResult:
+        payload: Dict[str, Any] = {"chat_id": chat_id, "text": text, "parse_mode": parse_mode}
+        if reply_markup is not None:
+            payload["reply_markup"] = reply_markup
+        return self.call("sendMessage", payload, max_retry_after=max_retry_after)
+
+    def call(self, method: str, payload: Dict[str, Any], max_retry_after: Optional[float] = None) -> SendResult:
+        """
+        POST {base_url}/bot<token>/<method>. Повторяет таймауты, обрывы,
+        5xx и 429 (не более max_retries раз); прочие 4xx — сразу ошибка.
+        max_retry_after переопределяет потолок ожидания по 429 для вызова
+        (0 — не ждать, сразу вернуть rate_limited с retry_after).
+        """
+
+        if not self.token:
+            logger.warning("TELEGRAM_BOT_TOKEN не настроен, %s не отправлен", method)
+            return SendResult(ok=False, error="not_configured")
+
+        url = f"{self.base_url}/bot{self.token}/{method}"
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            result, retryable, retry_after = self._attempt(url, payload, max_retry_after)
+            if result.ok or not retryable or attempt > self.max_retries:
+                break
+            # 429 — ждём столько, сколько просит Telegram; иначе экспоненциальный backoff
+            time.sleep(retry_after if retry_after is not None else self.backoff * 2 ** (attempt - 1))
+
+        result = replace(result, latency_ms=round((time.perf_counter() - started) * 1000, 1), attempts=attempt)
+        self._log(method, payload.get("chat_id"), result)
+        return result
+
+    def _attempt(
+            self, url: str, payload: Dict[str, Any], max_retry_after: Optional[float] = None
+    ) -> Tuple[SendResult, bool, Optional[float]]:
+        """Одна попытка: (результат, можно ли повторить, retry_after из ответа 429)."""
+
+        try:
+            resp = self.session.post(url, json=payload, timeout=self.timeout)
+        except requests.Timeout:
+            return SendResult(ok=False, error="timeout"), True, None
+        except requests.ConnectionError as exc:
+            return SendResult(ok=False, error="connection", description=str(exc)[:200]), True, None
+
+        try:
+            data = resp.json()
+        except ValueError:
+            data = {}
+        description = str(data.get("description", ""))[:200]
+
+        if resp.status_code == 200 and data.get("ok"):
+            message_id = (data.get("result") or {}).get("message_id")
+            return SendResult(ok=True, message_id=message_id, status_code=200), False, None
+
+        failed = SendResult(ok=False, status_code=resp.status_code, error="api_error", description=description)
+        if resp.status_code == 429:
+            retry_after = float((data.get("parameters") or {}).get("retry_after", self.backoff))
+            # дольше max_retry_after не ждём — вызывающий получит rate_limited
+            failed = replace(failed, error="rate_limited", retry_after=retry_after)
+            if max_retry_after is None:
+                max_retry_after = self.max_retry_after
+            return failed, retry_after <= max_retry_after, retry_after
+        if resp.status_code >= 500:
+            return replace(failed, error="server_error"), True, None
+        return failed, False, None
+
+    @staticmethod
+    def _log(method: str, chat_id: Any, result: SendResult) -> None:
+        fields = {
+            "telegram_method": method,
+            "chat_id": chat_id,
+            "ok": result.ok,
+            "message_id": result.message_id,
+            "latency_ms": result.latency_ms,
+            "attempts": result.attempts,
+            "status_code": result.status_code,
+            "error": result.error,
+        }
+        if result.ok:
+            logger.info("Telegram %s ok за %.1f мс", method, result.latency_ms, extra=fields)
+        else:
+            logger.warning(
+                "Telegram %s ошибка %s (%s): %s", method, result.error, result.status_code, result.description,
+                extra=fields,
+            )
+
+
+_client: Optional[TelegramClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def get_telegram_client() -> TelegramClient:
+    """
+    Общий клиент процесса. После fork (prefork-воркеры Celery, gunicorn)
+    создаётся заново, чтобы не делить сокеты пула с родителем.
+    """
+
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = TelegramClient.from_settings()
+                _client_pid = pid
+    return _client
+
+
+def reset_telegram_client() -> None:
+    """Сбрасывает общий клиент (следующий вызов перечитает настройки)."""
+
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting: str, **kwargs) -> None:  # noqa: ANN003
+    if setting.startswith("TELEGRAM_"):
+        reset_telegram_client()
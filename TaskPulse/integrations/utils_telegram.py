@@ -1,40 +1,25 @@
 """integrations/utils_telegram.py"""
 
-import logging
-
-import requests
 from django.conf import settings
 
-logger = logging.getLogger(__name__)
+from integrations.telegram_client import SendResult, get_telegram_client
 
 
 def send_telegram_message(
-        chat_id: int, text: str, reply_markup: dict | None = None
-) -> None:
-    """Отправляет сообщение пользователю в Telegram через Bot API."""
-
-    bot_token = getattr(settings, "TELEGRAM_BOT_TOKEN", None)
-    if not bot_token:
-        logger.warning("TELEGRAM_BOT_TOKEN не настроен, сообщение не отправлено")
-        return
-
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-
-    payload: dict = {
-        "chat_id": chat_id,
-        "text": text,
-        "parse_mode": "HTML",
-    }
-
-    if reply_markup is not None:
-        payload["reply_markup"] = reply_markup
-
-    try:
-        resp = requests.post(url, json=payload, timeout=5)
-        if resp.status_code != 200:
-            logger.warning("Telegram API sendMessage error %s: %s", resp.status_code, resp.text)
-    except Exception:  # noqa: BLE001
-        logger.exception("Ошибка при отправке сообщения в Telegram")
+        chat_id: int, text: str, reply_markup: dict | None = None, max_retry_after: float | None = None
+) -> SendResult:
+    """
+    Отправляет сообщение пользователю в Telegram через Bot API.
+
+    Идёт через общий клиент процесса (пул соединений, повторы); ошибки
+    не пробрасываются — результат и класс ошибки в SendResult и в логе.
+    max_retry_after=0 — не ждать по 429 внутри вызова (outbox сам
+    откладывает строку на retry_after).
+    """
+
+    return get_telegram_client().send_message(
+        chat_id, text, reply_markup=reply_markup, max_retry_after=max_retry_after
+    )
 
 
 def build_task_link(task_id: int) -> str:
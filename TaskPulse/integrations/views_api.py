@@ -7,26 +7,30 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from .models import TelegramProfile, TelegramLinkToken
+from .serializers import TelegramProfileSerializer
 
 
-@api_view(["GET"])
+@api_view(["GET", "PATCH"])
 @permission_classes([IsAuthenticated])
 def telegram_profile(request):
-    """Возвращает профиль Telegram текущего пользователя."""
+    """
+    Профиль Telegram текущего пользователя.
+    PATCH меняет только chat_digest_seconds — окно сводки уведомлений
+    чата задачи (null — значение по умолчанию, 0 — без сводки).
+    """
 
     try:
         profile = TelegramProfile.objects.get(user=request.user)
     except TelegramProfile.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    data = {
-        "id": profile.id,
-        "telegram_user_id": profile.telegram_user_id,
-        "chat_id": profile.chat_id,
-        "created_at": profile.created_at,
-        "last_activity_at": profile.last_activity_at,
-    }
-    return Response(data, status=status.HTTP_200_OK)
+    if request.method == "PATCH":
+        serializer = TelegramProfileSerializer(profile, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    return Response(TelegramProfileSerializer(profile).data, status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
@@ -1,8 +1,26 @@
 """tasks/admin.py"""
 
-from django.contrib import admin
+from datetime import timedelta
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth import get_user_model
 
 from .models import Task, TaskAttachment, TaskChangeLog, TaskMessage
+from .services.bulk import bulk_reassign, bulk_set_status, bulk_shift_due
+
+User = get_user_model()
+
+
+class TaskBulkActionForm(ActionForm):
+    """Форма действий над списком задач: исполнитель для «Переназначить»."""
+
+    assignee = forms.ModelChoiceField(
+        queryset=User.objects.all(),
+        required=False,
+        label="Исполнитель",
+    )
 
 
 class TaskAttachmentInline(admin.TabularInline):
@@ -57,6 +75,36 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ("priority", "status", "assignee")
     search_fields = ("title", "description")
     inlines = [TaskAttachmentInline, TaskChangeLogInline]
+    action_form = TaskBulkActionForm
+    actions = ("mark_done", "mark_in_progress", "shift_due_1d", "reassign_selected")
+
+    def _report(self, request, updated: list[int]) -> None:
+        self.message_user(request, f"Изменено задач: {len(updated)}.", messages.SUCCESS)
+
+    @admin.action(description="Отметить выполненными")
+    def mark_done(self, request, queryset):
+        ids = list(queryset.values_list("pk", flat=True))
+        self._report(request, bulk_set_status(ids, Task.Status.DONE, changed_by=request.user))
+
+    @admin.action(description="Перевести в работу")
+    def mark_in_progress(self, request, queryset):
+        ids = list(queryset.values_list("pk", flat=True))
+        self._report(request, bulk_set_status(ids, Task.Status.IN_PROGRESS, changed_by=request.user))
+
+    @admin.action(description="Продлить дедлайн на сутки")
+    def shift_due_1d(self, request, queryset):
+        ids = list(queryset.values_list("pk", flat=True))
+        self._report(request, bulk_shift_due(ids, timedelta(days=1), changed_by=request.user))
+
+    @admin.action(description="Переназначить на выбранного исполнителя")
+    def reassign_selected(self, request, queryset):
+        assignee_id = request.POST.get("assignee")
+        assignee = User.objects.filter(pk=assignee_id).first() if str(assignee_id).isdigit() else None
+        if assignee is None:
+            self.message_user(request, "Выберите исполнителя.", messages.ERROR)
+            return
+        ids = list(queryset.values_list("pk", flat=True))
+        self._report(request, bulk_reassign(ids, assignee, changed_by=request.user))
 
 
 @admin.register(TaskAttachment)
@@ -0,0 +1,128 @@
+"""tasks/conditional.py"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+@dataclass(frozen=True)
+class Validators:
+    """ETag / Last-Modified для ответа и число строк, по которым они посчитаны."""
+
+    etag: str
+    last_modified: Optional[datetime]
+    count: int
+
+
+def compute_validators(
+        queryset: QuerySet,
+        request,
+        *,
+        timestamp_field: str = "updated_at",
+        related_timestamps: Iterable[str] = (),
+        collection: bool = False,
+) -> Validators:
+    """
+    Считает валидаторы одним агрегирующим запросом: count + max(timestamp)
+    (+ max по связанным таблицам, например по дате вложений).
+    Модели не создаются, сериализаторы не вызываются.
+
+    В ETag также входят пользователь и полный путь запроса,
+    т.к. от них зависят фильтры, поля и страница ответа.
+
+    collection=True — ответ-список: Last-Modified не выдаётся. Max(timestamp)
+    не сдвигается, когда строку удалили или она ушла из видимого набора,
+    и по одному If-Modified-Since клиент получил бы 304 со старым списком;
+    списки ревалидируются только по ETag (в нём есть count).
+    """
+
+    related_timestamps = tuple(related_timestamps)
+    aggregates = {
+        "count": Count("pk", distinct=bool(related_timestamps)),
+        "last": Max(timestamp_field),
+    }
+    for i, path in enumerate(related_timestamps):
+        aggregates[f"related_{i}"] = Max(path)
+
+    row = queryset.order_by().aggregate(**aggregates)
+
+    stamps = [row["last"], *(row[f"related_{i}"] for i in range(len(related_timestamps)))]
+    present = [stamp for stamp in stamps if stamp is not None]
+    last_modified = max(present) if present else None
+
+    raw = "|".join(
+        [
+            str(getattr(request.user, "pk", "")),
+            request.get_full_path(),
+            str(row["count"]),
+            *(stamp.isoformat() if stamp else "-" for stamp in stamps),
+        ]
+    )
+    etag = '"%s"' % hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return Validators(
+        etag=etag,
+        last_modified=None if collection else last_modified,
+        count=row["count"],
+    )
+
+
+def apply_validators(response, validators: Validators):
+    """Проставляет ETag / Last-Modified и заставляет клиента ревалидировать кеш."""
+
+    response["ETag"] = validators.etag
+    if validators.last_modified is not None:
+        response["Last-Modified"] = http_date(validators.last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+def not_modified_response(request, validators: Validators):
+    """Возвращает 304 Not Modified, если клиентская копия актуальна, иначе None."""
+
+    last_modified = (
+        int(validators.last_modified.timestamp()) if validators.last_modified else None
+    )
+    response = get_conditional_response(
+        request,
+        etag=validators.etag,
+        last_modified=last_modified,
+    )
+    if response is None:
+        return None
+    return apply_validators(response, validators)
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET для list-вьюх DRF: отвечает 304 по If-None-Match /
+    If-Modified-Since, не создавая модели и не вызывая сериализатор.
+    """
+
+    conditional_timestamp_field = "updated_at"
+    conditional_related_timestamps: tuple = ()
+
+    def get_conditional_related_timestamps(self) -> tuple:
+        """Связанные даты для валидаторов; вьюха может добавить их по параметрам запроса."""
+
+        return tuple(self.conditional_related_timestamps)
+
+    def list(self, request, *args, **kwargs):
+        validators = compute_validators(
+            self.filter_queryset(self.get_queryset()),
+            request,
+            timestamp_field=self.conditional_timestamp_field,
+            related_timestamps=self.get_conditional_related_timestamps(),
+            collection=True,
+        )
+        not_modified = not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        return apply_validators(response, validators)
@@ -1,8 +1,10 @@
 """tasks/filters.py"""
 
 import django_filters
+from rest_framework.filters import OrderingFilter, SearchFilter
 
 from .models import Task
+from .services.search import search_tasks
 
 
 class TaskFilter(django_filters.FilterSet):
@@ -36,3 +38,35 @@ class TaskFilter(django_filters.FilterSet):
             return queryset.filter(assignee_id=int(value))
 
         return queryset
+
+
+class TaskFullTextSearchFilter(SearchFilter):
+    """
+    ?search= по полнотекстовому индексу (title, description, executor_comment)
+    вместо ILIKE '%x%' по каждому полю.
+
+    Без явного ?ordering= и без курсорной пагинации результаты
+    сортируются по релевантности (rank), иначе — по полю сортировки.
+    Должен стоять в filter_backends после OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+
+        queryset = search_tasks(queryset, text)
+
+        params = request.query_params
+        paginator = getattr(view, "paginator", None)
+        paginated = paginator is not None and any(
+            name in params
+            for name in (
+                getattr(paginator, "cursor_query_param", None),
+                getattr(paginator, "page_size_query_param", None),
+            )
+            if name
+        )
+        if OrderingFilter.ordering_param not in params and not paginated:
+            queryset = queryset.order_by("-rank", "-updated_at")
+        return queryset
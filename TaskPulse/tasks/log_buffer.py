@@ -0,0 +1,138 @@
+"""tasks/log_buffer.py"""
+"""
+Unit-of-work буфер для журналов задач (TaskChangeLog, TaskActionLog).
+
+Пока буфер активен (HTTP-запрос через middleware или Celery-задача),
+TaskChangeLog.log / TaskActionLog.log_action не пишут в БД сразу, а
+копят записи и сохраняют их одним bulk_create на модель:
+
+- записи, сделанные внутри atomic-блока, привязаны к этой транзакции
+  (точке сохранения): on_commit регистрируется на первой такой записи,
+  поэтому откат блока выбрасывает и записи вместе с его изменениями;
+- записи вне транзакции сохраняются в конце единицы работы.
+
+Вне буфера записи пишутся сразу, как раньше.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from celery.signals import task_postrun, task_prerun
+from django.db import models, transaction
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["LogBuffer"]] = ContextVar("task_log_buffer", default=None)
+
+
+class LogBuffer:
+    """Накопитель несохранённых записей журналов."""
+
+    def __init__(self) -> None:
+        self.entries: List[models.Model] = []
+        # пачка текущей транзакции, её flush ждёт коммита в on_commit
+        self._batch: Optional["LogBuffer"] = None
+
+    def add(self, entry: models.Model) -> models.Model:
+        conn = transaction.get_connection()
+        if not conn.in_atomic_block:
+            self.entries.append(entry)
+        else:
+            self._transaction_batch(conn).entries.append(entry)
+        return entry
+
+    def _transaction_batch(self, conn) -> "LogBuffer":  # noqa: ANN001
+        """
+        Пачка для записей текущей транзакции. Переиспользуется, пока её
+        flush стоит в on_commit с теми же точками сохранения; после коммита,
+        отката или входа во вложенный блок заводится новая.
+        """
+
+        sids = set(conn.savepoint_ids)
+        batch = self._batch
+        registered = batch is not None and any(
+            func == batch.flush and callback_sids == sids
+            for callback_sids, func, *_ in reversed(conn.run_on_commit)
+        )
+        if not registered:
+            batch = self._batch = LogBuffer()
+            transaction.on_commit(batch.flush)
+        return batch
+
+    def flush(self) -> None:
+        """Сохраняет накопленные записи: один bulk_create на каждую модель."""
+
+        entries, self.entries = self.entries, []
+        by_model: dict[type, list] = {}
+        for entry in entries:
+            by_model.setdefault(type(entry), []).append(entry)
+        for model, rows in by_model.items():
+            model.objects.bulk_create(rows)
+
+
+def buffer_or_save(entry: models.Model) -> models.Model:
+    """Кладёт запись в активный буфер или, если его нет, сразу сохраняет."""
+
+    buffer = _current.get()
+    if buffer is None:
+        entry.save(force_insert=True)
+        return entry
+    return buffer.add(entry)
+
+
+def activate() -> tuple[LogBuffer, object]:
+    buffer = LogBuffer()
+    return buffer, _current.set(buffer)
+
+
+def deactivate(buffer: LogBuffer, token) -> None:
+    """Закрывает единицу работы и записывает накопленное вне транзакций."""
+
+    _current.reset(token)
+    if buffer.entries:
+        # вне atomic-блока on_commit выполняется сразу
+        transaction.on_commit(buffer.flush)
+
+
+@contextmanager
+def buffered_logs() -> Iterator[LogBuffer]:
+    """Единица работы: все журналы внутри пишутся одной пачкой."""
+
+    buffer, token = activate()
+    try:
+        yield buffer
+    finally:
+        deactivate(buffer, token)
+
+
+class TaskLogBufferMiddleware:
+    """Буферизует журналы задач на время HTTP-запроса."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered_logs():
+            return self.get_response(request)
+
+
+# Celery: одна задача — одна единица работы
+_celery_tokens: dict[str, tuple[LogBuffer, object]] = {}
+
+
+@task_prerun.connect
+def _start_celery_buffer(task_id=None, **kwargs) -> None:  # noqa: ANN001
+    _celery_tokens[task_id] = activate()
+
+
+@task_postrun.connect
+def _flush_celery_buffer(task_id=None, **kwargs) -> None:  # noqa: ANN001
+    state = _celery_tokens.pop(task_id, None)
+    if state is None:
+        return
+    try:
+        deactivate(*state)
+    except Exception:  # noqa: BLE001
+        logger.exception("Не удалось записать журналы задач после Celery-задачи %s", task_id)
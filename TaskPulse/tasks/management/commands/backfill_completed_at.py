@@ -0,0 +1,22 @@
+"""tasks/management/commands/backfill_completed_at.py"""
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.kpi_rollup import backfill_completed_at, rebuild_kpi_rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет Task.completed_at у выполненных задач по журналу изменений "
+        "(последняя запись status → done, иначе updated_at) и пересчитывает rollup KPI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        tasks = backfill_completed_at(batch_size=options["batch_size"])
+        rows = rebuild_kpi_rollup()
+        self.stdout.write(
+            self.style.SUCCESS(f"completed_at заполнен у {tasks} задач, TaskKpiMonthly: {rows} строк.")
+        )
@@ -0,0 +1,37 @@
+"""tasks/management/commands/backfill_task_snapshots.py"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks.services.snapshots import first_task_day, replay_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Восстанавливает ежедневные снимки задач (TaskDailySnapshot) за прошлые дни "
+        "по журналу изменений статуса. По умолчанию — с первой задачи по вчера."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="first_day", type=date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--to", dest="last_day", type=date.fromisoformat, help="YYYY-MM-DD")
+
+    def handle(self, *args, **options):
+        first_day = options["first_day"] or first_task_day()
+        last_day = options["last_day"] or timezone.localdate() - timedelta(days=1)
+        if first_day is None:
+            self.stdout.write("Задач нет — снимки не нужны.")
+            return
+        if first_day > last_day:
+            raise CommandError("--from должен быть не позже --to.")
+
+        day = first_day
+        rows = 0
+        while day <= last_day:
+            rows += replay_day(day)
+            day += timedelta(days=1)
+        self.stdout.write(
+            self.style.SUCCESS(f"Снимки с {first_day} по {last_day} восстановлены: {rows} строк.")
+        )
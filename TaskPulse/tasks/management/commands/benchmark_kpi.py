@@ -0,0 +1,49 @@
+"""tasks/management/commands/benchmark_kpi.py"""
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.services.kpi_engine import bulk_user_month_kpi, numpy_available
+
+
+def _month(value: str) -> date:
+    return date.fromisoformat(f"{value}-01")
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает движки массового KPI (numpy и sql) на текущих данных: "
+        "время расчёта всех исполнителей за диапазон месяцев и совпадение результатов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="first_month", type=_month, required=True, help="YYYY-MM")
+        parser.add_argument("--to", dest="last_month", type=_month, required=True, help="YYYY-MM")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        first_month, last_month = options["first_month"], options["last_month"]
+        if first_month > last_month:
+            raise CommandError("--from должен быть не позже --to.")
+
+        engines = ["sql"] + (["numpy"] if numpy_available() else [])
+        if not numpy_available():
+            self.stdout.write(self.style.WARNING("numpy не установлен — замеряется только sql."))
+
+        results = {}
+        for engine in engines:
+            timings = []
+            for _ in range(max(options["repeat"], 1)):
+                started = time.perf_counter()
+                results[engine] = bulk_user_month_kpi(first_month, last_month, engine=engine)
+                timings.append(time.perf_counter() - started)
+            self.stdout.write(
+                f"{engine:>5}: лучший {min(timings) * 1000:.1f} мс, "
+                f"средний {sum(timings) / len(timings) * 1000:.1f} мс, корзин {len(results[engine])}"
+            )
+
+        if len(results) == 2 and results["sql"] != results["numpy"]:
+            raise CommandError("Результаты движков не совпадают.")
+        self.stdout.write(self.style.SUCCESS("Готово."))
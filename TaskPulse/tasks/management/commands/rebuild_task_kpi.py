@@ -0,0 +1,16 @@
+"""tasks/management/commands/rebuild_task_kpi.py"""
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.kpi_rollup import rebuild_kpi_rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает rollup-таблицу KPI (TaskKpiMonthly) с нуля по задачам. "
+        "Нужен после смены TIME_ZONE или ручных правок таблицы."
+    )
+
+    def handle(self, *args, **options):
+        rows = rebuild_kpi_rollup()
+        self.stdout.write(self.style.SUCCESS(f"TaskKpiMonthly пересчитана: {rows} строк."))
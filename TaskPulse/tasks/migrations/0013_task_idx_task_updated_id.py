@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0012_remove_task_completed_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["updated_at", "id"], name="idx_task_updated_id"),
+        ),
+    ]
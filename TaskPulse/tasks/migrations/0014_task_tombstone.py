@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0013_task_idx_task_updated_id"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField()),
+                ("user_id", models.BigIntegerField()),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[
+                            ("deleted", "Задача удалена"),
+                            ("unassigned", "Пользователь снят с задачи"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ("created_at",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["creator", "updated_at"], name="idx_task_creator_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["assignee", "updated_at"], name="idx_task_assignee_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasktombstone",
+            index=models.Index(
+                fields=["user_id", "created_at"], name="idx_task_tombstone_user_time"
+            ),
+        ),
+    ]
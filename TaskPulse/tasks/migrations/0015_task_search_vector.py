@@ -0,0 +1,87 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+# pg_trgm может быть недоступен (managed-БД, тестовые сборки) — тогда
+# индексы не создаются, а icontains-фильтры работают как раньше.
+TRIGRAM_INDEXES_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS idx_task_title_trgm
+            ON tasks_task USING gin (UPPER(title::text) gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_task_description_trgm
+            ON tasks_task USING gin (UPPER(description::text) gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+DROP_TRIGRAM_INDEXES_SQL = """
+DROP INDEX IF EXISTS idx_task_title_trgm;
+DROP INDEX IF EXISTS idx_task_description_trgm;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0014_task_tombstone"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.CombinedSearchVector(
+                        django.contrib.postgres.search.SearchVector(
+                            "title", config="russian", weight="A"
+                        ),
+                        "||",
+                        django.contrib.postgres.search.SearchVector(
+                            "description", config="russian", weight="B"
+                        ),
+                        django.contrib.postgres.search.SearchConfig("russian"),
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "executor_comment", config="russian", weight="C"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("russian"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskmessage",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "text", config="russian"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="idx_task_search"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskmessage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="idx_task_message_search"
+            ),
+        ),
+        migrations.RunSQL(TRIGRAM_INDEXES_SQL, DROP_TRIGRAM_INDEXES_SQL),
+    ]
@@ -0,0 +1,186 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Месяц дедлайна считается в TIME_ZONE проекта (как due_at__month / TruncMonth).
+# При смене TIME_ZONE нужен manage.py rebuild_task_kpi.
+KPI_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION tasks_kpi_monthly_apply(
+    p_creator bigint, p_assignee bigint, p_due timestamptz,
+    p_priority varchar, p_status varchar, p_updated timestamptz, p_sign integer
+) RETURNS void AS $$
+DECLARE
+    v_month date;
+    v_done integer;
+    v_on_time integer;
+BEGIN
+    IF p_assignee IS NULL THEN
+        RETURN;
+    END IF;
+
+    v_month := date_trunc('month', p_due AT TIME ZONE %(tz)s)::date;
+    v_done := CASE WHEN p_status = 'done' THEN 1 ELSE 0 END;
+    v_on_time := CASE WHEN v_done = 1 AND (p_due IS NULL OR p_updated <= p_due) THEN 1 ELSE 0 END;
+
+    INSERT INTO tasks_taskkpimonthly
+        (creator_id, assignee_id, month, priority, total, done, done_on_time, done_late)
+    VALUES
+        (p_creator, p_assignee, v_month, p_priority,
+         p_sign, p_sign * v_done, p_sign * v_on_time, p_sign * (v_done - v_on_time))
+    ON CONFLICT (creator_id, assignee_id, month, priority) DO UPDATE SET
+        total = tasks_taskkpimonthly.total + EXCLUDED.total,
+        done = tasks_taskkpimonthly.done + EXCLUDED.done,
+        done_on_time = tasks_taskkpimonthly.done_on_time + EXCLUDED.done_on_time,
+        done_late = tasks_taskkpimonthly.done_late + EXCLUDED.done_late;
+
+    IF p_sign < 0 THEN
+        DELETE FROM tasks_taskkpimonthly
+        WHERE creator_id = p_creator
+          AND assignee_id = p_assignee
+          AND month IS NOT DISTINCT FROM v_month
+          AND priority = p_priority
+          AND total = 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_task_kpi_monthly_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND OLD.creator_id = NEW.creator_id
+       AND OLD.assignee_id IS NOT DISTINCT FROM NEW.assignee_id
+       AND OLD.due_at IS NOT DISTINCT FROM NEW.due_at
+       AND OLD.priority = NEW.priority
+       AND OLD.status = NEW.status
+       AND (NEW.status <> 'done'
+            OR (OLD.updated_at <= OLD.due_at) IS NOT DISTINCT FROM (NEW.updated_at <= NEW.due_at))
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM tasks_kpi_monthly_apply(
+            OLD.creator_id, OLD.assignee_id, OLD.due_at,
+            OLD.priority, OLD.status, OLD.updated_at, -1
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM tasks_kpi_monthly_apply(
+            NEW.creator_id, NEW.assignee_id, NEW.due_at,
+            NEW.priority, NEW.status, NEW.updated_at, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_kpi_monthly
+    AFTER INSERT OR UPDATE OR DELETE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_kpi_monthly_trigger();
+
+INSERT INTO tasks_taskkpimonthly
+    (creator_id, assignee_id, month, priority, total, done, done_on_time, done_late)
+SELECT
+    creator_id,
+    assignee_id,
+    date_trunc('month', due_at AT TIME ZONE %(tz)s)::date,
+    priority,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'done'),
+    COUNT(*) FILTER (WHERE status = 'done' AND (due_at IS NULL OR updated_at <= due_at)),
+    COUNT(*) FILTER (WHERE status = 'done' AND updated_at > due_at)
+FROM tasks_task
+WHERE assignee_id IS NOT NULL
+GROUP BY 1, 2, 3, 4;
+"""
+
+DROP_KPI_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS tasks_task_kpi_monthly ON tasks_task;
+DROP FUNCTION IF EXISTS tasks_task_kpi_monthly_trigger();
+DROP FUNCTION IF EXISTS tasks_kpi_monthly_apply(bigint, bigint, timestamptz, varchar, varchar, timestamptz, integer);
+"""
+
+
+def install_kpi_trigger(apps, schema_editor):
+    tz = schema_editor.quote_value(settings.TIME_ZONE)
+    schema_editor.execute(KPI_TRIGGER_SQL.replace("%(tz)s", tz), params=None)
+
+
+def drop_kpi_trigger(apps, schema_editor):
+    schema_editor.execute(DROP_KPI_TRIGGER_SQL, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0015_task_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskKpiMonthly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(blank=True, null=True)),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("low", "Low"),
+                            ("medium", "Medium"),
+                            ("high", "High"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("total", models.IntegerField(default=0)),
+                ("done", models.IntegerField(default=0)),
+                ("done_on_time", models.IntegerField(default=0)),
+                ("done_late", models.IntegerField(default=0)),
+                (
+                    "assignee",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "creator",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["assignee", "month"], name="idx_task_kpi_assignee_month"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("creator", "assignee", "month", "priority"),
+                        name="uniq_task_kpi_monthly",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(install_kpi_trigger, drop_kpi_trigger),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:45
+
+import django.db.models.deletion
+import tasks.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0016_task_kpi_monthly"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "report_type",
+                    models.CharField(
+                        choices=[
+                            ("range_kpi", "KPI команды за период"),
+                            ("tasks_export", "Выгрузка задач"),
+                            ("changes_export", "Выгрузка журнала изменений"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[("csv", "CSV"), ("xlsx", "XLSX")],
+                        default="csv",
+                        max_length=8,
+                    ),
+                ),
+                ("params", models.JSONField(blank=True, default=dict)),
+                ("params_hash", models.CharField(max_length=64)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В очереди"),
+                            ("running", "Строится"),
+                            ("done", "Готов"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("progress", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True,
+                        null=True,
+                        upload_to=tasks.models.report_job_upload_to,
+                    ),
+                ),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "creator",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="report_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-created_at",),
+                "indexes": [
+                    models.Index(
+                        fields=["creator", "report_type", "params_hash", "created_at"],
+                        name="idx_report_job_lookup",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:51
+
+from importlib import import_module
+
+from django.conf import settings
+from django.db import migrations, models
+
+kpi_monthly = import_module("tasks.migrations.0016_task_kpi_monthly")
+
+# Момент выполнения для уже закрытых задач: последняя запись журнала
+# «status → done», иначе updated_at (лучшее, что известно).
+BACKFILL_COMPLETED_AT_SQL = """
+UPDATE tasks_task AS t
+SET completed_at = COALESCE(
+    (SELECT MAX(l.changed_at)
+     FROM tasks_taskchangelog AS l
+     WHERE l.task_id = t.id AND l.field = 'status' AND l.new_value = 'done'),
+    t.updated_at
+)
+WHERE t.status = 'done' AND t.completed_at IS NULL;
+"""
+
+# Триггер rollup из 0016, но «вовремя» — по completed_at, а не по updated_at:
+# правка уже выполненной задачи больше не переводит её в «поздно».
+KPI_TRIGGER_SQL = """
+CREATE FUNCTION tasks_kpi_monthly_apply(
+    p_creator bigint, p_assignee bigint, p_due timestamptz,
+    p_priority varchar, p_status varchar, p_completed timestamptz, p_sign integer
+) RETURNS void AS $$
+DECLARE
+    v_month date;
+    v_done integer;
+    v_on_time integer;
+BEGIN
+    IF p_assignee IS NULL THEN
+        RETURN;
+    END IF;
+
+    v_month := date_trunc('month', p_due AT TIME ZONE %(tz)s)::date;
+    v_done := CASE WHEN p_status = 'done' THEN 1 ELSE 0 END;
+    v_on_time := CASE WHEN v_done = 1 AND (p_due IS NULL OR p_completed <= p_due) THEN 1 ELSE 0 END;
+
+    INSERT INTO tasks_taskkpimonthly
+        (creator_id, assignee_id, month, priority, total, done, done_on_time, done_late)
+    VALUES
+        (p_creator, p_assignee, v_month, p_priority,
+         p_sign, p_sign * v_done, p_sign * v_on_time, p_sign * (v_done - v_on_time))
+    ON CONFLICT (creator_id, assignee_id, month, priority) DO UPDATE SET
+        total = tasks_taskkpimonthly.total + EXCLUDED.total,
+        done = tasks_taskkpimonthly.done + EXCLUDED.done,
+        done_on_time = tasks_taskkpimonthly.done_on_time + EXCLUDED.done_on_time,
+        done_late = tasks_taskkpimonthly.done_late + EXCLUDED.done_late;
+
+    IF p_sign < 0 THEN
+        DELETE FROM tasks_taskkpimonthly
+        WHERE creator_id = p_creator
+          AND assignee_id = p_assignee
+          AND month IS NOT DISTINCT FROM v_month
+          AND priority = p_priority
+          AND total = 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION tasks_task_kpi_monthly_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND OLD.creator_id = NEW.creator_id
+       AND OLD.assignee_id IS NOT DISTINCT FROM NEW.assignee_id
+       AND OLD.due_at IS NOT DISTINCT FROM NEW.due_at
+       AND OLD.priority = NEW.priority
+       AND OLD.status = NEW.status
+       AND (NEW.status <> 'done' OR OLD.completed_at IS NOT DISTINCT FROM NEW.completed_at)
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM tasks_kpi_monthly_apply(
+            OLD.creator_id, OLD.assignee_id, OLD.due_at,
+            OLD.priority, OLD.status, OLD.completed_at, -1
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM tasks_kpi_monthly_apply(
+            NEW.creator_id, NEW.assignee_id, NEW.due_at,
+            NEW.priority, NEW.status, NEW.completed_at, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_kpi_monthly
+    AFTER INSERT OR UPDATE OR DELETE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_kpi_monthly_trigger();
+
+DELETE FROM tasks_taskkpimonthly;
+
+INSERT INTO tasks_taskkpimonthly
+    (creator_id, assignee_id, month, priority, total, done, done_on_time, done_late)
+SELECT
+    creator_id,
+    assignee_id,
+    date_trunc('month', due_at AT TIME ZONE %(tz)s)::date,
+    priority,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'done'),
+    COUNT(*) FILTER (WHERE status = 'done' AND (due_at IS NULL OR completed_at <= due_at)),
+    COUNT(*) FILTER (WHERE status = 'done' AND due_at IS NOT NULL AND (completed_at <= due_at) IS NOT TRUE)
+FROM tasks_task
+WHERE assignee_id IS NOT NULL
+GROUP BY 1, 2, 3, 4;
+"""
+
+
+def backfill_and_switch_trigger(apps, schema_editor):
+    schema_editor.execute(BACKFILL_COMPLETED_AT_SQL, params=None)
+    kpi_monthly.drop_kpi_trigger(apps, schema_editor)
+    tz = schema_editor.quote_value(settings.TIME_ZONE)
+    schema_editor.execute(KPI_TRIGGER_SQL.replace("%(tz)s", tz), params=None)
+
+
+def restore_updated_at_trigger(apps, schema_editor):
+    kpi_monthly.drop_kpi_trigger(apps, schema_editor)
+    schema_editor.execute("DELETE FROM tasks_taskkpimonthly", params=None)
+    kpi_monthly.install_kpi_trigger(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0017_report_job"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_and_switch_trigger, restore_updated_at_trigger),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("status", "done")),
+                fields=["assignee", "due_at", "completed_at"],
+                name="idx_task_done_assignee_due",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("status", "done")),
+                fields=["creator", "due_at", "completed_at"],
+                name="idx_task_done_creator_due",
+            ),
+        ),
+    ]
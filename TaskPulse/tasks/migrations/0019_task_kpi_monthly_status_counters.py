@@ -0,0 +1,145 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:53
+
+from importlib import import_module
+
+from django.conf import settings
+from django.db import migrations, models
+
+kpi_monthly = import_module("tasks.migrations.0016_task_kpi_monthly")
+completed_at = import_module("tasks.migrations.0018_task_completed_at")
+
+# Триггер rollup из 0018 плюс счётчики статусов in_progress / overdue
+KPI_TRIGGER_SQL = """
+CREATE FUNCTION tasks_kpi_monthly_apply(
+    p_creator bigint, p_assignee bigint, p_due timestamptz,
+    p_priority varchar, p_status varchar, p_completed timestamptz, p_sign integer
+) RETURNS void AS $$
+DECLARE
+    v_month date;
+    v_done integer;
+    v_on_time integer;
+    v_in_progress integer;
+    v_overdue integer;
+BEGIN
+    IF p_assignee IS NULL THEN
+        RETURN;
+    END IF;
+
+    v_month := date_trunc('month', p_due AT TIME ZONE %(tz)s)::date;
+    v_done := CASE WHEN p_status = 'done' THEN 1 ELSE 0 END;
+    v_on_time := CASE WHEN v_done = 1 AND (p_due IS NULL OR p_completed <= p_due) THEN 1 ELSE 0 END;
+    v_in_progress := CASE WHEN p_status = 'in_progress' THEN 1 ELSE 0 END;
+    v_overdue := CASE WHEN p_status = 'overdue' THEN 1 ELSE 0 END;
+
+    INSERT INTO tasks_taskkpimonthly
+        (creator_id, assignee_id, month, priority,
+         total, done, done_on_time, done_late, in_progress, overdue)
+    VALUES
+        (p_creator, p_assignee, v_month, p_priority,
+         p_sign, p_sign * v_done, p_sign * v_on_time, p_sign * (v_done - v_on_time),
+         p_sign * v_in_progress, p_sign * v_overdue)
+    ON CONFLICT (creator_id, assignee_id, month, priority) DO UPDATE SET
+        total = tasks_taskkpimonthly.total + EXCLUDED.total,
+        done = tasks_taskkpimonthly.done + EXCLUDED.done,
+        done_on_time = tasks_taskkpimonthly.done_on_time + EXCLUDED.done_on_time,
+        done_late = tasks_taskkpimonthly.done_late + EXCLUDED.done_late,
+        in_progress = tasks_taskkpimonthly.in_progress + EXCLUDED.in_progress,
+        overdue = tasks_taskkpimonthly.overdue + EXCLUDED.overdue;
+
+    IF p_sign < 0 THEN
+        DELETE FROM tasks_taskkpimonthly
+        WHERE creator_id = p_creator
+          AND assignee_id = p_assignee
+          AND month IS NOT DISTINCT FROM v_month
+          AND priority = p_priority
+          AND total = 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION tasks_task_kpi_monthly_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND OLD.creator_id = NEW.creator_id
+       AND OLD.assignee_id IS NOT DISTINCT FROM NEW.assignee_id
+       AND OLD.due_at IS NOT DISTINCT FROM NEW.due_at
+       AND OLD.priority = NEW.priority
+       AND OLD.status = NEW.status
+       AND (NEW.status <> 'done' OR OLD.completed_at IS NOT DISTINCT FROM NEW.completed_at)
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM tasks_kpi_monthly_apply(
+            OLD.creator_id, OLD.assignee_id, OLD.due_at,
+            OLD.priority, OLD.status, OLD.completed_at, -1
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        PERFORM tasks_kpi_monthly_apply(
+            NEW.creator_id, NEW.assignee_id, NEW.due_at,
+            NEW.priority, NEW.status, NEW.completed_at, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_kpi_monthly
+    AFTER INSERT OR UPDATE OR DELETE ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_kpi_monthly_trigger();
+
+DELETE FROM tasks_taskkpimonthly;
+
+INSERT INTO tasks_taskkpimonthly
+    (creator_id, assignee_id, month, priority,
+     total, done, done_on_time, done_late, in_progress, overdue)
+SELECT
+    creator_id,
+    assignee_id,
+    date_trunc('month', due_at AT TIME ZONE %(tz)s)::date,
+    priority,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'done'),
+    COUNT(*) FILTER (WHERE status = 'done' AND (due_at IS NULL OR completed_at <= due_at)),
+    COUNT(*) FILTER (WHERE status = 'done' AND due_at IS NOT NULL AND (completed_at <= due_at) IS NOT TRUE),
+    COUNT(*) FILTER (WHERE status = 'in_progress'),
+    COUNT(*) FILTER (WHERE status = 'overdue')
+FROM tasks_task
+WHERE assignee_id IS NOT NULL
+GROUP BY 1, 2, 3, 4;
+"""
+
+
+def install_status_counters_trigger(apps, schema_editor):
+    kpi_monthly.drop_kpi_trigger(apps, schema_editor)
+    tz = schema_editor.quote_value(settings.TIME_ZONE)
+    schema_editor.execute(KPI_TRIGGER_SQL.replace("%(tz)s", tz), params=None)
+
+
+def restore_completed_at_trigger(apps, schema_editor):
+    kpi_monthly.drop_kpi_trigger(apps, schema_editor)
+    tz = schema_editor.quote_value(settings.TIME_ZONE)
+    schema_editor.execute(completed_at.KPI_TRIGGER_SQL.replace("%(tz)s", tz), params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0018_task_completed_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskkpimonthly",
+            name="in_progress",
+            field=models.IntegerField(db_default=0, default=0),
+        ),
+        migrations.AddField(
+            model_name="taskkpimonthly",
+            name="overdue",
+            field=models.IntegerField(db_default=0, default=0),
+        ),
+        migrations.RunPython(install_status_counters_trigger, restore_completed_at_trigger),
+    ]
@@ -5,9 +5,13 @@ from datetime import datetime
 from typing import Optional
 
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
 from django.utils import timezone
 
+from tasks.log_buffer import buffer_or_save
+
 User = get_user_model()
 
 
@@ -27,6 +31,23 @@ def task_message_upload_to(instance, filename):
     return f"task_messages/{folder}/{unique}_{filename}"
 
 
+def report_job_upload_to(instance: "ReportJob", filename: str) -> str:
+    """Путь готового файла отчёта: по папке на создателя."""
+
+    return f"reports/{instance.creator_id}/{instance.pk}_{filename}"
+
+
+# Конфигурация полнотекстового поиска (tsvector / tsquery)
+SEARCH_CONFIG = "russian"
+
+
+class SearchVectorDeferredManager(models.Manager):
+    """Менеджер, который не читает search_vector, пока его не запросят явно."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
+
 class Task(models.Model):
     """Модель задачи."""
 
@@ -73,8 +94,24 @@ class Task(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # момент перехода в DONE; в отличие от updated_at не сдвигается
+    # последующими правками, поэтому по нему считаются «вовремя/поздно»
+    completed_at = models.DateTimeField(null=True, blank=True)
     reminder_sent_at = models.DateTimeField(null=True, blank=True)
 
+    # Поддерживается самой БД (GENERATED ... STORED), индексируется GIN
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+            + SearchVector("executor_comment", weight="C", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SearchVectorDeferredManager()
+
     def __str__(self) -> str:
         """Возвращает человеко-читаемое строковое представление задачи."""
 
@@ -101,44 +138,140 @@ class Task(models.Model):
             return True
         return False
 
+    # Поля, изменения которых пишутся в журнал и отслеживаются сигналами
+    TRACKED_FIELDS = ("priority", "status", "due_at", "assignee_id")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные из БД значения отслеживаемых полей."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_tracked(kwargs.get("fields") or (args[1] if len(args) > 1 else None))
+
+    def _remember_tracked(self, fields=None) -> None:
+        """Обновляет снимок значений (только для реально загруженных полей)."""
+
+        snapshot = getattr(self, "_loaded_values", {})
+        for attname in self.TRACKED_FIELDS:
+            name = attname[:-3] if attname.endswith("_id") else attname
+            if fields is not None and name not in fields and attname not in fields:
+                continue
+            if attname in self.__dict__:
+                snapshot[attname] = self.__dict__[attname]
+        self._loaded_values = snapshot
+
+    def _old_tracked_values(self) -> dict:
+        """
+        Значения отслеживаемых полей до изменения: из снимка, сделанного
+        при загрузке из БД. Запрос в БД — только если снимка нет
+        (объект собран вручную или поле было отложено через only/defer).
+        """
+
+        snapshot = dict(getattr(self, "_loaded_values", {}))
+        missing = [f for f in self.TRACKED_FIELDS if f not in snapshot and f in self.__dict__]
+        if missing:
+            row = Task.objects.filter(pk=self.pk).values(*missing).first()
+            snapshot.update(row or {})
+        return snapshot
+
+    def _sync_completed_at(self, update_fields, kwargs) -> None:
+        """
+        Ставит completed_at при переходе в DONE и сбрасывает при выходе из него.
+        Если сохраняются только update_fields со статусом — добавляет completed_at к ним.
+        """
+
+        if update_fields is not None and "status" not in update_fields:
+            return
+
+        if self.status == self.Status.DONE:
+            # уже была выполнена или создаётся с явно заданным моментом — не трогаем
+            if self._old_status == self.Status.DONE or (self._old_status is None and self.completed_at):
+                return
+            completed_at = timezone.now()
+        else:
+            completed_at = None
+
+        if completed_at == self.completed_at:
+            return
+        self.completed_at = completed_at
+        if update_fields is not None:
+            kwargs["update_fields"] = [*update_fields, "completed_at"]
+
     def save(self, *args, **kwargs) -> None:
-        """Сохраняет задачу и при необходимости логирует изменения."""
+        """
+        Сохраняет задачу и при необходимости логирует изменения.
+        Всё — строка задачи, журнал, tombstones и записи outbox из
+        post_save — в одной транзакции.
+        """
+
+        with transaction.atomic(savepoint=False):
+            self._save_tracked(*args, **kwargs)
 
+    def _save_tracked(self, *args, **kwargs) -> None:
         is_create = self.pk is None
+        update_fields = kwargs.get("update_fields")
 
-        old: Optional["Task"] = None
+        old: dict = {}
         if not is_create:
-            old = Task.objects.only("priority", "status", "due_at").get(pk=self.pk)
+            old = self._old_tracked_values()
+            if update_fields is not None:
+                saved = {self._meta.get_field(name).attname for name in update_fields}
+                old = {key: value for key, value in old.items() if key in saved}
+
+        # старый статус нужен post_save-сигналу (переход в DONE);
+        # если статус не сохраняется в этот раз — перехода нет
+        self._old_status = None if is_create else old.get("status", self.status)  # type: ignore[attr-defined]
+        # значения до сохранения — для post_save (инвалидация KPI-кэша)
+        self._old_values = old  # type: ignore[attr-defined]
+
+        self._sync_completed_at(update_fields, kwargs)
 
         super().save(*args, **kwargs)
 
-        if old:
-            if old.priority != self.priority:
-                TaskChangeLog.log(
-                    task=self,
-                    field="priority",
-                    old_value=old.priority,
-                    new_value=self.priority,
-                    reason="Изменение приоритета",
-                )
-            if old.status != self.status:
-                TaskChangeLog.log(
-                    task=self,
-                    changed_by=None,
-                    field="status",
-                    old_value=old.status,
-                    new_value=self.status,
-                    reason="Изменение статуса",
-                )
-            if (old.due_at or None) != (self.due_at or None):
-                TaskChangeLog.log(
-                    task=self,
-                    changed_by=None,
-                    field="due_at",
-                    old_value=old.due_at.isoformat() if old.due_at else None,
-                    new_value=self.due_at.isoformat() if self.due_at else None,
-                    reason="Изменение срока",
-                )
+        self._remember_tracked(update_fields)
+
+        if "priority" in old and old["priority"] != self.priority:
+            TaskChangeLog.log(
+                task=self,
+                field="priority",
+                old_value=old["priority"],
+                new_value=self.priority,
+                reason="Изменение приоритета",
+            )
+        if "status" in old and old["status"] != self.status:
+            TaskChangeLog.log(
+                task=self,
+                changed_by=None,
+                field="status",
+                old_value=old["status"],
+                new_value=self.status,
+                reason="Изменение статуса",
+            )
+        if "due_at" in old and (old["due_at"] or None) != (self.due_at or None):
+            TaskChangeLog.log(
+                task=self,
+                changed_by=None,
+                field="due_at",
+                old_value=old["due_at"].isoformat() if old["due_at"] else None,
+                new_value=self.due_at.isoformat() if self.due_at else None,
+                reason="Изменение срока",
+            )
+        old_assignee_id = old.get("assignee_id")
+        if (
+                old_assignee_id
+                and old_assignee_id != self.assignee_id
+                and old_assignee_id != self.creator_id
+        ):
+            TaskTombstone.objects.create(
+                task_id=self.pk,
+                user_id=old_assignee_id,
+                reason=TaskTombstone.Reason.UNASSIGNED,
+            )
 
     class Meta:
         """Метаданные модели Task."""
@@ -152,6 +285,21 @@ class Task(models.Model):
                 fields=["priority", "status"], name="idx_task_priority_status"
             ),
             models.Index(fields=["due_at"], name="idx_task_due"),
+            models.Index(fields=["updated_at", "id"], name="idx_task_updated_id"),
+            models.Index(fields=["creator", "updated_at"], name="idx_task_creator_updated"),
+            models.Index(fields=["assignee", "updated_at"], name="idx_task_assignee_updated"),
+            GinIndex(fields=["search_vector"], name="idx_task_search"),
+            # только выполненные задачи: счётчики «вовремя/поздно» — index-only scan
+            models.Index(
+                fields=["assignee", "due_at", "completed_at"],
+                condition=models.Q(status="done"),
+                name="idx_task_done_assignee_due",
+            ),
+            models.Index(
+                fields=["creator", "due_at", "completed_at"],
+                condition=models.Q(status="done"),
+                name="idx_task_done_creator_due",
+            ),
         ]
 
     @property
@@ -160,18 +308,32 @@ class Task(models.Model):
 
         return self.creator.full_name or self.creator.email
 
+    def last_result_attachment(self) -> Optional["TaskAttachment"]:
+        """
+        Последнее вложение-результат от исполнителя.
+        Если attachments уже загружены через prefetch_related,
+        выбираем из них в памяти, без отдельного запроса на каждую задачу.
+        """
+
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("attachments")
+        if prefetched is None:
+            return (
+                self.attachments
+                .filter(kind=TaskAttachment.Kind.RESULT)
+                .order_by("-created_at")
+                .first()
+            )
+
+        results = [a for a in prefetched if a.kind == TaskAttachment.Kind.RESULT]
+        return max(results, key=lambda a: (a.created_at, a.pk), default=None)
+
     def last_result_file_url(self) -> Optional[str]:
         """
         URL последнего файла-результата от исполнителя,
         если такой есть.
         """
 
-        result = (
-            self.attachments
-            .filter(kind=TaskAttachment.Kind.RESULT)
-            .order_by("-created_at")
-            .first()
-        )
+        result = self.last_result_attachment()
         if result and result.file:
             try:
                 return result.file.url
@@ -256,15 +418,20 @@ class TaskChangeLog(models.Model):
             reason: str = "",
             changed_by: Optional[User] = None,
     ) -> "TaskChangeLog":
-        """Создаёт и сохраняет запись в журнале изменений задачи."""
-
-        return cls.objects.create(
-            task=task,
-            changed_by=changed_by,
-            field=field,
-            old_value=old_value,
-            new_value=new_value,
-            reason=reason,
+        """
+        Создаёт запись в журнале изменений задачи. Внутри единицы работы
+        (запрос, Celery-задача) запись уходит в БД пачкой после коммита.
+        """
+
+        return buffer_or_save(
+            cls(
+                task=task,
+                changed_by=changed_by,
+                field=field,
+                old_value=old_value,
+                new_value=new_value,
+                reason=reason,
+            )
         )
 
     class Meta:
@@ -346,15 +513,17 @@ class TaskActionLog(models.Model):
             old_due_at: Optional[datetime] = None,
             new_due_at: Optional[datetime] = None,
     ) -> "TaskActionLog":
-        """Удобный класс-метод для записи действия в журнал."""
-
-        return cls.objects.create(
-            task=task,
-            user=user,
-            action=action,
-            comment=comment,
-            old_due_at=old_due_at,
-            new_due_at=new_due_at,
+        """Удобный класс-метод для записи действия в журнал (буферизуется, как TaskChangeLog.log)."""
+
+        return buffer_or_save(
+            cls(
+                task=task,
+                user=user,
+                action=action,
+                comment=comment,
+                old_due_at=old_due_at,
+                new_due_at=new_due_at,
+            )
         )
 
     class Meta:
@@ -395,12 +564,29 @@ class TaskMessage(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    search_vector = models.GeneratedField(
+        expression=SearchVector("text", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SearchVectorDeferredManager()
+
     class Meta:
         ordering = ("created_at",)
+        indexes = [
+            GinIndex(fields=["search_vector"], name="idx_task_message_search"),
+        ]
 
     def __str__(self) -> str:
         return f"Message #{self.pk} for task {self.task_id} from {self.sender_id}"
 
+    def save(self, *args, **kwargs) -> None:
+        """Сообщение и уведомление о нём в outbox (post_save) — одной транзакцией."""
+
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
     @property
     def sender_name(self) -> str:
         return self.sender.full_name or self.sender.email
@@ -412,3 +598,164 @@ class TaskMessage(models.Model):
     @property
     def is_from_executor(self) -> bool:
         return self.sender_id == self.task.assignee_id
+
+
+class TaskTombstone(models.Model):
+    """
+    След исчезновения задачи у пользователя (для delta-sync):
+    задачу удалили или пользователя сняли с неё исполнителем.
+    Без FK на задачу и пользователя — записи переживают удаление обоих.
+    """
+
+    class Reason(models.TextChoices):
+        DELETED = "deleted", "Задача удалена"
+        UNASSIGNED = "unassigned", "Пользователь снят с задачи"
+
+    task_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("created_at",)
+        indexes = [
+            models.Index(fields=["user_id", "created_at"], name="idx_task_tombstone_user_time"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Tombstone[{self.reason}] task {self.task_id} for user {self.user_id}"
+
+
+class TaskKpiMonthly(models.Model):
+    """
+    Rollup KPI: счётчики задач по (создатель, исполнитель, месяц дедлайна, приоритет).
+
+    Таблицу ведёт триггер БД на tasks_task (миграции 0016, 0018, 0019): любое изменение
+    задачи — save(), queryset.update(), массовые операции, удаление — в той же
+    транзакции сдвигает счётчики. Задачи без исполнителя не учитываются,
+    задачи без дедлайна попадают в строку с month=NULL.
+    Полный пересчёт: manage.py rebuild_task_kpi.
+    """
+
+    # db_constraint=False: строки уходят вместе с задачами (триггер
+    # обнуляет счётчики), а не каскадом от удаления пользователя
+    creator = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    assignee = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    month = models.DateField(null=True, blank=True)
+    priority = models.CharField(max_length=10, choices=Task.Priority.choices)
+
+    total = models.IntegerField(default=0)
+    done = models.IntegerField(default=0)
+    done_on_time = models.IntegerField(default=0)
+    done_late = models.IntegerField(default=0)
+    # текущие статусы невыполненных задач (для сводок кабинета)
+    in_progress = models.IntegerField(default=0, db_default=0)
+    overdue = models.IntegerField(default=0, db_default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["creator", "assignee", "month", "priority"],
+                nulls_distinct=False,
+                name="uniq_task_kpi_monthly",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["assignee", "month"], name="idx_task_kpi_assignee_month"),
+        ]
+
+    def __str__(self) -> str:
+        return f"KPI {self.month} creator {self.creator_id} → {self.assignee_id} [{self.priority}]"
+
+
+class TaskDailySnapshot(models.Model):
+    """
+    Снимок состояния задач на конец дня по (создатель, исполнитель) —
+    для burndown и графиков трендов. Пишется ночной Celery-задачей одним
+    INSERT ... SELECT; прошлые дни восстанавливаются по TaskChangeLog
+    (manage.py backfill_task_snapshots).
+    """
+
+    day = models.DateField()
+    creator = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    # NULL — задачи без исполнителя
+    assignee = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name="+"
+    )
+
+    # open — все невыполненные (new + in_progress + overdue)
+    open = models.IntegerField(default=0)
+    in_progress = models.IntegerField(default=0)
+    overdue = models.IntegerField(default=0)
+    done = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "creator", "assignee"],
+                nulls_distinct=False,
+                name="uniq_task_daily_snapshot",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["creator", "day"], name="idx_task_snapshot_creator_day"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Snapshot {self.day} creator {self.creator_id} → {self.assignee_id}"
+
+
+class ReportJob(models.Model):
+    """
+    Фоновое построение отчёта (Celery): параметры, прогресс и готовый файл в MEDIA_ROOT.
+    Одинаковые запросы (создатель, тип, формат, параметры) в пределах TTL
+    переиспользуют уже поставленную или готовую задачу — по params_hash.
+    """
+
+    class ReportType(models.TextChoices):
+        RANGE_KPI = "range_kpi", "KPI команды за период"
+        TASKS_EXPORT = "tasks_export", "Выгрузка задач"
+        CHANGES_EXPORT = "changes_export", "Выгрузка журнала изменений"
+
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        XLSX = "xlsx", "XLSX"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "В очереди"
+        RUNNING = "running", "Строится"
+        DONE = "done", "Готов"
+        FAILED = "failed", "Ошибка"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name="report_jobs")
+    report_type = models.CharField(max_length=32, choices=ReportType.choices)
+    format = models.CharField(max_length=8, choices=Format.choices, default=Format.CSV)
+    params = models.JSONField(default=dict, blank=True)
+    params_hash = models.CharField(max_length=64)
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    progress = models.PositiveSmallIntegerField(default=0)
+    file = models.FileField(upload_to=report_job_upload_to, blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["creator", "report_type", "params_hash", "created_at"],
+                name="idx_report_job_lookup",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"ReportJob {self.report_type} [{self.status}] for {self.creator_id}"
@@ -0,0 +1,163 @@
+"""tasks/pagination.py"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) пагинация по паре (поле сортировки, id).
+
+    Курсор хранит значение поля сортировки и id последней строки страницы,
+    поэтому следующая страница выбирается условием WHERE по индексу,
+    без OFFSET — стоимость не зависит от «глубины» страницы.
+
+    Поле сортировки берётся из уже отсортированного queryset
+    (OrderingFilter или order_by во view), id добавляется как tie-breaker.
+    NULL-значения (например, due_at) всегда идут в конце; для NOT NULL
+    полей NULLS LAST не пишется, иначе DESC-порядок не совпадёт с
+    индексом (поле, id) и Postgres не сможет пройти его в обратную сторону.
+
+    Пагинация включается, только если клиент передал cursor или page_size:
+    без них список отдаётся целиком, как раньше (контракт фронтенда).
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 50
+    max_page_size = 500
+    invalid_cursor_message = "Некорректный курсор."
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> Optional[List[Any]]:
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.model = queryset.model
+        self.page_size_value = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(queryset)
+
+        queryset = queryset.order_by(*self._order_by())
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(*cursor))
+
+        rows = list(queryset[: self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[: self.page_size_value]
+        return self.page
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        """Размер страницы из ?page_size=, ограниченный max_page_size."""
+
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            return self.page_size
+        if value <= 0:
+            return self.page_size
+        return min(value, self.max_page_size)
+
+    def get_ordering(self, queryset: QuerySet) -> Tuple[str, bool]:
+        """Возвращает (имя поля, убывание) для первого поля сортировки."""
+
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        first = str(ordering[0]) if ordering else "-pk"
+        descending = first.startswith("-")
+        name = first.lstrip("-")
+        if name == "pk":
+            name = queryset.model._meta.pk.name
+        return name, descending
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+
+        last = self.page[-1]
+        value = getattr(last, self.field)
+        if value is not None:
+            value = self._model_field().value_to_string(last)
+        payload = json.dumps({"v": value, "id": last.pk}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size_value)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> Optional[Tuple[Any, int]]:
+        """Разбирает ?cursor= в (значение поля, id). Без курсора — None."""
+
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8"))
+            raw, pk = payload["v"], int(payload["id"])
+            model_field = self._model_field()
+            value = None if raw is None else model_field.to_python(raw)
+        except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def _model_field(self):
+        try:
+            return self.model._meta.get_field(self.field)
+        except FieldDoesNotExist:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _nullable(self) -> bool:
+        try:
+            return self.model._meta.get_field(self.field).null
+        except FieldDoesNotExist:
+            # аннотация — NULL возможен
+            return True
+
+    def _order_by(self) -> list:
+        expr = F(self.field)
+        nulls_last = True if self._nullable() else None
+        if self.descending:
+            return [expr.desc(nulls_last=nulls_last), "-id"]
+        return [expr.asc(nulls_last=nulls_last), "id"]
+
+    def _after(self, value: Any, pk: int) -> Q:
+        """
+        Условие «строго после (value, pk)» в текущем порядке сортировки.
+        Граница по полю (<= / >=) оставлена отдельным условием, чтобы
+        Postgres мог начать скан индекса прямо с позиции курсора.
+        """
+
+        cmp = "lt" if self.descending else "gt"
+        if value is None:
+            return Q(**{f"{self.field}__isnull": True, f"id__{cmp}": pk})
+
+        cond = Q(**{f"{self.field}__{cmp}e": value}) & (
+            Q(**{f"{self.field}__{cmp}": value}) | Q(**{f"id__{cmp}": pk})
+        )
+        if self._model_field().null:
+            cond |= Q(**{f"{self.field}__isnull": True})
+        return cond
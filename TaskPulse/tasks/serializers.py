@@ -6,7 +6,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from integrations.models import TelegramProfile
-from .models import Task, TaskAttachment, TaskMessage
+from .models import ReportJob, Task, TaskActionLog, TaskAttachment, TaskChangeLog, TaskMessage
 
 User = get_user_model()
 
@@ -113,12 +113,61 @@ class TaskMessageSerializer(serializers.ModelSerializer):
         return TaskMessage.objects.create(**validated_data)
 
 
+class TaskChangeLogSerializer(serializers.ModelSerializer):
+    """Запись журнала изменений задачи (для ?expand=changes)."""
+
+    class Meta:
+        model = TaskChangeLog
+        fields = ("id", "field", "old_value", "new_value", "reason", "changed_by", "changed_at")
+        read_only_fields = fields
+
+
+class TaskActionLogSerializer(serializers.ModelSerializer):
+    """Запись журнала действий над задачей (для ?expand=actions)."""
+
+    class Meta:
+        model = TaskActionLog
+        fields = ("id", "action", "user", "comment", "old_due_at", "new_due_at", "created_at")
+        read_only_fields = fields
+
+
 class TaskSerializer(serializers.ModelSerializer):
     """Сериализатор задачи для чтения.
     Отдаёт все ключевые поля задачи, а также связанные вложения.
     Дополнительно возвращает display-представления для приоритета и статуса.
+
+    Поддерживает sparse fieldsets: в context можно передать
+    `fields` (набор полей ответа) и `expand` (доп. связи — changes, actions).
     """
 
+    # Поля, которые отдаются только по явному запросу (?expand=)
+    EXPANDABLE_FIELDS = {
+        "changes": TaskChangeLogSerializer,
+        "actions": TaskActionLogSerializer,
+    }
+
+    # Какие колонки (для only()) нужны каждому полю ответа
+    FIELD_COLUMNS = {
+        "priority_display": ("priority",),
+        "status_display": ("status",),
+        "creator_name": ("creator__full_name",),
+        "creator_position": ("creator__position",),
+        "assignee_name": ("assignee__full_name",),
+        "assignee_position": ("assignee__position",),
+        "attachments": (),
+        "result_file": (),
+        "changes": (),
+        "actions": (),
+    }
+
+    # Какие связи нужно предзагрузить для поля ответа
+    FIELD_PREFETCHES = {
+        "attachments": "attachments",
+        "result_file": "attachments",
+        "changes": "changes",
+        "actions": "actions",
+    }
+
     attachments = TaskAttachmentSerializer(many=True, read_only=True)
     priority_display = serializers.CharField(
         source="get_priority_display", read_only=True
@@ -153,6 +202,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "assignee_position",
             "created_at",
             "updated_at",
+            "completed_at",
             "attachments",
             "result_file",
         )
@@ -165,8 +215,37 @@ class TaskSerializer(serializers.ModelSerializer):
             "assignee_position",
             "created_at",
             "updated_at",
+            "completed_at",
         )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        expand = self.context.get("expand") or ()
+        for name in expand:
+            self.fields[name] = self.EXPANDABLE_FIELDS[name](many=True, read_only=True)
+
+        requested = self.context.get("fields")
+        if requested is not None:
+            for name in list(self.fields):
+                if name not in requested and name not in expand:
+                    self.fields.pop(name)
+
+    @classmethod
+    def columns_for(cls, field_names) -> set[str]:
+        """Колонки Task (в терминах only()), нужные для указанных полей ответа."""
+
+        columns: set[str] = {"id"}
+        for name in field_names:
+            columns.update(cls.FIELD_COLUMNS.get(name, (name,)))
+        return columns
+
+    @classmethod
+    def prefetches_for(cls, field_names) -> set[str]:
+        """Связи, которые нужно предзагрузить для указанных полей ответа."""
+
+        return {cls.FIELD_PREFETCHES[name] for name in field_names if name in cls.FIELD_PREFETCHES}
+
     def get_result_file(self, obj: Task) -> Optional[str]:
         return obj.last_result_file_url()
 
@@ -284,6 +363,73 @@ class TaskUpsertSerializer(serializers.ModelSerializer):
         return instance
 
 
+class PreloadedUserField(serializers.PrimaryKeyRelatedField):
+    """
+    PK-поле пользователя, которое берёт объекты из context["preloaded_users"]
+    (заранее загруженных одним запросом), а не делает get() на каждый элемент.
+    """
+
+    def to_internal_value(self, data):
+        users = self.context.get("preloaded_users")
+        if users is None:
+            return super().to_internal_value(data)
+        try:
+            user = users.get(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if user is None:
+            self.fail("does_not_exist", pk_value=data)
+        return user
+
+
+class BulkTaskItemSerializer(TaskUpsertSerializer):
+    """Элемент пакетного создания задач: те же поля, но без файлов."""
+
+    assignee = PreloadedUserField(queryset=User.objects.all(), required=False, allow_null=True)
+    attachment = None
+    result_file = None
+
+    class Meta(TaskUpsertSerializer.Meta):
+        fields = tuple(
+            name
+            for name in TaskUpsertSerializer.Meta.fields
+            if name not in ("attachment", "result_file")
+        )
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """Массовая операция над задачами: смена статуса, переназначение или перенос срока."""
+
+    OPERATION_SET_STATUS = "set_status"
+    OPERATION_REASSIGN = "reassign"
+    OPERATION_SHIFT_DUE = "shift_due"
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+    operation = serializers.ChoiceField(
+        choices=(OPERATION_SET_STATUS, OPERATION_REASSIGN, OPERATION_SHIFT_DUE)
+    )
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    assignee = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), required=False, allow_null=True
+    )
+    days = serializers.IntegerField(required=False, min_value=-365, max_value=365)
+    comment = serializers.CharField(required=False, allow_blank=True, max_length=255)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        operation = attrs["operation"]
+        if operation == self.OPERATION_SET_STATUS and "status" not in attrs:
+            raise serializers.ValidationError({"status": "Обязательно для set_status."})
+        if operation == self.OPERATION_REASSIGN and "assignee" not in attrs:
+            raise serializers.ValidationError({"assignee": "Обязательно для reassign."})
+        if operation == self.OPERATION_SHIFT_DUE and not attrs.get("days"):
+            raise serializers.ValidationError({"days": "Обязательно для shift_due."})
+        return attrs
+
+
 class TaskActionSerializer(serializers.Serializer):
     """Универсальный сериализатор действий над задачей."""
 
@@ -303,3 +449,45 @@ class TaskActionSerializer(serializers.Serializer):
                 "Для продления на сутки обязателен комментарий"
             )
         return attrs
+
+
+class ReportJobCreateSerializer(serializers.Serializer):
+    """Запрос на фоновый отчёт: тип, формат файла и параметры отчёта."""
+
+    report_type = serializers.ChoiceField(choices=ReportJob.ReportType.choices)
+    format = serializers.ChoiceField(choices=ReportJob.Format.choices, default=ReportJob.Format.CSV)
+    params = serializers.DictField(required=False, default=dict)
+
+    def validate_format(self, value: str) -> str:
+        from .services.report_jobs import xlsx_available
+
+        if value == ReportJob.Format.XLSX and not xlsx_available():
+            raise serializers.ValidationError("Формат XLSX недоступен на сервере (нет openpyxl).")
+        return value
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """Статус фонового отчёта и ссылка на готовый файл."""
+
+    download_url = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = ReportJob
+        fields = (
+            "id",
+            "report_type",
+            "format",
+            "params",
+            "status",
+            "progress",
+            "download_url",
+            "error",
+            "created_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+    def get_download_url(self, obj: ReportJob) -> Optional[str]:
+        from .services.report_jobs import job_download_url
+
+        return job_download_url(obj, self.context.get("request"))
@@ -0,0 +1,191 @@
+"""tasks/services/bulk.py"""
+"""Массовые операции над задачами: один UPDATE ... RETURNING вместо Task.save() на каждую."""
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from tasks.models import Task, TaskChangeLog, TaskTombstone
+from tasks.services.kpi_cache import invalidate_kpi
+from tasks.services.notifications import notify_tasks_assigned, notify_tasks_completed
+
+
+def _update_returning(
+        task_ids: Iterable[int],
+        column: str,
+        set_sql: str,
+        params: Tuple[Any, ...],
+        where_sql: str = "",
+        where_params: Tuple[Any, ...] = (),
+        extra_set_sql: str = "",
+        extra_set_params: Tuple[Any, ...] = (),
+) -> List[Tuple[int, Any, Any, Optional[int], int, Any, Optional[int]]]:
+    """
+    Обновляет колонку у набора задач одним запросом и возвращает строки
+    (id, старое значение, новое значение, assignee_id до изменения, creator_id,
+    due_at и assignee_id после изменения).
+    Старые значения берутся из подзапроса с FOR UPDATE — без отдельного SELECT.
+    extra_set_sql — дополнительные присваивания («, "col" = ...») в том же UPDATE.
+    """
+
+    ids = sorted({int(pk) for pk in task_ids})
+    if not ids:
+        return []
+
+    table = connection.ops.quote_name(Task._meta.db_table)
+    col = connection.ops.quote_name(column)
+    sql = f"""
+        UPDATE {table} AS t
+        SET {col} = {set_sql}, "updated_at" = %s {extra_set_sql}
+        FROM (
+            SELECT "id", {col} AS old_value, "assignee_id" AS old_assignee_id
+            FROM {table}
+            WHERE "id" = ANY(%s)
+            FOR UPDATE
+        ) AS o
+        WHERE t."id" = o."id" {where_sql}
+        RETURNING t."id", o.old_value, t.{col}, o.old_assignee_id, t."creator_id",
+                  t."due_at", t."assignee_id"
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, timezone.now(), *extra_set_params, ids, *where_params])
+        return list(cursor.fetchall())
+
+
+def _to_log_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _log_changes(rows, field: str, reason: str, changed_by: Optional[User]) -> None:
+    """Все записи журнала изменений — одним bulk_create."""
+
+    TaskChangeLog.objects.bulk_create(
+        [
+            TaskChangeLog(
+                task_id=task_id,
+                changed_by=changed_by,
+                field=field,
+                old_value=_to_log_value(old),
+                new_value=_to_log_value(new),
+                reason=reason,
+            )
+            for task_id, old, new, *_rest in rows
+        ]
+    )
+
+
+def _invalidate_kpi(rows, column: str) -> None:
+    """Сбрасывает KPI-кэш исполнителей/месяцев задач — до и после изменения."""
+
+    scopes = []
+    for _task_id, old, _new, old_assignee, creator_id, due_at, assignee_id in rows:
+        scopes.append((creator_id, assignee_id, due_at))
+        scopes.append((creator_id, old_assignee, old if column == "due_at" else due_at))
+    invalidate_kpi(scopes)
+
+
+def bulk_set_status(
+        task_ids: Iterable[int],
+        status: str,
+        *,
+        changed_by: Optional[User] = None,
+        reason: str = "Массовая смена статуса",
+) -> List[int]:
+    """
+    Переводит задачи в статус `status`. Задачи, уже находящиеся в нём,
+    не трогаются. completed_at ставится при переходе в DONE и сбрасывается
+    при выходе из него. При переходе в DONE уведомления создателям пишутся
+    в outbox в той же транзакции. Возвращает id изменённых задач.
+    """
+
+    with transaction.atomic():
+        rows = _update_returning(
+            task_ids,
+            "status",
+            "%s",
+            (status,),
+            'AND t."status" <> %s',
+            (status,),
+            extra_set_sql=', "completed_at" = %s',
+            extra_set_params=(timezone.now() if status == Task.Status.DONE else None,),
+        )
+        _log_changes(rows, "status", reason, changed_by)
+        _invalidate_kpi(rows, "status")
+
+        changed = [row[0] for row in rows]
+        if changed and status == Task.Status.DONE:
+            notify_tasks_completed(Task.objects.filter(pk__in=changed).select_related("assignee").order_by("id"))
+    return changed
+
+
+def bulk_reassign(
+        task_ids: Iterable[int],
+        assignee: Optional[User],
+        *,
+        changed_by: Optional[User] = None,
+        reason: str = "Массовое переназначение",
+) -> List[int]:
+    """
+    Назначает задачам нового исполнителя (или снимает его при None).
+    Прежним исполнителям пишутся tombstones для delta-sync, новому
+    уведомления о назначении пишутся в outbox одним INSERT.
+    Возвращает id изменённых задач.
+    """
+
+    assignee_id = assignee.pk if assignee is not None else None
+    with transaction.atomic():
+        rows = _update_returning(
+            task_ids,
+            "assignee_id",
+            "%s",
+            (assignee_id,),
+            'AND t."assignee_id" IS DISTINCT FROM %s',
+            (assignee_id,),
+        )
+        _log_changes(rows, "assignee", reason, changed_by)
+        _invalidate_kpi(rows, "assignee_id")
+
+        TaskTombstone.objects.bulk_create(
+            [
+                TaskTombstone(
+                    task_id=task_id,
+                    user_id=old_assignee,
+                    reason=TaskTombstone.Reason.UNASSIGNED,
+                )
+                for task_id, old_assignee, _new, _, creator_id, *_rest in rows
+                if old_assignee and old_assignee != creator_id
+            ]
+        )
+
+        changed = [row[0] for row in rows]
+        if changed and assignee_id:
+            notify_tasks_assigned(Task.objects.filter(pk__in=changed).order_by("id"))
+    return changed
+
+
+def bulk_shift_due(
+        task_ids: Iterable[int],
+        delta: timedelta,
+        *,
+        changed_by: Optional[User] = None,
+        reason: str = "Массовый перенос срока",
+) -> List[int]:
+    """
+    Сдвигает дедлайн задач на `delta` (может быть отрицательным).
+    Задачи без дедлайна пропускаются. Возвращает id изменённых задач.
+    """
+
+    with transaction.atomic():
+        rows = _update_returning(
+            task_ids, "due_at", 't."due_at" + %s', (delta,), 'AND t."due_at" IS NOT NULL'
+        )
+        _log_changes(rows, "due_at", reason, changed_by)
+        _invalidate_kpi(rows, "due_at")
+    return [row[0] for row in rows]
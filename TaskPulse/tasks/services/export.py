@@ -0,0 +1,93 @@
+"""tasks/services/export.py"""
+"""
+Потоковая выгрузка задач (CSV / NDJSON).
+
+Строки читаются через .iterator(chunk_size=...) — на PostgreSQL это
+серверный курсор, поэтому память не зависит от размера выгрузки,
+а первые байты уходят клиенту сразу.
+"""
+
+import csv
+from typing import Any, Dict, Iterator, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from accounts.models import User
+from tasks.models import Task
+
+# Сколько строк забирать из серверного курсора за один FETCH
+EXPORT_CHUNK_SIZE = 2000
+
+TASK_COLUMNS: Dict[str, str] = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "due_at": "due_at",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "completed_at": "completed_at",
+    "assignee_id": "assignee_id",
+    "assignee_email": "assignee__email",
+    "executor_comment": "executor_comment",
+}
+
+# Колонки выгрузки с журналом изменений: задача + одна строка на изменение.
+# Выборка идёт от задач (LEFT OUTER JOIN журнала): задача без изменений
+# (создание журнал не пишет) попадает одной строкой с пустыми change_*.
+CHANGE_COLUMNS: Dict[str, str] = {
+    **TASK_COLUMNS,
+    "change_id": "changes__id",
+    "change_field": "changes__field",
+    "change_old_value": "changes__old_value",
+    "change_new_value": "changes__new_value",
+    "change_reason": "changes__reason",
+    "change_at": "changes__changed_at",
+    "changed_by_id": "changes__changed_by_id",
+}
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: write() возвращает строку, а не пишет её."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_queryset(creator: User, with_changes: bool = False) -> tuple[QuerySet, Sequence[str]]:
+    """Выборка для выгрузки задач создателя и список колонок."""
+
+    qs = Task.objects.filter(creator=creator)
+    if with_changes:
+        columns = CHANGE_COLUMNS
+        qs = qs.order_by("id", "changes__changed_at", "changes__id")
+    else:
+        columns = TASK_COLUMNS
+        qs = qs.order_by("id")
+    return qs.values_list(*columns.values()), list(columns)
+
+
+def _rows(qs: QuerySet) -> Iterator[tuple]:
+    return qs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def iter_csv(qs: QuerySet, columns: Sequence[str]) -> Iterator[str]:
+    """CSV построчно: заголовок, затем по строке на запись."""
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in _rows(qs):
+        yield writer.writerow(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+        )
+
+
+def iter_ndjson(qs: QuerySet, columns: Sequence[str]) -> Iterator[str]:
+    """NDJSON: по JSON-объекту на строку."""
+
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in _rows(qs):
+        record: Dict[str, Any] = dict(zip(columns, row))
+        yield encoder.encode(record) + "\n"
@@ -1,61 +1,268 @@
 """tasks/services/kpi.py"""
 """Сервисные функции для расчёта KPI по задачам."""
 
-from typing import Dict, Any, List
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
-from django.db.models import F, Q
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
 
 from accounts.models import User
-from tasks.models import Task
+from tasks.models import Task, TaskKpiMonthly
+from tasks.services.kpi_rollup import KPI_COUNTERS, rollup_by_assignee, rollup_user_month_counts
+
+# Задача выполнена вовремя: без дедлайна или закрыта (completed_at) не позже него.
+# Поздно — всё остальное выполненное, в т.ч. без completed_at (как в rollup-триггере).
+DONE_Q = Q(status=Task.Status.DONE)
+ON_TIME_Q = DONE_Q & (Q(due_at__isnull=True) | Q(completed_at__lte=F("due_at")))
+LATE_Q = DONE_Q & Q(due_at__isnull=False) & ~Q(completed_at__lte=F("due_at"))
+
+# Те же счётчики, что в rollup TaskKpiMonthly, — условной агрегацией по задачам
+TASK_COUNTERS = {
+    "total": Count("id"),
+    "done": Count("id", filter=DONE_Q),
+    "done_on_time": Count("id", filter=ON_TIME_Q),
+    "done_late": Count("id", filter=LATE_Q),
+    "in_progress": Count("id", filter=Q(status=Task.Status.IN_PROGRESS)),
+    "overdue": Count("id", filter=Q(status=Task.Status.OVERDUE)),
+}
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    """
+    Полуинтервал [начало месяца, начало следующего) в текущей TZ Django.
+    В отличие от due_at__year/__month, условие по диапазону использует индексы.
+    """
+
+    start = timezone.make_aware(datetime(year, month, 1))
+    if month == 12:
+        end = timezone.make_aware(datetime(year + 1, 1, 1))
+    else:
+        end = timezone.make_aware(datetime(year, month + 1, 1))
+    return start, end
 
 
 def calc_user_month_kpi(user: User, year: int, month: int) -> Dict[str, Any]:
-    """Считает KPI по задачам пользователя за указанный месяц."""
+    """
+    Считает KPI по задачам пользователя за указанный месяц.
+    Один запрос: условная агрегация с группировкой по приоритету.
+    """
 
-    # Берём задачи, у которых due_at попадает в нужный месяц
-    base_qs = Task.objects.filter(
-        assignee=user,
-        due_at__year=year,
-        due_at__month=month,
+    start, end = month_bounds(year, month)
+    rows = (
+        Task.objects.filter(assignee=user, due_at__gte=start, due_at__lt=end)
+        .values("priority")
+        .annotate(
+            total=Count("id"),
+            done=Count("id", filter=DONE_Q),
+            done_on_time=Count("id", filter=ON_TIME_Q),
+        )
+        .order_by()
     )
+    return _kpi_payload(user.id, year, month, {row["priority"]: row for row in rows})
 
-    total = base_qs.count()
-    done_qs = base_qs.filter(status=Task.Status.DONE)
-    done = done_qs.count()
 
-    done_on_time_qs = done_qs.filter(
-        Q(due_at__isnull=True) | Q(updated_at__lte=F("due_at"))
-    )
-    done_on_time = done_on_time_qs.count()
-    done_late = max(done - done_on_time, 0)
+def rollup_user_month_kpi(user: User, year: int, month: int) -> Dict[str, Any]:
+    """
+    То же, что calc_user_month_kpi, но из rollup-таблицы TaskKpiMonthly:
+    читает не более (создатели × приоритеты) строк вместо скана задач.
+    """
+
+    return _kpi_payload(user.id, year, month, rollup_user_month_counts(user.id, year, month))
+
+
+def _kpi_payload(user_id: int, year: int, month: int, counts: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Собирает ответ KPI из счётчиков {priority: {total, done, done_on_time}}."""
 
     by_priority: List[Dict[str, Any]] = []
     for priority_value, _label in Task.Priority.choices:
-        p_qs = base_qs.filter(priority=priority_value)
-        p_total = p_qs.count()
-        p_done_qs = p_qs.filter(status=Task.Status.DONE)
-        p_done = p_done_qs.count()
-        p_done_on_time = p_done_qs.filter(
-            Q(due_at__isnull=True) | Q(updated_at__lte=F("due_at"))
-        ).count()
-        p_done_late = max(p_done - p_done_on_time, 0)
-
+        row = counts.get(priority_value, {})
+        p_done = row.get("done", 0)
+        p_done_on_time = row.get("done_on_time", 0)
         by_priority.append(
             {
                 "priority": priority_value,
-                "total": p_total,
+                "total": row.get("total", 0),
                 "done": p_done,
                 "done_on_time": p_done_on_time,
-                "done_late": p_done_late,
+                "done_late": max(p_done - p_done_on_time, 0),
             }
         )
 
+    # Итоги — по всем строкам, включая приоритеты вне Task.Priority.choices
+    total = sum(row["total"] for row in counts.values())
+    done = sum(row["done"] for row in counts.values())
+    done_on_time = sum(row["done_on_time"] for row in counts.values())
+
     return {
-        "user_id": user.id,
+        "user_id": user_id,
         "month": f"{year:04d}-{month:02d}",
         "total": total,
         "done": done,
         "done_on_time": done_on_time,
-        "done_late": done_late,
+        "done_late": max(done - done_on_time, 0),
         "by_priority": by_priority,
     }
+
+
+KPI_METRICS = ("total", "done", "done_on_time", "done_late")
+
+
+def _month_starts(start: date, end: date) -> List[date]:
+    """Первые числа месяцев от start до end включительно."""
+
+    months: List[date] = []
+    current = start
+    while current <= end:
+        months.append(current)
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+    return months
+
+
+def _week_starts(start: datetime, end: datetime) -> List[date]:
+    """Понедельники недель, пересекающихся с полуинтервалом [start, end)."""
+
+    first = timezone.localtime(start).date()
+    first -= timedelta(days=first.weekday())
+    last = timezone.localtime(end - timedelta(microseconds=1)).date()
+    weeks: List[date] = []
+    while first <= last:
+        weeks.append(first)
+        first += timedelta(days=7)
+    return weeks
+
+
+def team_range_kpi(
+        creator: User,
+        first_month: date,
+        last_month: date,
+        group_by: str = "month",
+        assignee_ids: Optional[Iterable[int]] = None,
+) -> Dict[str, Any]:
+    """
+    KPI всех исполнителей создателя по корзинам (месяц или неделя дедлайна)
+    за диапазон месяцев [first_month, last_month] — одним GROUP BY-запросом.
+
+    Месячные корзины читаются из rollup TaskKpiMonthly, недельные —
+    условной агрегацией по задачам с TruncWeek. Ответ — компактная матрица:
+    data[i][j] = [total, done, done_on_time, done_late] для assignees[i], buckets[j].
+    """
+
+    start, _ = month_bounds(first_month.year, first_month.month)
+    _, end = month_bounds(last_month.year, last_month.month)
+
+    if group_by == "week":
+        buckets = _week_starts(start, end)
+        qs = (
+            Task.objects.filter(creator=creator, assignee__isnull=False, due_at__gte=start, due_at__lt=end)
+            .annotate(bucket=TruncWeek("due_at", output_field=DateField()))
+            .values("assignee_id", "assignee__email", "assignee__full_name", "bucket")
+            .annotate(**{name: TASK_COUNTERS[name] for name in KPI_METRICS})
+        )
+    else:
+        buckets = _month_starts(first_month, last_month)
+        qs = (
+            TaskKpiMonthly.objects.filter(creator=creator, month__gte=first_month, month__lte=last_month)
+            .annotate(bucket=F("month"))
+            .values("assignee_id", "assignee__email", "assignee__full_name", "bucket")
+            .annotate(**{name: Sum(name) for name in KPI_METRICS})
+        )
+
+    if assignee_ids is not None:
+        qs = qs.filter(assignee_id__in=list(assignee_ids))
+
+    index = {bucket: position for position, bucket in enumerate(buckets)}
+    assignees: List[Dict[str, Any]] = []
+    data: List[List[List[int]]] = []
+    rows_by_assignee: Dict[int, int] = {}
+
+    for row in qs.order_by("assignee__full_name", "assignee_id", "bucket"):
+        position = index.get(row["bucket"])
+        if position is None:
+            continue
+        aid = row["assignee_id"]
+        if aid not in rows_by_assignee:
+            rows_by_assignee[aid] = len(assignees)
+            assignees.append(
+                {"id": aid, "email": row["assignee__email"], "name": row["assignee__full_name"]}
+            )
+            data.append([[0] * len(KPI_METRICS) for _ in buckets])
+        data[rows_by_assignee[aid]][position] = [row[name] or 0 for name in KPI_METRICS]
+
+    if group_by == "week":
+        labels = [bucket.isoformat() for bucket in buckets]
+    else:
+        labels = [f"{bucket.year:04d}-{bucket.month:02d}" for bucket in buckets]
+
+    return {
+        "from": f"{first_month.year:04d}-{first_month.month:02d}",
+        "to": f"{last_month.year:04d}-{last_month.month:02d}",
+        "group_by": group_by,
+        "metrics": list(KPI_METRICS),
+        "buckets": labels,
+        "assignees": assignees,
+        "data": data,
+    }
+
+
+def range_kpi_rows(data: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Матрица team_range_kpi в «длинные» строки таблицы: заголовок + (исполнитель, корзина)."""
+
+    yield ["assignee_id", "assignee_email", "assignee_name", "bucket", *data["metrics"]]
+    for assignee, cells in zip(data["assignees"], data["data"]):
+        for bucket, values in zip(data["buckets"], cells):
+            yield [assignee["id"], assignee["email"], assignee["name"], bucket, *values]
+
+
+STATS_BUCKETS = ("month", "week")
+
+
+def creator_stats(creator_id: int, month: Optional[date] = None, bucket: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Сводка кабинета создателя по исполнителям (за месяц дедлайна или всё время)
+    одним GROUP BY-запросом, без доп. запросов на исполнителя.
+
+    bucket=None — итоги на исполнителя; "month" — плюс разбивка по месяцам
+    дедлайна (из rollup); "week" — по неделям дедлайна внутри month
+    (условная агрегация по задачам). Итоги строки — сумма её корзин.
+    """
+
+    if bucket == "week":
+        start, end = month_bounds(month.year, month.month)
+        rows = (
+            Task.objects.filter(creator_id=creator_id, assignee__isnull=False, due_at__gte=start, due_at__lt=end)
+            .annotate(bucket=TruncWeek("due_at", output_field=DateField()))
+            .values("assignee_id", "assignee__email", "assignee__full_name", "bucket")
+            .annotate(**TASK_COUNTERS)
+            .order_by("assignee__full_name", "assignee_id", "bucket")
+        )
+    else:
+        rows = rollup_by_assignee(creator_id, month, by_month=bucket == "month")
+
+    result: List[Dict[str, Any]] = []
+    for row in rows:
+        counters = {name: row[name] or 0 for name in KPI_COUNTERS}
+        if not result or result[-1]["assignee_id"] != row["assignee_id"]:
+            result.append(
+                {
+                    "assignee_id": row["assignee_id"],
+                    "assignee_email": row["assignee__email"],
+                    "assignee_name": row["assignee__full_name"],
+                    **dict.fromkeys(KPI_COUNTERS, 0),
+                }
+            )
+            if bucket is not None:
+                result[-1]["buckets"] = []
+        item = result[-1]
+        for name, value in counters.items():
+            item[name] += value
+        if bucket is not None:
+            item["buckets"].append({"bucket": _bucket_label(row.get("bucket", row.get("month")), bucket), **counters})
+    return result
+
+
+def _bucket_label(value: Optional[date], bucket: str) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if bucket == "week" else f"{value.year:04d}-{value.month:02d}"
@@ -0,0 +1,142 @@
+"""tasks/services/kpi_cache.py"""
+"""
+Кэш KPI (Django cache, в проде — Redis).
+
+Ключи:
+- kpi:user:<assignee_id>:<YYYY-MM> — KPI исполнителя за месяц (monthly_report);
+- kpi:stats:<creator_id>:<YYYY-MM|all>[:month|week] — сводка CreatorStatsByAssigneeView.
+
+Инвалидация точечная: запись задачи сбрасывает только ключи своего
+(создатель, исполнитель, месяц дедлайна) — до и после изменения —
+и только после коммита транзакции. Полный пересчёт rollup сбрасывает
+ключи всех (создатель, исполнитель, месяц) до и после пересчёта.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import User
+from tasks.models import TaskKpiMonthly
+from tasks.services.kpi import creator_stats, rollup_user_month_kpi
+
+KPI_CACHE_TTL = getattr(settings, "KPI_CACHE_TTL_SECONDS", 900)
+
+# (creator_id, assignee_id, due_at) — всё, что определяет ключи KPI задачи
+KpiScope = Tuple[int, Optional[int], Optional[datetime]]
+
+
+def _month_label(month: Optional[date]) -> str:
+    return f"{month.year:04d}-{month.month:02d}" if month else "all"
+
+
+def user_month_key(user_id: int, year: int, month: int) -> str:
+    return f"kpi:user:{user_id}:{year:04d}-{month:02d}"
+
+
+def creator_stats_key(creator_id: int, month: Optional[date], bucket: Optional[str] = None) -> str:
+    key = f"kpi:stats:{creator_id}:{_month_label(month)}"
+    return f"{key}:{bucket}" if bucket else key
+
+
+def due_month(due_at: Optional[datetime | str]) -> Optional[date]:
+    """Месяц дедлайна в TZ проекта (как в rollup и отчётах)."""
+
+    if isinstance(due_at, str):  # Task(due_at="...") сохраняется и со строкой
+        due_at = parse_datetime(due_at)
+    if due_at is None:
+        return None
+    if timezone.is_naive(due_at):
+        due_at = timezone.make_aware(due_at)
+    return timezone.localtime(due_at).date().replace(day=1)
+
+
+def get_user_month_kpi(user: User, year: int, month: int) -> Dict[str, Any]:
+    """KPI исполнителя за месяц: из кэша или из rollup с записью в кэш."""
+
+    key = user_month_key(user.id, year, month)
+    data = cache.get(key)
+    if data is None:
+        data = rollup_user_month_kpi(user, year, month)
+        cache.set(key, data, KPI_CACHE_TTL)
+    return data
+
+
+def get_creator_stats(creator_id: int, month: Optional[date], bucket: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Сводка по исполнителям создателя (за месяц или всё время, с корзинами) с кэшем."""
+
+    key = creator_stats_key(creator_id, month, bucket)
+    data = cache.get(key)
+    if data is None:
+        data = creator_stats(creator_id, month, bucket)
+        cache.set(key, data, KPI_CACHE_TTL)
+    return data
+
+
+def _month_keys(keys: Set[str], creator_id: int, assignee_id: int, month: Optional[date]) -> None:
+    keys.add(creator_stats_key(creator_id, None))
+    keys.add(creator_stats_key(creator_id, None, "month"))
+    if month is not None:
+        keys.add(creator_stats_key(creator_id, month))
+        keys.add(creator_stats_key(creator_id, month, "month"))
+        keys.add(creator_stats_key(creator_id, month, "week"))
+        keys.add(user_month_key(assignee_id, month.year, month.month))
+
+
+def keys_for_scopes(scopes: Iterable[KpiScope]) -> Set[str]:
+    """Ключи кэша, которые зависят от задач с указанными (создатель, исполнитель, дедлайн)."""
+
+    keys: Set[str] = set()
+    for creator_id, assignee_id, due_at in scopes:
+        if assignee_id:
+            _month_keys(keys, creator_id, assignee_id, due_month(due_at))
+    return keys
+
+
+def _delete_on_commit(keys: Set[str]) -> None:
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(list(keys)))
+
+
+def invalidate_kpi(scopes: Iterable[KpiScope]) -> None:
+    """Сбрасывает затронутые ключи после коммита (вне транзакции — сразу)."""
+
+    _delete_on_commit(keys_for_scopes(scopes))
+
+
+def invalidate_kpi_months(rows: Iterable[Tuple[int, int, date]]) -> None:
+    """То же по строкам rollup (создатель, исполнитель, первое число месяца)."""
+
+    keys: Set[str] = set()
+    for creator_id, assignee_id, month in rows:
+        _month_keys(keys, creator_id, assignee_id, month)
+    _delete_on_commit(keys)
+
+
+def warm_month(year: int, month: int) -> int:
+    """
+    Прогревает кэш за месяц: сводки всех создателей и KPI всех исполнителей,
+    у которых есть задачи с дедлайном в этом месяце. Возвращает число ключей.
+    """
+
+    month_start = date(year, month, 1)
+    pairs = TaskKpiMonthly.objects.filter(month=month_start).values_list("creator_id", "assignee_id").distinct()
+
+    creators: Set[int] = set()
+    assignees: Set[int] = set()
+    for creator_id, assignee_id in pairs:
+        creators.add(creator_id)
+        assignees.add(assignee_id)
+
+    for creator_id in creators:
+        cache.delete(creator_stats_key(creator_id, month_start))
+        get_creator_stats(creator_id, month_start)
+    for user in User.objects.filter(pk__in=assignees):
+        cache.delete(user_month_key(user.id, year, month))
+        get_user_month_kpi(user, year, month)
+    return len(creators) + len(assignees)
@@ -0,0 +1,160 @@
+"""tasks/services/kpi_engine.py"""
+"""
+Массовый расчёт KPI: все исполнители × диапазон месяцев × приоритеты.
+
+Результат — {(user_id, "YYYY-MM"): ответ как у calc_user_month_kpi}.
+Два движка с одинаковым результатом:
+- "numpy" — нужные колонки читаются одним values_list, все корзины
+  считаются векторно (bincount по закодированным индексам);
+- "sql" — один GROUP BY-запрос с условной агрегацией.
+"auto" берёт numpy, если он установлен (есть в requirements; без него — sql).
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection
+from django.db.models import Count, FloatField
+from django.db.models.functions import Cast, Extract, ExtractMonth, ExtractYear
+
+from tasks.models import Task
+from tasks.services.kpi import DONE_Q, ON_TIME_Q, _kpi_payload, _month_starts, month_bounds
+
+try:  # векторный движок — опционально, если установлен numpy
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+ENGINES = ("auto", "numpy", "sql")
+
+# Счётчики корзины (user_id, год, месяц) → {priority: {total, done, done_on_time}}
+BucketCounts = Dict[Tuple[int, int, int], Dict[str, Dict[str, int]]]
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _tasks(first_month: date, last_month: date, user_ids: Optional[List[int]]):
+    start, _ = month_bounds(first_month.year, first_month.month)
+    _, end = month_bounds(last_month.year, last_month.month)
+    qs = Task.objects.filter(assignee__isnull=False, due_at__gte=start, due_at__lt=end)
+    if user_ids is not None:
+        qs = qs.filter(assignee_id__in=user_ids)
+    return qs.order_by()
+
+
+def _sql_counts(first_month: date, last_month: date, user_ids: Optional[List[int]]) -> BucketCounts:
+    rows = (
+        _tasks(first_month, last_month, user_ids)
+        # год/месяц дедлайна — в TZ проекта, как month_bounds в calc_user_month_kpi
+        .annotate(year=ExtractYear("due_at"), month=ExtractMonth("due_at"))
+        .values("assignee_id", "year", "month", "priority")
+        .annotate(
+            total=Count("id"),
+            done=Count("id", filter=DONE_Q),
+            done_on_time=Count("id", filter=ON_TIME_Q),
+        )
+    )
+    counts: BucketCounts = {}
+    for row in rows:
+        counts.setdefault((row["assignee_id"], row["year"], row["month"]), {})[row["priority"]] = row
+    return counts
+
+
+def _epoch(field: str) -> Cast:
+    """
+    Секунды «настенного» времени в TZ проекта (EXTRACT(EPOCH FROM ... AT TIME ZONE)),
+    double precision — psycopg отдаёт float, а не Decimal.
+    """
+
+    return Cast(Extract(field, "epoch"), FloatField())
+
+
+def _numpy_counts(first_month: date, last_month: date, user_ids: Optional[List[int]]) -> BucketCounts:
+    qs = (
+        _tasks(first_month, last_month, user_ids)
+        .annotate(due_ts=_epoch("due_at"), completed_ts=_epoch("completed_at"))
+        .values_list("assignee_id", "priority", "status", "due_ts", "completed_ts")
+    )
+    # Колонки простых типов — читаем курсором напрямую, без построчных конвертеров ORM
+    with connection.cursor() as cursor:
+        cursor.execute(*qs.query.sql_with_params())
+        rows = cursor.fetchall()
+    if not rows:
+        return {}
+
+    assignee, priority, status, due_ts, completed_ts = zip(*rows)
+    users, user_idx = np.unique(np.asarray(assignee, dtype=np.int64), return_inverse=True)
+    priorities, priority_idx = np.unique(np.asarray(priority, dtype=str), return_inverse=True)
+
+    due = np.asarray(due_ts, dtype=np.float64)
+    # месяц дедлайна — из локального времени; индекс от first_month
+    month_idx = due.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64) - (
+        (first_month.year - 1970) * 12 + first_month.month - 1
+    )
+
+    done = np.asarray(status, dtype=str) == Task.Status.DONE
+    # NULL completed_at → NaN: сравнение ложно, задача считается поздней
+    on_time = done & (np.asarray(completed_ts, dtype=np.float64) <= due)
+
+    shape = (len(users), len(_month_starts(first_month, last_month)), len(priorities))
+    flat = np.ravel_multi_index((user_idx, month_idx, priority_idx), shape)
+    size = shape[0] * shape[1] * shape[2]
+    total_grid = np.bincount(flat, minlength=size).reshape(shape)
+    done_grid = np.bincount(flat, weights=done, minlength=size).reshape(shape).astype(np.int64)
+    on_time_grid = np.bincount(flat, weights=on_time, minlength=size).reshape(shape).astype(np.int64)
+
+    # непустые корзины → обычные списки Python (без поэлементной индексации numpy)
+    cells = np.nonzero(total_grid)
+    user_ids_list = users[cells[0]].tolist()
+    priority_names = priorities.tolist()
+    counts: BucketCounts = {}
+    for user_id, m, p, total, done_count, on_time_count in zip(
+            user_ids_list,
+            cells[1].tolist(),
+            cells[2].tolist(),
+            total_grid[cells].tolist(),
+            done_grid[cells].tolist(),
+            on_time_grid[cells].tolist(),
+    ):
+        month_year, month_num = divmod(first_month.month - 1 + m, 12)
+        counts.setdefault((user_id, first_month.year + month_year, month_num + 1), {})[priority_names[p]] = {
+            "total": total,
+            "done": done_count,
+            "done_on_time": on_time_count,
+        }
+    return counts
+
+
+def bulk_user_month_kpi(
+        first_month: date,
+        last_month: date,
+        user_ids: Optional[Iterable[int]] = None,
+        engine: str = "auto",
+) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    """
+    KPI исполнителей за каждый месяц [first_month, last_month] (первые числа).
+    user_ids=None — все исполнители с задачами в диапазоне; для явно
+    переданных без задач возвращаются нулевые KPI (как у calc_user_month_kpi).
+    """
+
+    if engine not in ENGINES:
+        raise ValueError(f"engine должен быть одним из {ENGINES}")
+    if engine == "numpy" and np is None:
+        raise RuntimeError("Для engine='numpy' нужен установленный numpy.")
+
+    ids = sorted({int(pk) for pk in user_ids}) if user_ids is not None else None
+    use_numpy = engine == "numpy" or (engine == "auto" and np is not None)
+    counts = (_numpy_counts if use_numpy else _sql_counts)(first_month, last_month, ids)
+
+    if ids is None:
+        ids = sorted({user_id for user_id, _year, _month in counts})
+    months = _month_starts(first_month, last_month)
+    return {
+        (user_id, f"{m.year:04d}-{m.month:02d}"): _kpi_payload(
+            user_id, m.year, m.month, counts.get((user_id, m.year, m.month), {})
+        )
+        for user_id in ids
+        for m in months
+    }
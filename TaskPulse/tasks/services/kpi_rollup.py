@@ -0,0 +1,141 @@
+"""tasks/services/kpi_rollup.py"""
+"""Чтение и полный пересчёт rollup-таблицы TaskKpiMonthly."""
+
+from datetime import date
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import QuerySet, Sum
+
+from tasks.models import Task, TaskKpiMonthly
+
+KPI_COUNTERS = ("total", "done", "done_on_time", "done_late", "in_progress", "overdue")
+
+REBUILD_SQL = """
+    INSERT INTO tasks_taskkpimonthly
+        (creator_id, assignee_id, month, priority,
+         total, done, done_on_time, done_late, in_progress, overdue)
+    SELECT
+        creator_id,
+        assignee_id,
+        date_trunc('month', due_at AT TIME ZONE %s)::date,
+        priority,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = %s),
+        COUNT(*) FILTER (WHERE status = %s AND (due_at IS NULL OR completed_at <= due_at)),
+        COUNT(*) FILTER (WHERE status = %s AND due_at IS NOT NULL AND (completed_at <= due_at) IS NOT TRUE),
+        COUNT(*) FILTER (WHERE status = %s),
+        COUNT(*) FILTER (WHERE status = %s)
+    FROM tasks_task
+    WHERE assignee_id IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+# Момент выполнения по журналу: последняя запись «status → done», иначе updated_at
+BACKFILL_COMPLETED_AT_SQL = """
+    UPDATE tasks_task AS t
+    SET completed_at = COALESCE(
+        (SELECT MAX(l.changed_at)
+         FROM tasks_taskchangelog AS l
+         WHERE l.task_id = t.id AND l.field = 'status' AND l.new_value = %s),
+        t.updated_at
+    )
+    WHERE t.id IN (
+        SELECT id FROM tasks_task
+        WHERE status = %s AND completed_at IS NULL AND id > %s
+        ORDER BY id
+        LIMIT %s
+    )
+    RETURNING t.id
+"""
+
+
+def backfill_completed_at(batch_size: int = 5000) -> int:
+    """
+    Заполняет completed_at у выполненных задач, где он пуст (данные до
+    появления колонки или статус выставлен в обход Task.save).
+    Идёт пачками по id, каждая пачка — отдельная транзакция. Возвращает число задач.
+    """
+
+    done = Task.Status.DONE
+    last_id = 0
+    updated = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(BACKFILL_COMPLETED_AT_SQL, [done, done, last_id, batch_size])
+            ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return updated
+        updated += len(ids)
+        last_id = max(ids)
+
+
+def rebuild_kpi_rollup() -> int:
+    """
+    Пересчитывает TaskKpiMonthly с нуля по таблице задач.
+    На время пересчёта запись в tasks_task блокируется (SHARE),
+    чтобы триггер не сдвинул счётчики мимо пересчёта. После коммита
+    сбрасывает кэш KPI по строкам rollup до и после пересчёта.
+    Возвращает число строк.
+    """
+
+    # kpi_cache → kpi → kpi_rollup: импорт на уровне модуля дал бы цикл
+    from tasks.services.kpi_cache import invalidate_kpi_months
+
+    def scopes() -> set:
+        return set(TaskKpiMonthly.objects.order_by().values_list("creator_id", "assignee_id", "month").distinct())
+
+    done = Task.Status.DONE
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("LOCK TABLE tasks_task IN SHARE MODE")
+        before = scopes()
+        cursor.execute("DELETE FROM tasks_taskkpimonthly")
+        cursor.execute(
+            REBUILD_SQL,
+            [settings.TIME_ZONE, done, done, done, Task.Status.IN_PROGRESS, Task.Status.OVERDUE],
+        )
+        rows = cursor.rowcount
+        invalidate_kpi_months(before | scopes())
+    return rows
+
+
+def sum_counters(queryset: QuerySet) -> Dict[str, int]:
+    """Суммы счётчиков по выборке строк rollup (0 вместо NULL)."""
+
+    totals = queryset.aggregate(**{name: Sum(name) for name in KPI_COUNTERS})
+    return {name: totals[name] or 0 for name in KPI_COUNTERS}
+
+
+def rollup_user_month_counts(user_id: int, year: int, month: int) -> Dict[str, Dict[str, Any]]:
+    """Счётчики исполнителя за месяц по приоритетам: {priority: {total, done, ...}}."""
+
+    rows = (
+        TaskKpiMonthly.objects.filter(assignee_id=user_id, month=date(year, month, 1))
+        .values("priority")
+        .annotate(**{name: Sum(name) for name in KPI_COUNTERS})
+        .order_by()
+    )
+    return {row["priority"]: row for row in rows}
+
+
+def rollup_by_assignee(creator_id: int, month: Optional[date] = None, by_month: bool = False) -> QuerySet:
+    """
+    Сводка по исполнителям создателя (за месяц или за всё время):
+    assignee_id, assignee__email, assignee__full_name и суммы счётчиков.
+    by_month=True — дополнительно с разбивкой по month (месяц дедлайна).
+    """
+
+    qs = TaskKpiMonthly.objects.filter(creator_id=creator_id)
+    if month is not None:
+        qs = qs.filter(month=month)
+    group = ["assignee_id", "assignee__email", "assignee__full_name"]
+    if by_month:
+        group.append("month")
+    return (
+        qs.values(*group)
+        .annotate(**{name: Sum(name) for name in KPI_COUNTERS})
+        .filter(total__gt=0)
+        .order_by("assignee__full_name", "assignee_id", *(["month"] if by_month else []))
+    )
@@ -5,7 +5,8 @@ from __future__ import annotations
 from typing import Optional, Iterable
 
 from integrations.models import TelegramProfile
-from integrations.utils_telegram import send_telegram_message, build_task_link
+from integrations.outbox import enqueue_coalesced_message, enqueue_telegram_message, enqueue_telegram_messages
+from integrations.utils_telegram import build_task_link
 from tasks.models import Task, TaskMessage
 
 
@@ -27,18 +28,8 @@ def _get_profile_safe(user_id: int) -> Optional[TelegramProfile]:
 # === 1. Назначение задачи исполнителю ===
 
 
-def notify_task_assigned(task: Task) -> None:
-    """
-    Отправляет уведомление исполнителю о том,
-    что ему назначена новая задача.
-    """
-
-    if task.assignee_id is None:
-        return
-
-    profile = _get_profile_safe(task.assignee_id)
-    if profile is None:
-        return
+def _build_task_assigned_message(task: Task) -> tuple[str, dict]:
+    """Собирает текст и клавиатуру уведомления о назначении задачи."""
 
     link = build_task_link(task.id)
 
@@ -76,8 +67,47 @@ def notify_task_assigned(task: Task) -> None:
             ]
         ]
     }
+    return text, reply_markup
 
-    send_telegram_message(profile.chat_id, text, reply_markup=reply_markup)
+
+def notify_task_assigned(task: Task) -> None:
+    """
+    Отправляет уведомление исполнителю о том,
+    что ему назначена новая задача.
+    """
+
+    if task.assignee_id is None:
+        return
+
+    profile = _get_profile_safe(task.assignee_id)
+    if profile is None:
+        return
+
+    text, reply_markup = _build_task_assigned_message(task)
+    enqueue_telegram_message(profile.chat_id, text, reply_markup=reply_markup)
+
+
+def notify_tasks_assigned(tasks: Iterable[Task]) -> int:
+    """
+    Пакетный вариант notify_task_assigned: профили Telegram всех
+    исполнителей загружаются одним запросом, сообщения пишутся в outbox
+    одним INSERT. Возвращает число сообщений.
+    """
+
+    tasks = [task for task in tasks if task.assignee_id]
+    profiles = {
+        profile.user_id: profile
+        for profile in _get_profiles_safe({task.assignee_id for task in tasks})
+    }
+
+    messages = []
+    for task in tasks:
+        profile = profiles.get(task.assignee_id)
+        if profile is None:
+            continue
+        text, reply_markup = _build_task_assigned_message(task)
+        messages.append((profile.chat_id, text, reply_markup))
+    return enqueue_telegram_messages(messages)
 
 
 def notify_task_due_soon(task: Task) -> None:
@@ -124,20 +154,11 @@ def notify_task_due_soon(task: Task) -> None:
         ]
     }
 
-    send_telegram_message(profile.chat_id, text, reply_markup=reply_markup)
+    enqueue_telegram_message(profile.chat_id, text, reply_markup=reply_markup)
 
 
-def notify_task_completed(task: Task) -> None:
-    """
-    Уведомляет создателя, что задача выполнена.
-    """
-
-    if task.creator_id is None:
-        return
-
-    profile = _get_profile_safe(task.creator_id)
-    if profile is None:
-        return
+def _build_task_completed_message(task: Task) -> str:
+    """Собирает текст уведомления создателю о выполнении задачи."""
 
     link = build_task_link(task.id)
 
@@ -164,77 +185,55 @@ def notify_task_completed(task: Task) -> None:
 
     text_lines.extend(["", f"Открыть задачу: {link}"])
 
-    text = "\n".join(text_lines)
-
-    send_telegram_message(profile.chat_id, text, reply_markup=None)
+    return "\n".join(text_lines)
 
 
-def _get_profiles_safe(user_ids: Iterable[int]) -> list[TelegramProfile]:
-    """
-    Возвращает список TelegramProfile для указанных пользователей.
-    Удобно, когда нужно отправить нескольким сразу.
-    """
-
-    ids = [uid for uid in user_ids if uid]
-    if not ids:
-        return []
-    return list(TelegramProfile.objects.filter(user_id__in=ids))
-
-
-def notify_task_message(message: TaskMessage) -> None:
+def notify_task_completed(task: Task) -> None:
     """
-    Уведомляет вторую сторону (создателя или исполнителя),
-    что в чате по задаче пришло новое сообщение.
+    Уведомляет создателя, что задача выполнена.
     """
 
-    task = message.task
-    sender = message.sender
-
-    creator_id = task.creator_id
-    assignee_id = task.assignee_id
-
-    recipients: set[int] = set()
-
-    if sender.id == creator_id and assignee_id:
-        recipients.add(assignee_id)
-
-    elif sender.id == assignee_id and creator_id:
-        recipients.add(creator_id)
-
-    if not recipients:
+    if task.creator_id is None:
         return
 
-
-    profiles = _get_profiles_safe(recipients)
-    if not profiles:
+    profile = _get_profile_safe(task.creator_id)
+    if profile is None:
         return
 
-    link = build_task_link(task.id)
+    enqueue_telegram_message(profile.chat_id, _build_task_completed_message(task), reply_markup=None)
 
-    full_name = (getattr(sender, "full_name", "") or "").strip()
-    sender_name = full_name if full_name else sender.email
 
-    text_preview = (message.text or "").strip()
-    if len(text_preview) > 300:
-        text_preview = text_preview[:297] + "..."
+def notify_tasks_completed(tasks: Iterable[Task]) -> int:
+    """
+    Пакетный вариант notify_task_completed: профили Telegram всех
+    создателей загружаются одним запросом, сообщения пишутся в outbox
+    одним INSERT. Возвращает число сообщений.
+    """
 
-    text_lines: list[str] = [
-        "<b>Новое сообщение по задаче</b>",
-        "",
-        f"<b>{task.title}</b>",
-        "",
-        f"От: {sender_name}",
-    ]
+    tasks = [task for task in tasks if task.creator_id]
+    profiles = {
+        profile.user_id: profile
+        for profile in _get_profiles_safe({task.creator_id for task in tasks})
+    }
 
-    if text_preview:
-        text_lines.extend(["", text_preview])
+    messages = [
+        (profiles[task.creator_id].chat_id, _build_task_completed_message(task), None)
+        for task in tasks
+        if task.creator_id in profiles
+    ]
+    return enqueue_telegram_messages(messages)
 
-    text_lines.extend(["", f"Открыть задачу: {link}"])
 
-    text = "\n".join(text_lines)
+def _get_profiles_safe(user_ids: Iterable[int]) -> list[TelegramProfile]:
+    """
+    Возвращает список TelegramProfile для указанных пользователей.
+    Удобно, когда нужно отправить нескольким сразу.
+    """
 
-    for profile in profiles:
-        send_telegram_message(profile.chat_id, text, reply_markup=None)
+    ids = [uid for uid in user_ids if uid]
+    if not ids:
+        return []
+    return list(TelegramProfile.objects.filter(user_id__in=ids))
 
 
 def _get_profile_safe(user_id: int) -> Optional[TelegramProfile]:
@@ -267,7 +266,9 @@ def _get_profiles_safe(user_ids: Iterable[int]) -> list[TelegramProfile]:
 def notify_task_message(message: TaskMessage) -> None:
     """
     Уведомляет вторую сторону (создателя или исполнителя),
-    что в чате по задаче пришло новое сообщение.
+    что в чате по задаче пришло новое сообщение. Сообщения в пределах
+    окна сводки получателя (TelegramProfile.chat_digest_window) приходят
+    одним уведомлением «N новых сообщений по задаче».
     """
 
     task = message.task
@@ -305,20 +306,44 @@ def notify_task_message(message: TaskMessage) -> None:
     if len(text_preview) > 300:
         text_preview = text_preview[:297] + "..."
 
-    text_lines: list[str] = [
-        "<b>Новое сообщение по задаче</b>",
-        "",
-        f"<b>{task.title}</b>",
-        "",
-        f"От: {sender_name}",
-    ]
-
-    if text_preview:
-        text_lines.extend(["", text_preview])
+    def render(count: int) -> str:
+        if count == 1:
+            text_lines: list[str] = [
+                "<b>Новое сообщение по задаче</b>",
+                "",
+                f"<b>{task.title}</b>",
+                "",
+                f"От: {sender_name}",
+            ]
+        else:
+            text_lines = [
+                f"<b>{count} {_plural(count, 'новое сообщение', 'новых сообщения', 'новых сообщений')} по задаче</b>",
+                "",
+                f"<b>{task.title}</b>",
+                "",
+                f"Последнее — от: {sender_name}",
+            ]
 
-    text_lines.extend(["", f"Открыть задачу: {link}"])
+        if text_preview:
+            text_lines.extend(["", text_preview])
 
-    text = "\n".join(text_lines)
+        text_lines.extend(["", f"Открыть задачу: {link}"])
+        return "\n".join(text_lines)
 
     for profile in profiles:
-        send_telegram_message(profile.chat_id, text, reply_markup=None)
+        enqueue_coalesced_message(
+            profile.chat_id,
+            f"task_chat:{task.id}:{profile.user_id}",
+            profile.chat_digest_window,
+            render,
+        )
+
+
+def _plural(n: int, one: str, few: str, many: str) -> str:
+    """Форма слова для числа: 1 сообщение, 3 сообщения, 5 сообщений."""
+
+    if n % 10 == 1 and n % 100 != 11:
+        return one
+    if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14:
+        return few
+    return many
@@ -0,0 +1,175 @@
+"""tasks/services/report_jobs.py"""
+"""Фоновые отчёты: постановка с дедупликацией по параметрам и построение файла."""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from tasks.models import ReportJob
+from tasks.services.export import EXPORT_CHUNK_SIZE, export_queryset
+from tasks.services.kpi import range_kpi_rows, team_range_kpi
+
+# Сколько живёт готовый (или поставленный) отчёт для повторных одинаковых запросов
+REPORT_JOB_TTL = timedelta(seconds=getattr(settings, "REPORT_JOB_TTL_SECONDS", 3600))
+
+# Как часто (в строках) сохранять прогресс выгрузки
+PROGRESS_EVERY_ROWS = 5000
+
+try:  # openpyxl есть в requirements; без него XLSX отклоняется сериализатором
+    from openpyxl import Workbook
+except ImportError:  # pragma: no cover - зависит от окружения
+    Workbook = None
+
+
+def xlsx_available() -> bool:
+    return Workbook is not None
+
+
+def params_hash(report_type: str, fmt: str, params: Dict[str, Any]) -> str:
+    """Стабильный хэш (тип, формат, параметры) для поиска одинаковых запросов."""
+
+    payload = json.dumps([report_type, fmt, params], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_or_enqueue_job(
+        creator: User, report_type: str, fmt: str, params: Dict[str, Any]
+) -> Tuple[ReportJob, bool]:
+    """
+    Возвращает (job, created). Если за последние REPORT_JOB_TTL уже есть
+    не упавшая задача с теми же параметрами — отдаёт её, новую не ставит.
+    Иначе создаёт ReportJob и ставит Celery-задачу после коммита.
+    """
+
+    from tasks.tasks_reports import build_report_job
+
+    digest = params_hash(report_type, fmt, params)
+    existing = (
+        ReportJob.objects.filter(
+            creator=creator,
+            report_type=report_type,
+            params_hash=digest,
+            created_at__gte=timezone.now() - REPORT_JOB_TTL,
+        )
+        .exclude(status=ReportJob.Status.FAILED)
+        .order_by("-created_at")
+        .first()
+    )
+    if existing is not None:
+        return existing, False
+
+    job = ReportJob.objects.create(
+        creator=creator,
+        report_type=report_type,
+        format=fmt,
+        params=params,
+        params_hash=digest,
+    )
+    job_id = str(job.pk)
+    transaction.on_commit(lambda: build_report_job.delay(job_id))
+    return job, True
+
+
+def _cell(value: Any) -> Any:
+    """Значение ячейки: даты — в ISO-строки (XLSX не принимает aware datetime)."""
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _export_rows(job: ReportJob, progress: Callable[[int], None]) -> Iterator[List[Any]]:
+    with_changes = job.report_type == ReportJob.ReportType.CHANGES_EXPORT
+    qs, columns = export_queryset(job.creator, with_changes=with_changes)
+    total = qs.count() or 1
+
+    yield list(columns)
+    for index, row in enumerate(qs.iterator(chunk_size=EXPORT_CHUNK_SIZE), start=1):
+        yield [_cell(value) for value in row]
+        if index % PROGRESS_EVERY_ROWS == 0:
+            progress(min(99, index * 100 // total))
+
+
+def _range_kpi_rows(job: ReportJob, progress: Callable[[int], None]) -> Iterator[List[Any]]:
+    params = job.params
+    data = team_range_kpi(
+        job.creator,
+        first_month=date.fromisoformat(f"{params['from']}-01"),
+        last_month=date.fromisoformat(f"{params['to']}-01"),
+        group_by=params.get("group_by", "month"),
+        assignee_ids=params.get("assignees"),
+    )
+    progress(50)
+    yield from range_kpi_rows(data)
+
+
+ROW_BUILDERS = {
+    ReportJob.ReportType.RANGE_KPI: _range_kpi_rows,
+    ReportJob.ReportType.TASKS_EXPORT: _export_rows,
+    ReportJob.ReportType.CHANGES_EXPORT: _export_rows,
+}
+
+
+def _write_csv(rows: Iterable[List[Any]], fh) -> None:
+    writer = csv.writer(fh)
+    for row in rows:
+        writer.writerow(row)
+
+
+def _write_xlsx(rows: Iterable[List[Any]], path: str) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("report")
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+
+def build_report(job: ReportJob) -> None:
+    """
+    Строит файл отчёта во временный файл (построчно, без загрузки в память)
+    и сохраняет его в job.file (storage → MEDIA_ROOT).
+    """
+
+    def progress(value: int) -> None:
+        ReportJob.objects.filter(pk=job.pk).update(progress=value)
+
+    rows = ROW_BUILDERS[job.report_type](job, progress)
+    filename = f"{job.report_type}.{job.format}"
+
+    fd, path = tempfile.mkstemp(suffix=f".{job.format}")
+    try:
+        if job.format == ReportJob.Format.XLSX:
+            os.close(fd)
+            _write_xlsx(rows, path)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as fh:
+                _write_csv(rows, fh)
+
+        with open(path, "rb") as fh:
+            job.file.save(filename, File(fh), save=False)
+    finally:
+        os.unlink(path)
+
+    job.status = ReportJob.Status.DONE
+    job.progress = 100
+    job.finished_at = timezone.now()
+    job.save(update_fields=["file", "status", "progress", "finished_at"])
+
+
+def job_download_url(job: ReportJob, request=None) -> Optional[str]:
+    """Ссылка на готовый файл (абсолютная, если передан request)."""
+
+    if job.status != ReportJob.Status.DONE or not job.file:
+        return None
+    url = job.file.url
+    return request.build_absolute_uri(url) if request is not None else url
@@ -0,0 +1,40 @@
+"""tasks/services/search.py"""
+"""Полнотекстовый поиск по задачам и сообщениям (tsvector + GIN, ранжирование по ts_rank)."""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q, QuerySet
+
+from accounts.models import User
+from tasks.models import SEARCH_CONFIG, Task, TaskMessage
+
+
+def build_query(text: str) -> SearchQuery:
+    """Запрос в синтаксисе веб-поиска: слова, "фразы", -исключения, or."""
+
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+
+
+def search_tasks(queryset: QuerySet, text: str) -> QuerySet:
+    """Фильтрует задачи по search_vector и добавляет аннотацию rank (без сортировки)."""
+
+    query = build_query(text)
+    return queryset.filter(search_vector=query).annotate(rank=SearchRank(F("search_vector"), query))
+
+
+def search_messages(queryset: QuerySet, text: str) -> QuerySet:
+    """То же для сообщений чата по задачам."""
+
+    query = build_query(text)
+    return queryset.filter(search_vector=query).annotate(rank=SearchRank(F("search_vector"), query))
+
+
+def visible_tasks(user: User) -> QuerySet:
+    """Задачи, которые пользователь видит: он создатель или исполнитель."""
+
+    return Task.objects.filter(Q(creator=user) | Q(assignee=user))
+
+
+def visible_messages(user: User) -> QuerySet:
+    """Сообщения из задач, которые видит пользователь."""
+
+    return TaskMessage.objects.filter(Q(task__creator=user) | Q(task__assignee=user))
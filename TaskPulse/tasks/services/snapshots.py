@@ -0,0 +1,124 @@
+"""tasks/services/snapshots.py"""
+"""
+Ежедневные снимки состояния задач (TaskDailySnapshot) для burndown/трендов.
+
+Снимок дня — состояние на конец дня в TZ проекта, по строке на
+(создатель, исполнитель). Пишется одним INSERT ... SELECT; повторный
+запуск за тот же день перезаписывает его строки.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from django.db import connection, transaction
+from django.db.models import Min, Sum
+from django.utils import timezone
+
+from accounts.models import User
+from tasks.models import Task, TaskDailySnapshot
+
+SNAPSHOT_METRICS = ("open", "in_progress", "overdue", "done")
+
+SNAPSHOT_SQL = """
+    INSERT INTO tasks_taskdailysnapshot
+        (day, creator_id, assignee_id, open, in_progress, overdue, done)
+    SELECT
+        %s,
+        t.creator_id,
+        t.assignee_id,
+        COUNT(*) FILTER (WHERE {status} <> %s),
+        COUNT(*) FILTER (WHERE {status} = %s),
+        COUNT(*) FILTER (WHERE {status} = %s),
+        COUNT(*) FILTER (WHERE {status} = %s)
+    FROM tasks_task AS t
+    {join}
+    WHERE t.created_at < %s
+    GROUP BY t.creator_id, t.assignee_id
+"""
+
+# Статус задачи на конец дня по журналу: последнее изменение статуса до конца
+# дня; если его нет — статус до первого изменения; если изменений нет — текущий.
+REPLAY_JOIN_SQL = """
+    CROSS JOIN LATERAL (
+        SELECT COALESCE(
+            (SELECT l.new_value FROM tasks_taskchangelog AS l
+             WHERE l.task_id = t.id AND l.field = 'status' AND l.changed_at < %s
+             ORDER BY l.changed_at DESC, l.id DESC LIMIT 1),
+            (SELECT l.old_value FROM tasks_taskchangelog AS l
+             WHERE l.task_id = t.id AND l.field = 'status'
+             ORDER BY l.changed_at, l.id LIMIT 1),
+            t.status
+        ) AS status
+    ) AS s
+"""
+
+
+def day_end(day: date) -> datetime:
+    """Начало следующего дня в TZ проекта — граница «конца дня»."""
+
+    return timezone.make_aware(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+
+
+def _write_snapshot(day: date, replay: bool) -> int:
+    end = day_end(day)
+    statuses = [Task.Status.DONE, Task.Status.IN_PROGRESS, Task.Status.OVERDUE, Task.Status.DONE]
+    if replay:
+        sql = SNAPSHOT_SQL.format(status="s.status", join=REPLAY_JOIN_SQL)
+        params = [day, *statuses, end, end]
+    else:
+        sql = SNAPSHOT_SQL.format(status="t.status", join="")
+        params = [day, *statuses, end]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("DELETE FROM tasks_taskdailysnapshot WHERE day = %s", [day])
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def snapshot_day(day: date) -> int:
+    """
+    Снимок по текущим статусам задач (ночная задача, сразу после полуночи).
+    Возвращает число записанных строк.
+    """
+
+    return _write_snapshot(day, replay=False)
+
+
+def replay_day(day: date) -> int:
+    """
+    Снимок прошедшего дня, восстановленный по журналу изменений статуса.
+    Создатель и исполнитель — текущие (смена исполнителя пишется в журнал
+    не на всех путях), удалённые задачи не восстанавливаются.
+    """
+
+    return _write_snapshot(day, replay=True)
+
+
+def first_task_day() -> Optional[date]:
+    """День создания самой ранней задачи (начало истории для backfill)."""
+
+    first = Task.objects.aggregate(first=Min("created_at"))["first"]
+    return timezone.localtime(first).date() if first else None
+
+
+def snapshot_series(
+        creator: User,
+        first_day: date,
+        last_day: date,
+        assignee_id: Optional[int] = None,
+        unassigned: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Временной ряд по снимкам создателя за [first_day, last_day]:
+    по точке на день, счётчики суммируются по исполнителям (или по одному).
+    Дни без снимка в ряд не попадают.
+    """
+
+    qs = TaskDailySnapshot.objects.filter(creator=creator, day__gte=first_day, day__lte=last_day)
+    if unassigned:
+        qs = qs.filter(assignee__isnull=True)
+    elif assignee_id is not None:
+        qs = qs.filter(assignee_id=assignee_id)
+
+    rows = qs.values("day").annotate(**{name: Sum(name) for name in SNAPSHOT_METRICS}).order_by("day")
+    return [{"day": row["day"].isoformat(), **{name: row[name] for name in SNAPSHOT_METRICS}} for row in rows]
@@ -2,34 +2,12 @@
 
 from __future__ import annotations
 
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from tasks.models import Task, TaskMessage
-from tasks.services.notifications import (
-    notify_task_assigned,
-    notify_task_completed,
-    notify_task_message,
-)
-
-
-@receiver(pre_save, sender=Task)
-def store_old_status(sender, instance: Task, **kwargs) -> None:  # noqa: ANN001
-    """
-    Перед сохранением задачи запоминаем старый статус,
-    чтобы в post_save понять, был ли переход в DONE.
-    """
-
-    if not instance.pk:
-        instance._old_status = None  # type: ignore[attr-defined]
-        return
-
-    try:
-        old = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:  # type: ignore[attr-defined]
-        instance._old_status = None  # type: ignore[attr-defined]
-    else:
-        instance._old_status = old.status  # type: ignore[attr-defined]
+from tasks.models import Task, TaskMessage, TaskTombstone
+from tasks.services.kpi_cache import invalidate_kpi
+from tasks.services.notifications import notify_task_assigned, notify_task_completed, notify_task_message
 
 
 @receiver(post_save, sender=Task)
@@ -37,27 +15,58 @@ def task_post_save(sender, instance: Task, created: bool, **kwargs) -> None:  #
     """
     - При создании задачи с исполнителем → уведомляем исполнителя.
     - При смене статуса на DONE → уведомляем создателя.
-    Все уведомления отправляются синхронно, без Celery.
+    Уведомления пишутся в outbox в той же транзакции, что и задача:
+    запрос не ждёт Telegram, откат транзакции не оставляет сообщений,
+    а отправляет их диспетчер (integrations.outbox) после коммита.
+    Плюс сброс KPI-кэша исполнителя/месяца задачи (до и после изменения).
     """
 
+    old = getattr(instance, "_old_values", {})
+    invalidate_kpi(
+        [
+            (instance.creator_id, instance.assignee_id, instance.due_at),
+            (instance.creator_id, old.get("assignee_id", instance.assignee_id), old.get("due_at", instance.due_at)),
+        ]
+    )
+
     if created and instance.assignee_id:
         notify_task_assigned(instance)
         return
 
     if not created:
+        # _old_status проставляет Task.save() по снимку значений из БД
         old_status = getattr(instance, "_old_status", None)
         new_status = instance.status
         if old_status != new_status and new_status == Task.Status.DONE:
             notify_task_completed(instance)
 
 
+@receiver(post_delete, sender=Task)
+def task_post_delete(sender, instance: Task, **kwargs) -> None:  # noqa: ANN001
+    """
+    Записываем tombstone для создателя и исполнителя,
+    чтобы delta-sync клиентов узнал об удалении задачи.
+    """
+
+    invalidate_kpi([(instance.creator_id, instance.assignee_id, instance.due_at)])
+
+    user_ids = {uid for uid in (instance.creator_id, instance.assignee_id) if uid}
+    TaskTombstone.objects.bulk_create(
+        [
+            TaskTombstone(task_id=instance.pk, user_id=uid, reason=TaskTombstone.Reason.DELETED)
+            for uid in user_ids
+        ]
+    )
+
+
 @receiver(post_save, sender=TaskMessage)
 def task_message_post_save(
         sender, instance: TaskMessage, created: bool, **kwargs  # noqa: ANN001
 ) -> None:
     """
     При создании нового сообщения в чате по задаче
-    отправляем уведомление второй стороне (создателю или исполнителю).
+    уведомляем вторую сторону (создателя или исполнителя) — через outbox,
+    в той же транзакции.
     """
 
     if not created:
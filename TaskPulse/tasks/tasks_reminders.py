@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import timedelta
 
 from celery import shared_task
+from django.db import transaction
 from django.utils import timezone
 
 from tasks.models import Task, TaskMessage
@@ -71,7 +72,7 @@ def send_due_soon_reminders(window_minutes: int = 15) -> int:
       в окне [24ч; 24ч + window_minutes],
     - у которых reminder_sent_at ещё не проставлен,
     - и есть исполнитель,
-    - отправляет им Telegram-напоминание,
+    - кладёт им Telegram-напоминание в outbox,
     - ставит reminder_sent_at, чтобы не слать повторно.
     Возвращает количество отправленных уведомлений.
     """
@@ -90,9 +91,11 @@ def send_due_soon_reminders(window_minutes: int = 15) -> int:
     sent_count = 0
 
     for task in qs:
-        notify_task_due_soon(task)
-        task.reminder_sent_at = now
-        task.save(update_fields=["reminder_sent_at"])
+        # отметка и запись в outbox — вместе: ни потерянных, ни двойных напоминаний
+        with transaction.atomic():
+            notify_task_due_soon(task)
+            task.reminder_sent_at = now
+            task.save(update_fields=["reminder_sent_at"])
         sent_count += 1
 
     return sent_count
@@ -0,0 +1,67 @@
+"""tasks/tasks_reports.py"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from tasks.models import ReportJob
+from tasks.services.kpi_cache import warm_month
+from tasks.services.report_jobs import build_report
+from tasks.services.snapshots import snapshot_day
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def build_report_job(job_id: str) -> str:
+    """
+    Строит файл отчёта для ReportJob в фоне (вне gunicorn-воркера).
+    Возвращает итоговый статус задачи.
+    """
+
+    try:
+        job = ReportJob.objects.select_related("creator").get(pk=job_id)
+    except ReportJob.DoesNotExist:
+        return "missing"
+
+    if job.status == ReportJob.Status.DONE:
+        return job.status
+
+    job.status = ReportJob.Status.RUNNING
+    job.save(update_fields=["status"])
+
+    try:
+        build_report(job)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Не удалось построить отчёт %s", job_id)
+        ReportJob.objects.filter(pk=job.pk).update(
+            status=ReportJob.Status.FAILED,
+            error=str(exc)[:2000],
+            finished_at=timezone.now(),
+        )
+        return ReportJob.Status.FAILED
+
+    return job.status
+
+
+@shared_task
+def warm_kpi_cache() -> int:
+    """
+    Прогрев KPI-кэша за текущий месяц (beat, 1-е число; включается
+    KPI_CACHE_WARMUP), чтобы первая загрузка дашборда месяца была быстрой.
+    """
+
+    today = timezone.localdate()
+    return warm_month(today.year, today.month)
+
+
+@shared_task
+def snapshot_task_states() -> int:
+    """
+    Ночной снимок состояния задач (beat, 00:05) за прошедший день —
+    для burndown/трендов. Возвращает число записанных строк.
+    """
+
+    return snapshot_day(timezone.localdate() - timedelta(days=1))
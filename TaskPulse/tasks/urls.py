@@ -10,7 +10,14 @@ from .views_cabinet import (
     ExecutorTasksView,
     ExecutorTaskDetailView,
 )
-from .views_reports import monthly_report
+from .views_reports import (
+    export_tasks,
+    monthly_report,
+    range_report,
+    report_job_detail,
+    report_jobs,
+    trend_report,
+)
 
 router = DefaultRouter()
 router.register("", TaskViewSet, basename="task")
@@ -49,6 +56,31 @@ urlpatterns = [
         monthly_report,
         name="reports-monthly",
     ),
+    path(
+        "reports/range/",
+        range_report,
+        name="reports-range",
+    ),
+    path(
+        "reports/trend/",
+        trend_report,
+        name="reports-trend",
+    ),
+    path(
+        "export/",
+        export_tasks,
+        name="tasks-export",
+    ),
+    path(
+        "report-jobs/",
+        report_jobs,
+        name="report-jobs",
+    ),
+    path(
+        "report-jobs/<uuid:pk>/",
+        report_job_detail,
+        name="report-job-detail",
+    ),
 
     path("", include(router.urls)),
 ]
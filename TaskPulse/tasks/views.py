@@ -3,20 +3,35 @@
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .filters import TaskFilter
-from .models import Task, TaskChangeLog, TaskMessage
+from .conditional import (
+    ConditionalListMixin,
+    apply_validators,
+    compute_validators,
+    not_modified_response,
+)
+from .filters import TaskFilter, TaskFullTextSearchFilter
+from .models import Task, TaskChangeLog, TaskMessage, TaskTombstone
+from .pagination import TaskKeysetPagination
 from .permissions import IsCreatorOrAssignee
+from .services.bulk import bulk_reassign, bulk_set_status, bulk_shift_due
+from .services.kpi_cache import invalidate_kpi
+from .services.notifications import notify_tasks_assigned
 from .serializers import (
+    BulkTaskItemSerializer,
     TaskActionSerializer,
+    TaskBulkUpdateSerializer,
     TaskAttachmentSerializer,
     TaskSerializer,
     TaskUpsertSerializer,
@@ -26,29 +41,115 @@ from .serializers import (
 User = get_user_model()
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """Полноценный вьюсет для задач:"""
 
-    queryset = Task.objects.select_related("creator", "assignee").prefetch_related(
-        "attachments"
-    )
+    conditional_related_timestamps = ("attachments__created_at",)
+    # ?expand= отдаёт журналы, а запись в журнал (confirm_on_time и т.п.) не трогает updated_at
+    conditional_expand_timestamps = {
+        "changes": "changes__changed_at",
+        "actions": "actions__created_at",
+    }
+
+    queryset = Task.objects.all()
     permission_classes = [permissions.IsAuthenticated, IsCreatorOrAssignee]
     serializer_class = TaskSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = TaskKeysetPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter, TaskFullTextSearchFilter]
     filterset_class = TaskFilter
-    search_fields = ["title", "description"]
     ordering_fields = ["due_at", "updated_at", "created_at", "priority", "status"]
     ordering = ["-updated_at"]
 
+    # Максимум задач в одном POST /api/tasks/bulk/
+    BULK_CREATE_MAX = 1000
+
+    # Перекрытие окна delta-sync на случай транзакций, закоммиченных с задержкой
+    SYNC_OVERLAP = timedelta(seconds=5)
+
+    # Действиям нужен только сам объект для проверки прав (creator/assignee)
+    PERMISSION_ONLY_ACTIONS = ("confirm_on_time", "upload_attachment")
+
     def get_queryset(self):
-        qs = (
-            super()
-            .get_queryset()
-            .select_related("creator", "assignee")
-            .prefetch_related("attachments", "changes", "actions")
-        )
+        """
+        Строит queryset под конкретное действие:
+        - для проверок прав грузим только id/creator/assignee;
+        - для изменений — строку задачи без связей;
+        - для чтения — только то, что нужно запрошенным полям (?fields=/?expand=).
+        """
+
+        qs = super().get_queryset()
+
+        if self.action in self.PERMISSION_ONLY_ACTIONS:
+            return qs.only("id", "creator", "assignee")
+
+        if self.action in ("update", "partial_update", "destroy"):
+            return qs
+
+        fields, expand = self.get_requested_fields()
+        if fields is None:
+            field_names = set(TaskSerializer.Meta.fields) | expand
+        else:
+            field_names = fields | expand
+            # колонки сортировки нужны курсорной пагинации
+            qs = qs.only(*TaskSerializer.columns_for(field_names), *self.ordering_fields)
+
+        related = {
+            column.split("__", 1)[0]
+            for column in TaskSerializer.columns_for(field_names)
+            if "__" in column
+        }
+        if related:
+            qs = qs.select_related(*sorted(related))
+
+        prefetches = TaskSerializer.prefetches_for(field_names)
+        if prefetches:
+            qs = qs.prefetch_related(*sorted(prefetches))
         return qs
 
+    def get_requested_fields(self) -> tuple[set[str] | None, set[str]]:
+        """
+        Разбирает ?fields=id,title,... и ?expand=changes,actions.
+        fields=None означает «все стандартные поля».
+        """
+
+        if getattr(self, "_requested_fields", None) is not None:
+            return self._requested_fields
+
+        params = self.request.query_params
+        allowed = set(TaskSerializer.Meta.fields)
+        expandable = set(TaskSerializer.EXPANDABLE_FIELDS)
+
+        expand = {name.strip() for name in params.get("expand", "").split(",") if name.strip()}
+        unknown = expand - expandable
+        if unknown:
+            raise ValidationError({"expand": f"Неизвестные связи: {', '.join(sorted(unknown))}."})
+
+        fields = None
+        if params.get("fields"):
+            fields = {name.strip() for name in params["fields"].split(",") if name.strip()}
+            unknown = fields - allowed - expandable
+            if unknown:
+                raise ValidationError({"fields": f"Неизвестные поля: {', '.join(sorted(unknown))}."})
+            expand |= fields & expandable
+            fields -= expandable
+
+        self._requested_fields = (fields, expand)
+        return self._requested_fields
+
+    def get_conditional_related_timestamps(self) -> tuple:
+        """К датам вложений добавляет даты раскрытых журналов (?expand=changes,actions)."""
+
+        _fields, expand = self.get_requested_fields()
+        return super().get_conditional_related_timestamps() + tuple(
+            self.conditional_expand_timestamps[name] for name in sorted(expand)
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ("list", "retrieve", "changes"):
+            context["fields"], context["expand"] = self.get_requested_fields()
+        return context
+
     def get_serializer_class(self):
         """Возвращает сериализатор в зависимости от действия"""
 
@@ -59,10 +160,38 @@ class TaskViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         """Настраиваем права доступа."""
 
-        if self.action in ("list", "create"):
+        if self.action in ("list", "create", "bulk", "bulk_update", "changes"):
             return [permissions.IsAuthenticated()]
         return [permissions.IsAuthenticated(), IsCreatorOrAssignee()]
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Детальная карточка с conditional GET по Task.updated_at
+        (и дате последнего вложения). Валидаторы считаются только
+        для задач, доступных пользователю; остальное — обычный путь с 403/404.
+        """
+
+        pk = str(kwargs.get(self.lookup_url_kwarg or self.lookup_field, ""))
+        if not pk.isdigit():
+            return super().retrieve(request, *args, **kwargs)
+
+        user = request.user
+        visible = Task.objects.filter(Q(creator=user) | Q(assignee=user), pk=int(pk))
+        validators = compute_validators(
+            visible,
+            request,
+            related_timestamps=self.get_conditional_related_timestamps(),
+        )
+        if validators.count:
+            not_modified = not_modified_response(request, validators)
+            if not_modified is not None:
+                return not_modified
+
+        response = super().retrieve(request, *args, **kwargs)
+        if validators.count:
+            apply_validators(response, validators)
+        return response
+
     def create(self, request, *args, **kwargs):
         """
         Создаёт задачу через upsert-сериализатор,
@@ -75,6 +204,149 @@ class TaskViewSet(viewsets.ModelViewSet):
         read = TaskSerializer(task, context={"request": request})
         return Response(read.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        POST /api/tasks/bulk/ — пакетное создание задач.
+        Тело: список объектов как для POST /api/tasks/ (без файлов)
+        или {"tasks": [...]}. Все задачи вставляются одним bulk_create
+        в транзакции; уведомления исполнителям пишутся в outbox там же
+        одним INSERT. Сигналы Task при этом не вызываются.
+        """
+
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get("tasks")
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Ожидается непустой список задач."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.BULK_CREATE_MAX:
+            return Response(
+                {"detail": f"Не больше {self.BULK_CREATE_MAX} задач за один запрос."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # исполнители всех задач — одним запросом, а не get() на каждый элемент
+        assignee_ids = {
+            int(item["assignee"])
+            for item in items
+            if isinstance(item, dict) and str(item.get("assignee") or "").isdigit()
+        }
+        ser = BulkTaskItemSerializer(
+            data=items,
+            many=True,
+            context={"request": request, "preloaded_users": User.objects.in_bulk(assignee_ids)},
+        )
+        ser.is_valid(raise_exception=True)
+
+        tasks = [Task(creator=request.user, **data) for data in ser.validated_data]
+        # bulk_create обходит Task.save — completed_at для DONE ставим сами (как _sync_completed_at)
+        now = timezone.now()
+        for task in tasks:
+            if task.status == Task.Status.DONE and task.completed_at is None:
+                task.completed_at = now
+
+        with transaction.atomic():
+            created = Task.objects.bulk_create(tasks, batch_size=500)
+            invalidate_kpi((request.user.id, task.assignee_id, task.due_at) for task in created)
+            notify_tasks_assigned(created)
+
+        return Response(
+            {"count": len(created), "ids": [task.pk for task in created]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk-update")
+    def bulk_update(self, request):
+        """
+        POST /api/tasks/bulk-update/ — массовая операция над своими задачами:
+        {"ids": [...], "operation": "set_status", "status": "done"}
+        {"ids": [...], "operation": "reassign", "assignee": 5}
+        {"ids": [...], "operation": "shift_due", "days": 2}
+        Менять можно только задачи, созданные текущим пользователем.
+        """
+
+        ser = TaskBulkUpdateSerializer(data=request.data, context={"request": request})
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        ids = list(
+            Task.objects.filter(pk__in=data["ids"], creator=request.user).values_list("pk", flat=True)
+        )
+        options = {"changed_by": request.user}
+        if data.get("comment"):
+            options["reason"] = data["comment"]
+
+        operation = data["operation"]
+        if operation == TaskBulkUpdateSerializer.OPERATION_SET_STATUS:
+            updated = bulk_set_status(ids, data["status"], **options)
+        elif operation == TaskBulkUpdateSerializer.OPERATION_REASSIGN:
+            updated = bulk_reassign(ids, data["assignee"], **options)
+        else:
+            updated = bulk_shift_due(ids, timedelta(days=data["days"]), **options)
+
+        return Response(
+            {
+                "updated": updated,
+                "skipped": sorted(set(data["ids"]) - set(updated)),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """
+        GET /api/tasks/changes/?since=<cursor>
+        Delta-sync: задачи пользователя, созданные/изменённые после курсора,
+        и tombstones для удалённых задач и задач, с которых его сняли.
+        Без since — полный снимок видимых задач. В ответе — новый курсор.
+        """
+
+        since_raw = request.query_params.get("since")
+        since = None
+        if since_raw:
+            since = parse_datetime(since_raw)
+            if since is None:
+                raise ValidationError({"since": "Некорректный курсор."})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        cursor = timezone.now()
+        user = request.user
+
+        qs = (
+            self.get_queryset()
+            .filter(Q(creator=user) | Q(assignee=user))
+            .order_by("updated_at", "id")
+        )
+        tombstones = TaskTombstone.objects.none()
+        if since is not None:
+            # перекрытие окна: строки, закоммиченные позже своего updated_at
+            window_start = since - self.SYNC_OVERLAP
+            qs = qs.filter(updated_at__gt=window_start)
+            tombstones = TaskTombstone.objects.filter(
+                user_id=user.id, created_at__gt=window_start
+            )
+
+        tasks = list(qs)
+        returned_ids = {task.pk for task in tasks}
+
+        deleted: dict[int, str] = {}
+        for task_id, reason in tombstones.values_list("task_id", "reason"):
+            if task_id not in returned_ids:
+                deleted[task_id] = reason
+
+        return Response(
+            {
+                "cursor": cursor.isoformat().replace("+00:00", "Z"),
+                "tasks": self.get_serializer(tasks, many=True).data,
+                "deleted": [{"id": task_id, "reason": reason} for task_id, reason in deleted.items()],
+            },
+            status=status.HTTP_200_OK,
+        )
+
     @action(detail=True, methods=["post"], url_path="attachments")
     def upload_attachment(self, request, pk=None):
         """POST /api/tasks/{id}/attachments/"""
@@ -197,10 +469,17 @@ class ConversationMessagesView(APIView):
             .order_by("created_at", "id")
         )
 
+        # Сообщения не редактируются: хватает count + max(created_at)
+        validators = compute_validators(qs, request, timestamp_field="created_at", collection=True)
+        not_modified = not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+
         serializer = TaskMessageSerializer(
             qs, many=True, context={"request": request}
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        return apply_validators(response, validators)
 
     def post(self, request):
         user = request.user
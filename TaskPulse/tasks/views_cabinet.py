@@ -1,8 +1,8 @@
 """tasks/views_cabinet.py"""
 
+from datetime import date
 from typing import Any, Dict, List
 
-from django.db.models import Count, Q, F
 from rest_framework import status
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated
@@ -10,7 +10,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import User  # твой кастомный User
+from .conditional import ConditionalListMixin
 from .models import Task
+from .pagination import TaskKeysetPagination
+from .services.kpi import STATS_BUCKETS
+from .services.kpi_cache import get_creator_stats
 from .serializers_cabinet import (
     CreatorTaskListSerializer,
     ExecutorTaskListSerializer,
@@ -30,11 +34,12 @@ class CreatorOnlyMixin:
         return None
 
 
-class CreatorTasksView(CreatorOnlyMixin, ListAPIView):
+class CreatorTasksView(CreatorOnlyMixin, ConditionalListMixin, ListAPIView):
     """Кабинет Создателя: список собственных задач."""
 
     permission_classes = [IsAuthenticated]
     serializer_class = CreatorTaskListSerializer
+    pagination_class = TaskKeysetPagination
 
     def get(self, request, *args, **kwargs):
         err = self._ensure_creator(request)
@@ -79,7 +84,12 @@ class CreatorTasksView(CreatorOnlyMixin, ListAPIView):
 
 
 class CreatorStatsByAssigneeView(CreatorOnlyMixin, APIView):
-    """Кабинет Создателя: сводка по сотрудникам."""
+    """
+    Кабинет Создателя: сводка по сотрудникам.
+
+    ?month=YYYY-MM — только задачи с дедлайном в этом месяце;
+    ?bucket=month|week — разбивка по месяцам/неделям дедлайна (week — вместе с month).
+    """
 
     permission_classes = [IsAuthenticated]
 
@@ -89,73 +99,47 @@ class CreatorStatsByAssigneeView(CreatorOnlyMixin, APIView):
             return err
 
         month_str = request.query_params.get("month")
-
-        qs = Task.objects.filter(creator=request.user, assignee__isnull=False)
+        month = None
 
         # фильтр по месяцу дедлайна (как и в отчётах)
         if month_str:
             try:
                 year_str, month_num_str = month_str.split("-")
                 year = int(year_str)
-                month = int(month_num_str)
-                if 1 <= month <= 12:
-                    qs = qs.filter(due_at__year=year, due_at__month=month)
+                month_num = int(month_num_str)
+                if 1 <= month_num <= 12:
+                    month = date(year, month_num, 1)
             except (ValueError, AttributeError):
                 return Response(
                     {"detail": "month должен быть в формате YYYY-MM."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        base = (
-            qs.values("assignee_id", "assignee__email", "assignee__full_name")
-            .annotate(total=Count("id"))
-            .order_by("assignee__full_name")
-        )
-
-        done_qs = qs.filter(status=Task.Status.DONE)
-        done_on_time_qs = done_qs.filter(
-            Q(due_at__isnull=True) | Q(updated_at__lte=F("due_at"))
-        )
-        done_late_qs = done_qs.filter(
-            Q(due_at__isnull=False) & Q(updated_at__gt=F("due_at"))
-        )
-
-        done_map = {
-            row["assignee_id"]: row["cnt"]
-            for row in done_qs.values("assignee_id").annotate(cnt=Count("id"))
-        }
-        done_on_time_map = {
-            row["assignee_id"]: row["cnt"]
-            for row in done_on_time_qs.values("assignee_id").annotate(cnt=Count("id"))
-        }
-        done_late_map = {
-            row["assignee_id"]: row["cnt"]
-            for row in done_late_qs.values("assignee_id").annotate(cnt=Count("id"))
-        }
-
-        result: List[Dict[str, Any]] = []
-        for row in base:
-            aid = row["assignee_id"]
-            result.append(
-                {
-                    "assignee_id": aid,
-                    "assignee_email": row["assignee__email"],
-                    "assignee_name": row["assignee__full_name"],
-                    "total": row["total"],
-                    "done": done_map.get(aid, 0),
-                    "done_on_time": done_on_time_map.get(aid, 0),
-                    "done_late": done_late_map.get(aid, 0),
-                }
+        bucket = request.query_params.get("bucket") or None
+        if bucket is not None and bucket not in STATS_BUCKETS:
+            return Response(
+                {"detail": "bucket должен быть month или week."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        if bucket == "week" and month is None:
+            return Response(
+                {"detail": "Для bucket=week нужен параметр month."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Один GROUP BY-запрос (rollup TaskKpiMonthly, для недель — задачи)
+        # через KPI-кэш — число запросов не зависит от числа исполнителей
+        result: List[Dict[str, Any]] = get_creator_stats(request.user.id, month, bucket)
 
         return Response({"results": result}, status=status.HTTP_200_OK)
 
 
-class ExecutorTasksView(ListAPIView):
+class ExecutorTasksView(ConditionalListMixin, ListAPIView):
     """Кабинет Исполнителя: список назначенных задач."""
 
     permission_classes = [IsAuthenticated]
     serializer_class = ExecutorTaskListSerializer
+    pagination_class = TaskKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -1,16 +1,25 @@
 """tasks/views_reports.py"""
 
 import csv
+import json
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
 
 from django.contrib.auth import get_user_model
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.renderers import JSONRenderer, BrowsableAPIRenderer, BaseRenderer
 from rest_framework.response import Response
 
-from .services.kpi import calc_user_month_kpi
+from .models import ReportJob
+from .serializers import ReportJobCreateSerializer, ReportJobSerializer
+from .services.export import export_queryset, iter_csv, iter_ndjson
+from .services.kpi import range_kpi_rows, team_range_kpi
+from .services.kpi_cache import get_user_month_kpi
+from .services.report_jobs import get_or_enqueue_job
+from .services.snapshots import SNAPSHOT_METRICS, snapshot_series
 
 User = get_user_model()
 
@@ -91,7 +100,7 @@ def monthly_report(request):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-    data = calc_user_month_kpi(target_user, year, month)
+    data = get_user_month_kpi(target_user, year, month)
 
     if fmt == "csv":
         # CSV-ответ
@@ -125,3 +134,239 @@ def monthly_report(request):
 
     # JSON-ответ
     return Response(data, status=status.HTTP_200_OK)
+
+
+# Максимальная длина диапазона range-отчёта, в месяцах
+RANGE_REPORT_MAX_MONTHS = 36
+
+
+def _parse_range_params(params) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Разбирает from/to/group_by/assignees range-отчёта.
+    Возвращает (аргументы team_range_kpi, None) или (None, текст ошибки).
+    """
+
+    from_year, from_month = _parse_month(params.get("from"))
+    to_year, to_month = _parse_month(params.get("to"))
+    if from_year is None or to_year is None:
+        return None, "Параметры from и to обязательны (формат YYYY-MM)."
+
+    span = (to_year - from_year) * 12 + (to_month - from_month) + 1
+    if span < 1 or span > RANGE_REPORT_MAX_MONTHS:
+        return None, f"Диапазон должен быть от 1 до {RANGE_REPORT_MAX_MONTHS} месяцев, from <= to."
+
+    group_by = params.get("group_by", "month")
+    if group_by not in ("month", "week"):
+        return None, "group_by должен быть month или week."
+
+    assignees_param = params.get("assignees", "all")
+    assignee_ids = None
+    if assignees_param != "all":
+        values = assignees_param if isinstance(assignees_param, (list, tuple)) else str(assignees_param).split(",")
+        try:
+            assignee_ids = sorted({int(value) for value in values if str(value).strip()})
+        except (TypeError, ValueError):
+            return None, "assignees должен быть all или списком id через запятую."
+
+    return {
+        "first_month": date(from_year, from_month, 1),
+        "last_month": date(to_year, to_month, 1),
+        "group_by": group_by,
+        "assignee_ids": assignee_ids,
+    }, None
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, BrowsableAPIRenderer, CSVRenderer])
+def range_report(request):
+    """
+    KPI всех исполнителей создателя за диапазон месяцев одним запросом:
+    GET /api/tasks/reports/range/?from=YYYY-MM&to=YYYY-MM&group_by=month|week&assignees=all|1,2
+    """
+
+    current_user = request.user
+    if getattr(current_user, "role", None) != "CREATOR":
+        return Response(
+            {"detail": "Доступ к отчётам есть только у пользователей с ролью CREATOR."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    params = request.query_params
+    range_params, error = _parse_range_params(params)
+    if error:
+        return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    group_by = range_params["group_by"]
+    data = team_range_kpi(current_user, **range_params)
+
+    if params.get("format", "json").lower() == "csv":
+        response = HttpResponse(content_type="text/csv")
+        filename = f"range_report_{data['from']}_{data['to']}_{group_by}.csv"
+        response["Content-Disposition"] = f'attachment; filename=\"{filename}\"'
+
+        csv.writer(response).writerows(range_kpi_rows(data))
+        return response
+
+    return Response(data, status=status.HTTP_200_OK)
+
+
+# Максимальная длина ряда trend-отчёта (дней)
+TREND_REPORT_MAX_DAYS = 366
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def trend_report(request):
+    """
+    Тренд состояния задач создателя по дням — только из снимков TaskDailySnapshot:
+    GET /api/tasks/reports/trend/?from=YYYY-MM-DD&to=YYYY-MM-DD&assignee=<id>|none
+    """
+
+    current_user = request.user
+    if getattr(current_user, "role", None) != "CREATOR":
+        return Response(
+            {"detail": "Доступ к отчётам есть только у пользователей с ролью CREATOR."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    params = request.query_params
+    try:
+        first_day = date.fromisoformat(params.get("from", ""))
+        last_day = date.fromisoformat(params.get("to", ""))
+    except ValueError:
+        return Response(
+            {"detail": "Параметры from и to обязательны (формат YYYY-MM-DD)."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not 0 <= (last_day - first_day).days < TREND_REPORT_MAX_DAYS:
+        return Response(
+            {"detail": f"Диапазон должен быть от 1 до {TREND_REPORT_MAX_DAYS} дней, from <= to."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    assignee_param = params.get("assignee")
+    assignee_id = None
+    if assignee_param and assignee_param != "none":
+        try:
+            assignee_id = int(assignee_param)
+        except ValueError:
+            return Response(
+                {"detail": "assignee должен быть id пользователя или none."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    points = snapshot_series(
+        current_user, first_day, last_day, assignee_id=assignee_id, unassigned=assignee_param == "none"
+    )
+    return Response(
+        {
+            "from": first_day.isoformat(),
+            "to": last_day.isoformat(),
+            "assignee": assignee_param or "all",
+            "metrics": list(SNAPSHOT_METRICS),
+            "points": points,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Формат `ndjson` для content negotiation; тело пишет StreamingHttpResponse."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@renderer_classes([CSVRenderer, NDJSONRenderer, JSONRenderer])
+def export_tasks(request):
+    """
+    Потоковая выгрузка всех задач создателя:
+    GET /api/tasks/export/?format=csv|ndjson&include=changes
+
+    С include=changes — одна строка на запись журнала изменений
+    вместе с полями задачи. Формат по умолчанию — CSV.
+    """
+
+    current_user = request.user
+    if getattr(current_user, "role", None) != "CREATOR":
+        return Response(
+            {"detail": "Выгрузка доступна только пользователям с ролью CREATOR."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    fmt = request.query_params.get("format", "csv").lower()
+    with_changes = request.query_params.get("include") == "changes"
+    qs, columns = export_queryset(current_user, with_changes=with_changes)
+
+    suffix = "_changes" if with_changes else ""
+    if fmt == "ndjson":
+        response = StreamingHttpResponse(iter_ndjson(qs, columns), content_type="application/x-ndjson")
+        filename = f"tasks{suffix}_{current_user.id}.ndjson"
+    else:
+        response = StreamingHttpResponse(iter_csv(qs, columns), content_type="text/csv")
+        filename = f"tasks{suffix}_{current_user.id}.csv"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def report_jobs(request):
+    """
+    Ставит тяжёлый отчёт в фон: POST /api/tasks/report-jobs/
+    {"report_type": "range_kpi|tasks_export|changes_export", "format": "csv|xlsx", "params": {...}}
+
+    202 — задача поставлена; 200 — переиспользована такая же за последние
+    REPORT_JOB_TTL_SECONDS. Статус и ссылка — GET /api/tasks/report-jobs/<id>/.
+    """
+
+    current_user = request.user
+    if getattr(current_user, "role", None) != "CREATOR":
+        return Response(
+            {"detail": "Доступ к отчётам есть только у пользователей с ролью CREATOR."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    serializer = ReportJobCreateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    report_type = serializer.validated_data["report_type"]
+
+    params: Dict[str, Any] = {}
+    if report_type == ReportJob.ReportType.RANGE_KPI:
+        range_params, error = _parse_range_params(serializer.validated_data["params"])
+        if error:
+            return Response({"params": error}, status=status.HTTP_400_BAD_REQUEST)
+        params = {
+            "from": range_params["first_month"].strftime("%Y-%m"),
+            "to": range_params["last_month"].strftime("%Y-%m"),
+            "group_by": range_params["group_by"],
+            "assignees": range_params["assignee_ids"],
+        }
+
+    job, created = get_or_enqueue_job(
+        current_user, report_type, serializer.validated_data["format"], params
+    )
+    return Response(
+        ReportJobSerializer(job, context={"request": request}).data,
+        status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def report_job_detail(request, pk):
+    """Статус фонового отчёта, прогресс и ссылка на файл (только свои задачи)."""
+
+    job = ReportJob.objects.filter(pk=pk, creator=request.user).first()
+    if job is None:
+        return Response({"detail": "Отчёт не найден."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ReportJobSerializer(job, context={"request": request}).data)
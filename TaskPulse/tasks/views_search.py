@@ -0,0 +1,68 @@
+"""tasks/views_search.py"""
+
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .services.search import search_messages, search_tasks, visible_messages, visible_tasks
+
+
+class UnifiedSearchView(APIView):
+    """
+    Единый поиск: GET /api/search/?q=...&limit=20
+
+    Ищет по задачам (название, описание, комментарий исполнителя)
+    и сообщениям чата — только в задачах, где пользователь создатель
+    или исполнитель. Результаты каждой группы отсортированы по релевантности.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+
+    TASK_FIELDS = ("id", "title", "status", "priority", "due_at", "creator_id", "assignee_id", "updated_at")
+    MESSAGE_FIELDS = ("id", "task_id", "task__title", "sender_id", "text", "created_at")
+
+    def get(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"detail": "Параметр q обязателен."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limit = self.get_limit(request)
+        user = request.user
+
+        tasks = (
+            search_tasks(visible_tasks(user), text)
+            .order_by("-rank", "-updated_at")
+            .values(*self.TASK_FIELDS, "rank")[:limit]
+        )
+        messages = (
+            search_messages(visible_messages(user), text)
+            .order_by("-rank", "-created_at")
+            .values(*self.MESSAGE_FIELDS, "rank")[:limit]
+        )
+
+        return Response(
+            {
+                "query": text,
+                "tasks": list(tasks),
+                "messages": [self.message_row(row) for row in messages],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @staticmethod
+    def message_row(row: dict) -> dict:
+        row["task_title"] = row.pop("task__title")
+        return row
+
+    def get_limit(self, request) -> int:
+        try:
+            value = int(request.query_params.get("limit", self.DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            return self.DEFAULT_LIMIT
+        return max(1, min(value, self.MAX_LIMIT))
@@ -7,6 +7,17 @@ from rest_framework.test import APIClient
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def _reset_telegram_rate_limit():
+    """Ведра лимитера Telegram живут в памяти процесса — не переносим их между тестами."""
+
+    from integrations import rate_limit
+
+    rate_limit.reset_buckets()
+    yield
+    rate_limit.reset_buckets()
+
+
 @pytest.fixture
 def api_client():
     """APIClient без авторизации.
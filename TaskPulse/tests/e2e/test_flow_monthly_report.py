@@ -13,7 +13,7 @@ pytestmark = [pytest.mark.django_db, pytest.mark.e2e, pytest.mark.api]
 
 
 def _aware(y: int, m: int, d: int, hh: int = 0, mm: int = 0) -> dt.datetime:
-    """Создаём timezone-aware datetime для due_at/updated_at."""
+    """Создаём timezone-aware datetime для due_at/completed_at."""
 
     return timezone.make_aware(dt.datetime(y, m, d, hh, mm))
 
@@ -24,7 +24,7 @@ def test_e2e_creator_creates_tasks_and_gets_monthly_report(api_client):
     1) Создаём CREATOR и авторизуемся через DRF Token
     2) Создаём EXECUTOR + TelegramProfile (чтобы проходила валидация assignee)
     3) CREATOR создаёт 2 задачи в 2026-01 на EXECUTOR через /api/tasks/
-    4) Обновляем задачи: DONE вовремя/поздно (через ORM update updated_at)
+    4) Обновляем задачи: DONE вовремя/поздно (через ORM update completed_at)
     5) CREATOR получает monthly report и видит корректные totals
     """
 
@@ -88,9 +88,9 @@ def test_e2e_creator_creates_tasks_and_gets_monthly_report(api_client):
     assert resp2.status_code in (status.HTTP_201_CREATED, status.HTTP_200_OK), resp2.data
     task2_id = resp2.data["id"]
 
-    # 4) Завершаем задачи и фиксируем updated_at.
-    Task.objects.filter(pk=task1_id).update(status=Task.Status.DONE, updated_at=_aware(2026, 1, 10, 11, 0))  # вовремя
-    Task.objects.filter(pk=task2_id).update(status=Task.Status.DONE, updated_at=_aware(2026, 1, 11, 13, 0))  # поздно
+    # 4) Завершаем задачи и фиксируем completed_at.
+    Task.objects.filter(pk=task1_id).update(status=Task.Status.DONE, completed_at=_aware(2026, 1, 10, 11, 0))  # вовремя
+    Task.objects.filter(pk=task2_id).update(status=Task.Status.DONE, completed_at=_aware(2026, 1, 11, 13, 0))  # поздно
 
     # 5) Получаем отчёт по исполнителю.
     report = api_client.get(f"/api/tasks/reports/monthly/?month=2026-01&user={executor.id}")
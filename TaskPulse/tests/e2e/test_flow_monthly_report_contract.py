@@ -83,11 +83,11 @@ def test_e2e_monthly_report_creator_counts_tasks_for_executor_in_month():
 
     Task.objects.filter(id=task1_id).update(
         status=Task.Status.DONE,
-        updated_at=dt(2026, 1, 10, 11, 0),  # вовремя
+        completed_at=dt(2026, 1, 10, 11, 0),  # вовремя
     )
     Task.objects.filter(id=task2_id).update(
         status=Task.Status.DONE,
-        updated_at=dt(2026, 1, 21, 12, 0),  # поздно
+        completed_at=dt(2026, 1, 21, 12, 0),  # поздно
     )
 
     assert Task.objects.filter(assignee=executor, due_at__year=2026, due_at__month=1).count() == 2
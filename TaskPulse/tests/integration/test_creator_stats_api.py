@@ -0,0 +1,144 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+URL = "/api/tasks/cabinet/creator/stats/by-assignee/"
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def dt(y, m, d, hh=12):
+    return datetime(y, m, d, hh, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def creator():
+    return User.objects.create_user(email="stats_creator@example.com", password="pass12345", role=User.Role.CREATOR)
+
+
+def add_executors(creator: User, count: int, start: int = 0) -> list[User]:
+    """Исполнители с парой задач каждый: одна в работе, одна просроченная (bulk_create)."""
+
+    users = User.objects.bulk_create(
+        [
+            User(email=f"stats_exec_{i}@example.com", full_name=f"Исполнитель {i:04d}", role=User.Role.EXECUTOR)
+            for i in range(start, start + count)
+        ]
+    )
+    Task.objects.bulk_create(
+        [
+            Task(title="Stats", creator=creator, assignee=user, due_at=dt(2026, 1, 12), status=task_status)
+            for user in users
+            for task_status in (Task.Status.IN_PROGRESS, Task.Status.OVERDUE)
+        ]
+    )
+    return users
+
+
+def test_stats_include_status_counters(api_client, creator):
+    executor = User.objects.create_user(email="stats_one@example.com", password="pass12345", full_name="Один")
+    for due, task_status, completed in (
+            (dt(2026, 1, 5), Task.Status.DONE, dt(2026, 1, 4)),
+            (dt(2026, 1, 6), Task.Status.DONE, dt(2026, 1, 7)),
+            (dt(2026, 1, 20), Task.Status.IN_PROGRESS, None),
+            (dt(2026, 1, 2), Task.Status.OVERDUE, None),
+            (dt(2026, 2, 2), Task.Status.NEW, None),
+    ):
+        Task.objects.create(
+            title="S", creator=creator, assignee=executor, due_at=due, status=task_status, completed_at=completed
+        )
+
+    resp = auth(api_client, creator).get(URL, {"month": "2026-01"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["results"] == [
+        {
+            "assignee_id": executor.id,
+            "assignee_email": executor.email,
+            "assignee_name": "Один",
+            "total": 4,
+            "done": 2,
+            "done_on_time": 1,
+            "done_late": 1,
+            "in_progress": 1,
+            "overdue": 1,
+        }
+    ]
+
+
+def test_month_and_week_buckets(api_client, creator):
+    executor = User.objects.create_user(email="stats_buckets@example.com", password="pass12345")
+    for due in (dt(2026, 1, 5), dt(2026, 1, 7), dt(2026, 1, 14), dt(2026, 2, 3)):
+        Task.objects.create(title="B", creator=creator, assignee=executor, due_at=due, status=Task.Status.IN_PROGRESS)
+    client = auth(api_client, creator)
+
+    by_month = client.get(URL, {"bucket": "month"}).data["results"][0]
+    assert by_month["total"] == 4
+    assert [(b["bucket"], b["total"]) for b in by_month["buckets"]] == [("2026-01", 3), ("2026-02", 1)]
+
+    by_week = client.get(URL, {"bucket": "week", "month": "2026-01"}).data["results"][0]
+    assert by_week["in_progress"] == 3
+    assert [(b["bucket"], b["total"]) for b in by_week["buckets"]] == [("2026-01-05", 2), ("2026-01-12", 1)]
+
+
+@pytest.mark.parametrize("params", [{"bucket": "day"}, {"bucket": "week"}])
+def test_bucket_validation(api_client, creator, params):
+    resp = auth(api_client, creator).get(URL, params)
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize("params", [{}, {"month": "2026-01", "bucket": "month"}, {"month": "2026-01", "bucket": "week"}])
+def test_query_count_does_not_grow_with_team(api_client, creator, params):
+    client = auth(api_client, creator)
+
+    def count_queries() -> tuple[int, int]:
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = client.get(URL, params)
+        assert resp.status_code == status.HTTP_200_OK
+        return len(ctx.captured_queries), len(resp.data["results"])
+
+    add_executors(creator, 3)
+    small, small_rows = count_queries()
+
+    add_executors(creator, 60, start=3)
+    large, large_rows = count_queries()
+
+    assert (small_rows, large_rows) == (3, 63)
+    assert large == small
+
+
+def test_second_request_is_served_from_cache(api_client, creator):
+    add_executors(creator, 5)
+    client = auth(api_client, creator)
+    client.get(URL, {"bucket": "month"})
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(URL, {"bucket": "month"})
+
+    assert resp.data["results"][0]["overdue"] == 1
+    assert not any("tasks_taskkpimonthly" in q["sql"] for q in ctx.captured_queries)
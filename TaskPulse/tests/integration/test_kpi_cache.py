@@ -0,0 +1,156 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task, TaskKpiMonthly
+from tasks.services.bulk import bulk_shift_due
+from tasks.services.kpi_cache import creator_stats_key, user_month_key, warm_month
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(email="cache_creator@example.com", password="pass12345", role=User.Role.CREATOR)
+    executor = User.objects.create_user(email="cache_exec@example.com", password="pass12345", role=User.Role.EXECUTOR)
+    task = Task.objects.create(
+        title="Cache",
+        description="",
+        creator=creator,
+        assignee=executor,
+        due_at=datetime(2026, 1, 10, 12, 0, tzinfo=timezone.utc),
+    )
+    return creator, executor, task
+
+
+def monthly(client, executor):
+    return client.get("/api/tasks/reports/monthly/", {"user": executor.id, "month": "2026-01"})
+
+
+@pytest.mark.api
+def test_monthly_report_is_cached_and_invalidated_on_save(
+        api_client, team, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    creator, executor, task = team
+    client = auth(api_client, creator)
+
+    assert monthly(client, executor).data["done"] == 0
+    # повтор: только аутентификация и поиск пользователя, без KPI-запроса
+    with django_assert_num_queries(2):
+        assert monthly(client, executor).data["total"] == 1
+
+    task.refresh_from_db()
+    task.status = Task.Status.DONE
+    with django_capture_on_commit_callbacks(execute=True):
+        task.save()
+
+    assert cache.get(user_month_key(executor.id, 2026, 1)) is None
+    assert monthly(client, executor).data["done"] == 1
+
+
+def test_invalidation_is_precise(team, django_capture_on_commit_callbacks):
+    creator, executor, task = team
+    february = user_month_key(executor.id, 2026, 2)
+    cache.set(february, {"cached": True})
+    cache.set(user_month_key(executor.id, 2026, 1), {"cached": True})
+
+    task.refresh_from_db()
+    task.title = "Другое название"
+    with django_capture_on_commit_callbacks(execute=True):
+        task.save()
+
+    assert cache.get(february) == {"cached": True}
+    assert cache.get(user_month_key(executor.id, 2026, 1)) is None
+
+
+def test_invalidation_waits_for_commit(team, django_capture_on_commit_callbacks):
+    _creator, executor, task = team
+    key = user_month_key(executor.id, 2026, 1)
+    cache.set(key, {"cached": True})
+
+    with django_capture_on_commit_callbacks(execute=False):
+        task.status = Task.Status.DONE
+        task.save()
+        assert cache.get(key) == {"cached": True}
+
+
+def test_bulk_shift_invalidates_old_and_new_month(team, django_capture_on_commit_callbacks):
+    creator, executor, task = team
+    keys = [
+        user_month_key(executor.id, 2026, 1),
+        user_month_key(executor.id, 2026, 2),
+        creator_stats_key(creator.id, None),
+    ]
+    for key in keys:
+        cache.set(key, {"cached": True})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_shift_due([task.pk], timedelta(days=31))
+
+    assert cache.get_many(keys) == {}
+
+
+@pytest.mark.api
+def test_creator_stats_cached_per_month(api_client, team, django_capture_on_commit_callbacks):
+    creator, executor, _task = team
+    client = auth(api_client, creator)
+    url = "/api/tasks/cabinet/creator/stats/by-assignee/"
+
+    assert client.get(url, {"month": "2026-01"}).data["results"][0]["total"] == 1
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.create(
+            title="Ещё", description="", creator=creator, assignee=executor,
+            due_at=datetime(2026, 1, 20, tzinfo=timezone.utc),
+        )
+
+    assert client.get(url, {"month": "2026-01"}).data["results"][0]["total"] == 2
+
+
+def test_warm_month_fills_cache(team):
+    creator, executor, _task = team
+
+    assert warm_month(2026, 1) == 2
+    assert cache.get(user_month_key(executor.id, 2026, 1))["total"] == 1
+    assert cache.get(creator_stats_key(creator.id, datetime(2026, 1, 1).date()))[0]["total"] == 1
+
+
+def test_rebuild_rollup_clears_cached_kpi(team, django_capture_on_commit_callbacks):
+    creator, executor, _task = team
+    # строка, которая после пересчёта исчезнет (ручная правка таблицы)
+    TaskKpiMonthly.objects.create(
+        creator=creator, assignee=executor, month=date(2026, 3, 1), priority=Task.Priority.LOW, total=5
+    )
+    stale = [
+        user_month_key(executor.id, 2026, 1),
+        user_month_key(executor.id, 2026, 3),
+        creator_stats_key(creator.id, None),
+        creator_stats_key(creator.id, date(2026, 1, 1), "week"),
+    ]
+    other = user_month_key(executor.id + 1000, 2026, 1)
+    for key in [*stale, other]:
+        cache.set(key, {"cached": True})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("rebuild_task_kpi", stdout=open("/dev/null", "w"))
+
+    assert cache.get_many(stale) == {}
+    assert cache.get(other) == {"cached": True}
@@ -12,7 +12,7 @@ pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
 
 
 def _aware(y: int, m: int, d: int, hh: int = 0, mm: int = 0) -> dt.datetime:
-    """Timezone-aware datetime для стабильных due_at/updated_at."""
+    """Timezone-aware datetime для стабильных due_at/completed_at."""
 
     return timezone.make_aware(dt.datetime(y, m, d, hh, mm))
 
@@ -85,7 +85,7 @@ def test_monthly_report_json_counts_tasks(api_client):
         status=Task.Status.DONE,
         priority=Task.Priority.MEDIUM,
     )
-    Task.objects.filter(pk=t1.pk).update(updated_at=_aware(2026, 1, 10, 11, 0))
+    Task.objects.filter(pk=t1.pk).update(completed_at=_aware(2026, 1, 10, 11, 0))
 
     t2 = Task.objects.create(
         title="t2",
@@ -96,7 +96,7 @@ def test_monthly_report_json_counts_tasks(api_client):
         status=Task.Status.DONE,
         priority=Task.Priority.MEDIUM,
     )
-    Task.objects.filter(pk=t2.pk).update(updated_at=_aware(2026, 1, 11, 13, 0))
+    Task.objects.filter(pk=t2.pk).update(completed_at=_aware(2026, 1, 11, 13, 0))
 
     resp = client.get("/api/tasks/reports/monthly/?month=2026-01&user=me")
     assert resp.status_code == status.HTTP_200_OK
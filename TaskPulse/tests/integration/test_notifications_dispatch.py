@@ -0,0 +1,191 @@
+from datetime import timedelta
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from integrations import outbox
+from integrations.models import TelegramOutbox, TelegramProfile
+from integrations.tasks import dispatch_telegram_outbox
+from integrations.telegram_client import SendResult
+from tasks.models import Task, TaskMessage
+from tasks.tasks_reminders import send_due_soon_reminders
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(email="notify_c@example.com", password="pass12345", role=User.Role.CREATOR)
+    executor = User.objects.create_user(
+        email="notify_e@example.com", password="pass12345", role=User.Role.EXECUTOR, company=creator.company
+    )
+    TelegramProfile.objects.create(user=creator, telegram_user_id=710001, chat_id=720001)
+    TelegramProfile.objects.create(user=executor, telegram_user_id=710002, chat_id=720002)
+    return creator, executor
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Перехват отправки в Telegram из диспетчера outbox: список chat_id."""
+
+    calls = []
+
+    def fake_send(chat_id, text, reply_markup=None, max_retry_after=None):
+        calls.append(chat_id)
+        return SendResult(ok=True, message_id=len(calls), attempts=1)
+
+    monkeypatch.setattr("integrations.outbox.send_telegram_message", fake_send)
+    return calls
+
+
+def test_assignment_is_written_to_outbox_and_sent_after_commit(team, sent, django_capture_on_commit_callbacks):
+    creator, executor = team
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        task = Task.objects.create(title="После коммита", creator=creator, assignee=executor)
+
+    row = TelegramOutbox.objects.get()
+    assert (row.chat_id, row.status) == (720002, TelegramOutbox.Status.PENDING)
+    assert f"extend_1d:{task.pk}" in str(row.reply_markup)
+    assert sent == []
+
+    for callback in callbacks:
+        callback()
+    assert sent == [720002]
+    row.refresh_from_db()
+    assert (row.status, row.message_id, row.attempts) == (TelegramOutbox.Status.SENT, 1, 1)
+
+
+def test_rolled_back_task_leaves_no_outbox_rows(team, sent, django_capture_on_commit_callbacks):
+    creator, executor = team
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                task = Task.objects.create(title="Откат", creator=creator, assignee=executor)
+                task.status = Task.Status.DONE
+                task.save()
+                raise RuntimeError
+
+    assert not TelegramOutbox.objects.exists()
+    assert sent == []
+
+
+def test_due_soon_reminder_and_mark_are_committed_together(team, sent, monkeypatch):
+    creator, executor = team
+    task = Task.objects.create(
+        title="Напоминание", creator=creator, assignee=executor, due_at=timezone.now() + timedelta(hours=24, minutes=5)
+    )
+    TelegramOutbox.objects.all().delete()
+
+    def failing_save(self, *args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(Task, "save", failing_save)
+
+    with pytest.raises(RuntimeError):
+        send_due_soon_reminders()
+
+    assert not TelegramOutbox.objects.exists()
+    task.refresh_from_db()
+    assert task.reminder_sent_at is None
+
+
+@pytest.mark.api
+def test_chat_message_notifies_other_side(api_client, team, sent, django_capture_on_commit_callbacks):
+    creator, executor = team
+    TelegramProfile.objects.filter(user=executor).update(chat_digest_seconds=0)
+    task = Task.objects.create(title="Чат", creator=creator, assignee=executor)
+    TelegramOutbox.objects.all().delete()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth(api_client, creator).post(
+            "/api/tasks/conversation-messages/",
+            data={"task_id": task.id, "user_id": executor.id, "text": "Привет"},
+            format="json",
+        )
+
+    assert resp.status_code in (status.HTTP_201_CREATED, status.HTTP_200_OK), resp.data
+    assert TaskMessage.objects.filter(task=task).count() == 1
+    assert list(TelegramOutbox.objects.values_list("chat_id", "status")) == [(720002, TelegramOutbox.Status.SENT)]
+    assert sent == [720002]
+
+
+def test_chat_messages_within_window_are_coalesced(team, sent, settings, monkeypatch, django_capture_on_commit_callbacks):
+    settings.TELEGRAM_CHAT_DIGEST_SECONDS = 45
+    creator, executor = team
+    task = Task.objects.create(title="Сводка", creator=creator, assignee=executor)
+    TelegramOutbox.objects.all().delete()
+    etas = []
+    monkeypatch.setattr(dispatch_telegram_outbox, "apply_async", lambda countdown: etas.append(countdown))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for text in ("раз", "два", "три"):
+            TaskMessage.objects.create(task=task, sender=creator, text=text)
+
+    row = TelegramOutbox.objects.get()
+    assert (row.chat_id, row.coalesced, row.status) == (720002, 3, TelegramOutbox.Status.PENDING)
+    assert "3 новых сообщения по задаче" in row.text
+    assert row.text.index("три") > row.text.index("Последнее")
+    assert timedelta(seconds=40) < row.available_at - timezone.now() <= timedelta(seconds=45)
+    assert etas == [45]
+    assert sent == []
+
+    # окно закрыто (строку забрал диспетчер) — следующее сообщение начинает новую сводку
+    TelegramOutbox.objects.update(available_at=timezone.now())
+    outbox.dispatch_batch()
+    TaskMessage.objects.create(task=task, sender=creator, text="четыре")
+
+    assert sent == [720002]
+    assert list(TelegramOutbox.objects.order_by("id").values_list("status", "coalesced")) == [
+        ("sent", 3),
+        ("pending", 1),
+    ]
+    assert "Новое сообщение по задаче" in TelegramOutbox.objects.order_by("id").last().text
+
+
+def test_digest_window_is_per_recipient(team, sent):
+    creator, executor = team
+    task = Task.objects.create(title="Без сводки", creator=creator, assignee=executor)
+    TelegramProfile.objects.filter(user=executor).update(chat_digest_seconds=0)
+    TelegramOutbox.objects.all().delete()
+
+    TaskMessage.objects.create(task=task, sender=creator, text="исполнителю 1")
+    TaskMessage.objects.create(task=task, sender=creator, text="исполнителю 2")
+    TaskMessage.objects.create(task=task, sender=executor, text="создателю 1")
+    TaskMessage.objects.create(task=task, sender=executor, text="создателю 2")
+
+    assert sorted(TelegramOutbox.objects.values_list("chat_id", "coalesced")) == [
+        (720001, 2),
+        (720002, 1),
+        (720002, 1),
+    ]
+
+
+@pytest.mark.api
+def test_user_sets_digest_window_via_profile_api(api_client, team):
+    _creator, executor = team
+    client = auth(api_client, executor)
+
+    resp = client.patch("/api/integrations/telegram/profile/", data={"chat_digest_seconds": 120}, format="json")
+    assert resp.status_code == status.HTTP_200_OK, resp.data
+    assert resp.data["chat_digest_seconds"] == 120
+    assert TelegramProfile.objects.get(user=executor).chat_digest_window == 120
+
+    resp = client.patch("/api/integrations/telegram/profile/", data={"chat_digest_seconds": 5000}, format="json")
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    resp = client.patch("/api/integrations/telegram/profile/", data={"chat_id": 1}, format="json")
+    assert client.get("/api/integrations/telegram/profile/").data["chat_id"] == 720002
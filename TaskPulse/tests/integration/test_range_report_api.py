@@ -0,0 +1,126 @@
+import datetime as dt
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+URL = "/api/tasks/reports/range/"
+
+
+def _aware(y: int, m: int, d: int, hh: int = 0, mm: int = 0) -> dt.datetime:
+    """Timezone-aware datetime для стабильных due_at/completed_at."""
+
+    return timezone.make_aware(dt.datetime(y, m, d, hh, mm))
+
+
+def _auth(api_client, user: User):
+    """Утилита: выставить Authorization: Token <key>."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(email="range_creator@example.com", password="pass12345", role=User.Role.CREATOR)
+    alice = User.objects.create_user(
+        email="range_a@example.com", password="pass12345", full_name="Алиса", role=User.Role.EXECUTOR
+    )
+    boris = User.objects.create_user(email="range_b@example.com", password="pass12345", full_name="Борис")
+    foreign_creator = User.objects.create_user(email="range_foreign@example.com", password="pass12345")
+
+    def task(assignee, due, status_value=Task.Status.NEW, updated=None, creator_user=creator):
+        t = Task.objects.create(
+            title="Range", description="", creator=creator_user, assignee=assignee, due_at=due, status=status_value
+        )
+        if updated is not None:
+            Task.objects.filter(pk=t.pk).update(completed_at=updated)
+        return t
+
+    task(alice, _aware(2026, 1, 5, 12), Task.Status.DONE, updated=_aware(2026, 1, 5, 10))
+    task(alice, _aware(2026, 1, 14, 12), Task.Status.DONE, updated=_aware(2026, 1, 15, 10))
+    task(alice, _aware(2026, 3, 2, 12))
+    task(boris, _aware(2026, 2, 10, 12))
+    task(boris, _aware(2026, 4, 1, 12))  # вне диапазона
+    task(boris, _aware(2026, 1, 20, 12), creator_user=foreign_creator)  # чужой создатель
+    return creator, alice, boris
+
+
+def test_range_report_month_matrix(api_client, team, django_assert_max_num_queries):
+    creator, alice, boris = team
+    client = _auth(api_client, creator)
+
+    with django_assert_max_num_queries(3):
+        resp = client.get(URL, {"from": "2026-01", "to": "2026-03"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["buckets"] == ["2026-01", "2026-02", "2026-03"]
+    assert resp.data["metrics"] == ["total", "done", "done_on_time", "done_late"]
+    assert [a["id"] for a in resp.data["assignees"]] == [alice.id, boris.id]
+    assert resp.data["data"] == [
+        [[2, 2, 1, 1], [0, 0, 0, 0], [1, 0, 0, 0]],
+        [[0, 0, 0, 0], [1, 0, 0, 0], [0, 0, 0, 0]],
+    ]
+
+
+def test_range_report_week_buckets_and_assignee_filter(api_client, team):
+    creator, alice, _boris = team
+
+    resp = _auth(api_client, creator).get(
+        URL, {"from": "2026-01", "to": "2026-01", "group_by": "week", "assignees": str(alice.id)}
+    )
+
+    assert resp.status_code == status.HTTP_200_OK
+    # январь 2026 начинается в четверг — первая неделя с 29.12.2025
+    assert resp.data["buckets"][0] == "2025-12-29"
+    assert len(resp.data["buckets"]) == 5
+    assert [a["id"] for a in resp.data["assignees"]] == [alice.id]
+    row = resp.data["data"][0]
+    assert row[1] == [1, 1, 1, 0]  # неделя 05.01
+    assert row[2] == [1, 1, 0, 1]  # неделя 12.01
+
+
+def test_range_report_csv(api_client, team):
+    creator, alice, _boris = team
+
+    resp = _auth(api_client, creator).get(URL, {"from": "2026-01", "to": "2026-02", "format": "csv"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp["Content-Type"].startswith("text/csv")
+    lines = resp.content.decode("utf-8").strip().splitlines()
+    assert lines[0] == "assignee_id,assignee_email,assignee_name,bucket,total,done,done_on_time,done_late"
+    assert lines[1] == f"{alice.id},{alice.email},Алиса,2026-01,2,2,1,1"
+    assert len(lines) == 1 + 2 * 2
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "2026-01"},
+        {"from": "2026-03", "to": "2026-01"},
+        {"from": "2020-01", "to": "2026-01"},
+        {"from": "2026-01", "to": "2026-02", "group_by": "day"},
+        {"from": "2026-01", "to": "2026-02", "assignees": "x,y"},
+    ],
+)
+def test_range_report_validates_params(api_client, team, params):
+    creator = team[0]
+
+    resp = _auth(api_client, creator).get(URL, params)
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_range_report_requires_creator_role(api_client, team):
+    _creator, alice, _boris = team
+
+    resp = _auth(api_client, alice).get(URL, {"from": "2026-01", "to": "2026-01"})
+
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,118 @@
+import csv
+import io
+
+import pytest
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import ReportJob, Task
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+URL = "/api/tasks/report-jobs/"
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+@pytest.fixture
+def creator():
+    user = User.objects.create_user(email="jobs_creator@example.com", password="pass12345", role=User.Role.CREATOR)
+    executor = User.objects.create_user(email="jobs_exec@example.com", password="pass12345", role=User.Role.EXECUTOR)
+    for i in range(3):
+        Task.objects.create(title=f"Job {i}", description="", creator=user, assignee=executor)
+    return user
+
+
+def test_export_job_builds_artifact(api_client, creator, django_capture_on_commit_callbacks):
+    client = auth(api_client, creator)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = client.post(URL, {"report_type": "tasks_export"}, format="json")
+
+    assert resp.status_code == status.HTTP_202_ACCEPTED, resp.data
+    job = ReportJob.objects.get(pk=resp.data["id"])
+    assert job.status == ReportJob.Status.DONE
+    assert job.progress == 100
+
+    detail = client.get(f"{URL}{job.pk}/")
+    assert detail.status_code == status.HTTP_200_OK
+    assert detail.data["status"] == "done"
+    assert detail.data["download_url"].endswith(".csv")
+
+    with job.file.open("rb") as fh:
+        rows = list(csv.reader(io.StringIO(fh.read().decode("utf-8"))))
+    assert rows[0][:2] == ["id", "title"]
+    assert len(rows) == 1 + 3
+
+
+def test_export_job_builds_xlsx(api_client, creator, django_capture_on_commit_callbacks):
+    openpyxl = pytest.importorskip("openpyxl")
+    client = auth(api_client, creator)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = client.post(URL, {"report_type": "tasks_export", "format": "xlsx"}, format="json")
+
+    assert resp.status_code == status.HTTP_202_ACCEPTED, resp.data
+    job = ReportJob.objects.get(pk=resp.data["id"])
+    assert job.status == ReportJob.Status.DONE
+    assert job.file.name.endswith(".xlsx")
+
+    with job.file.open("rb") as fh:
+        rows = list(openpyxl.load_workbook(io.BytesIO(fh.read()), read_only=True).active.values)
+    assert list(rows[0][:2]) == ["id", "title"]
+    assert len(rows) == 1 + 3
+
+
+def test_identical_request_reuses_job(api_client, creator, django_capture_on_commit_callbacks):
+    client = auth(api_client, creator)
+    payload = {"report_type": "range_kpi", "params": {"from": "2026-01", "to": "2026-03", "assignees": "all"}}
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        first = client.post(URL, payload, format="json")
+        second = client.post(URL, payload, format="json")
+
+    assert first.status_code == status.HTTP_202_ACCEPTED, first.data
+    assert second.status_code == status.HTTP_200_OK
+    assert second.data["id"] == first.data["id"]
+    assert len(callbacks) == 1
+
+    other = client.post(URL, {**payload, "params": {"from": "2026-01", "to": "2026-04"}}, format="json")
+    assert other.status_code == status.HTTP_202_ACCEPTED
+
+
+def test_failed_job_is_not_reused(api_client, creator, monkeypatch, django_capture_on_commit_callbacks):
+    client = auth(api_client, creator)
+
+    def boom(job):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr("tasks.tasks_reports.build_report", boom)
+    with django_capture_on_commit_callbacks(execute=True):
+        first = client.post(URL, {"report_type": "changes_export"}, format="json")
+
+    job = ReportJob.objects.get(pk=first.data["id"])
+    assert job.status == ReportJob.Status.FAILED
+    assert "disk full" in job.error
+
+    again = client.post(URL, {"report_type": "changes_export"}, format="json")
+    assert again.status_code == status.HTTP_202_ACCEPTED
+    assert again.data["id"] != first.data["id"]
+
+
+def test_report_job_validates_params_and_owner(api_client, creator):
+    client = auth(api_client, creator)
+
+    bad = client.post(URL, {"report_type": "range_kpi", "params": {"from": "2026-05", "to": "2026-01"}}, format="json")
+    assert bad.status_code == status.HTTP_400_BAD_REQUEST
+
+    job = ReportJob.objects.create(creator=creator, report_type="tasks_export", params_hash="x")
+    stranger = User.objects.create_user(email="jobs_stranger@example.com", password="pass12345", role=User.Role.CREATOR)
+    resp = auth(api_client, stranger).get(f"{URL}{job.pk}/")
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
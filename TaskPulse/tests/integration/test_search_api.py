@@ -0,0 +1,74 @@
+import pytest
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task, TaskMessage
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+@pytest.fixture
+def board():
+    creator = User.objects.create_user(email="search_creator@example.com", password="pass12345")
+    executor = User.objects.create_user(email="search_exec@example.com", password="pass12345")
+    stranger = User.objects.create_user(email="search_stranger@example.com", password="pass12345")
+    in_title = Task.objects.create(
+        title="Отчёт по продажам", description="Собрать цифры", creator=creator, assignee=executor
+    )
+    in_description = Task.objects.create(
+        title="Квартальные итоги", description="Приложить отчёты отделов", creator=creator, assignee=executor
+    )
+    Task.objects.create(title="Ремонт принтера", description="", creator=creator, assignee=executor)
+    foreign = Task.objects.create(title="Чужой отчёт", description="", creator=stranger)
+    TaskMessage.objects.create(task=in_title, sender=executor, text="Отчёты загружу к вечеру")
+    TaskMessage.objects.create(task=foreign, sender=stranger, text="Отчёт готов")
+    return creator, in_title, in_description, foreign
+
+
+def test_task_search_uses_stemming_and_ranks_title_first(api_client, board):
+    creator, in_title, in_description, _foreign = board
+
+    resp = auth(api_client, creator).get("/api/tasks/", {"search": "отчеты"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    ids = [row["id"] for row in resp.data if row["id"] in (in_title.pk, in_description.pk)]
+    assert ids == [in_title.pk, in_description.pk]
+    assert all("отч" in (row["title"] + row["description"]).lower() for row in resp.data)
+
+
+def test_task_search_respects_explicit_ordering(api_client, board):
+    creator, in_title, in_description, _foreign = board
+
+    resp = auth(api_client, creator).get("/api/tasks/", {"search": "отчет", "ordering": "created_at"})
+
+    ids = [row["id"] for row in resp.data]
+    assert ids.index(in_title.pk) < ids.index(in_description.pk)
+
+
+def test_unified_search_returns_only_visible_tasks_and_messages(api_client, board):
+    creator, in_title, in_description, foreign = board
+
+    resp = auth(api_client, creator).get("/api/search/", {"q": "отчёт"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert [row["id"] for row in resp.data["tasks"]] == [in_title.pk, in_description.pk]
+    assert [row["task_id"] for row in resp.data["messages"]] == [in_title.pk]
+    assert resp.data["messages"][0]["task_title"] == in_title.title
+    assert foreign.pk not in [row["id"] for row in resp.data["tasks"]]
+
+
+def test_unified_search_requires_query(api_client, board):
+    creator = board[0]
+
+    resp = auth(api_client, creator).get("/api/search/")
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.core.management import call_command
+
+from accounts.models import User
+from tasks.models import Task, TaskChangeLog, TaskKpiMonthly
+from tasks.services.bulk import bulk_set_status
+from tasks.services.kpi import calc_user_month_kpi
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def dt(y, m, d, hh=12):
+    return datetime(y, m, d, hh, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(
+        email="completed_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executor = User.objects.create_user(email="completed_exec@example.com", password="pass12345")
+    return creator, executor
+
+
+def make_task(creator, executor, **kwargs):
+    kwargs.setdefault("due_at", dt(2026, 1, 10))
+    return Task.objects.create(title="Done", description="", creator=creator, assignee=executor, **kwargs)
+
+
+def test_completed_at_set_on_done_transition_and_kept_on_later_edits(team):
+    task = make_task(*team)
+    assert task.completed_at is None
+
+    task.status = Task.Status.DONE
+    task.save(update_fields=["status", "updated_at"])
+    task.refresh_from_db()
+    completed_at = task.completed_at
+    assert completed_at is not None
+
+    task.title = "Правка после закрытия"
+    task.save()
+    task.refresh_from_db()
+    assert task.completed_at == completed_at
+
+    task.status = Task.Status.IN_PROGRESS
+    task.save()
+    task.refresh_from_db()
+    assert task.completed_at is None
+
+
+def test_edit_after_deadline_does_not_make_done_task_late(team):
+    creator, executor = team
+    task = make_task(creator, executor, status=Task.Status.DONE, completed_at=dt(2026, 1, 9))
+    assert calc_user_month_kpi(executor, 2026, 1)["done_on_time"] == 1
+
+    # updated_at уходит далеко за дедлайн, completed_at — нет
+    task.executor_comment = "Комментарий спустя месяц"
+    task.save()
+
+    row = TaskKpiMonthly.objects.get(assignee=executor)
+    assert (row.done_on_time, row.done_late) == (1, 0)
+    assert calc_user_month_kpi(executor, 2026, 1)["done_on_time"] == 1
+
+
+def test_bulk_set_status_sets_and_clears_completed_at(team):
+    tasks = [make_task(*team) for _ in range(2)]
+    ids = [t.pk for t in tasks]
+
+    bulk_set_status(ids, Task.Status.DONE)
+    assert Task.objects.filter(pk__in=ids, completed_at__isnull=False).count() == 2
+
+    bulk_set_status(ids[:1], Task.Status.NEW)
+    assert list(Task.objects.filter(pk__in=ids, completed_at__isnull=True).values_list("pk", flat=True)) == ids[:1]
+
+
+def test_backfill_command_uses_status_change_log(team):
+    creator, executor = team
+    logged = make_task(creator, executor)
+    unlogged = make_task(creator, executor)
+    # статус выставлен в обход Task.save — completed_at пуст
+    Task.objects.filter(pk__in=[logged.pk, unlogged.pk]).update(
+        status=Task.Status.DONE, completed_at=None, updated_at=dt(2026, 2, 1)
+    )
+    log = TaskChangeLog.objects.create(task=logged, field="status", old_value="new", new_value="done")
+    TaskChangeLog.objects.filter(pk=log.pk).update(changed_at=dt(2026, 1, 8))
+
+    call_command("backfill_completed_at", batch_size=1, stdout=open("/dev/null", "w"))
+
+    logged.refresh_from_db()
+    unlogged.refresh_from_db()
+    assert logged.completed_at == dt(2026, 1, 8)
+    assert unlogged.completed_at == dt(2026, 2, 1)
+    row = TaskKpiMonthly.objects.get(assignee=executor)
+    assert (row.done, row.done_on_time, row.done_late) == (2, 1, 1)
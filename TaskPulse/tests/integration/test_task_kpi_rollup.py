@@ -0,0 +1,144 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task, TaskKpiMonthly
+from tasks.services.bulk import bulk_reassign, bulk_set_status, bulk_shift_due
+from tasks.services.kpi import calc_user_month_kpi, rollup_user_month_kpi
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+JAN = date(2026, 1, 1)
+FEB = date(2026, 2, 1)
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def dt(y, m, d, hh=12):
+    return datetime(y, m, d, hh, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(
+        email="rollup_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executor = User.objects.create_user(
+        email="rollup_exec@example.com", password="pass12345", full_name="Исполнитель"
+    )
+    return creator, executor
+
+
+def counters(**filters):
+    return {
+        (row.month, row.priority): (row.total, row.done, row.done_on_time, row.done_late)
+        for row in TaskKpiMonthly.objects.filter(**filters)
+    }
+
+
+def make_task(creator, executor, due=dt(2026, 1, 10), **kwargs):
+    return Task.objects.create(title="Rollup", description="", creator=creator, assignee=executor, due_at=due, **kwargs)
+
+
+def test_rollup_follows_task_lifecycle(team):
+    creator, executor = team
+
+    task = make_task(creator, executor, priority=Task.Priority.HIGH)
+    assert counters(assignee=executor) == {(JAN, "high"): (1, 0, 0, 0)}
+
+    task.status = Task.Status.DONE
+    task.save()
+    # закрыта позже дедлайна (completed_at = сейчас)
+    assert counters(assignee=executor) == {(JAN, "high"): (1, 1, 0, 1)}
+
+    Task.objects.filter(pk=task.pk).update(completed_at=dt(2026, 1, 9))
+    assert counters(assignee=executor) == {(JAN, "high"): (1, 1, 1, 0)}
+
+    Task.objects.filter(pk=task.pk).update(due_at=dt(2026, 2, 5), priority=Task.Priority.LOW)
+    assert counters(assignee=executor) == {(FEB, "low"): (1, 1, 1, 0)}
+
+    task.refresh_from_db()
+    task.delete()
+    assert not TaskKpiMonthly.objects.exists()
+
+
+def test_rollup_tracks_reassign_and_null_due(team):
+    creator, executor = team
+    other = User.objects.create_user(email="rollup_other@example.com", password="pass12345")
+
+    task = make_task(creator, executor, due=None)
+    assert counters(assignee=executor) == {(None, "medium"): (1, 0, 0, 0)}
+
+    task.assignee = other
+    task.save()
+    assert counters(assignee=executor) == {}
+    assert counters(assignee=other) == {(None, "medium"): (1, 0, 0, 0)}
+
+    other.delete()  # assignee SET_NULL — задача уходит из KPI
+    assert not TaskKpiMonthly.objects.exists()
+
+
+def test_rollup_follows_bulk_operations(team):
+    creator, executor = team
+    other = User.objects.create_user(email="rollup_bulk@example.com", password="pass12345")
+    tasks = [make_task(creator, executor) for _ in range(3)]
+    ids = [t.pk for t in tasks]
+
+    bulk_shift_due(ids, timedelta(days=30))
+    bulk_set_status(ids[:2], Task.Status.DONE)
+    bulk_reassign(ids[2:], other)
+
+    assert counters(assignee=executor) == {(FEB, "medium"): (2, 2, 0, 2)}
+    assert counters(assignee=other) == {(FEB, "medium"): (1, 0, 0, 0)}
+
+
+def test_rebuild_matches_live_aggregation(team):
+    creator, executor = team
+    make_task(creator, executor, status=Task.Status.DONE)
+    make_task(creator, executor, due=dt(2026, 1, 31, 23), priority=Task.Priority.LOW)
+    before = counters()
+
+    TaskKpiMonthly.objects.all().delete()
+    call_command("rebuild_task_kpi", stdout=open("/dev/null", "w"))
+
+    assert counters() == before
+    assert rollup_user_month_kpi(executor, 2026, 1) == calc_user_month_kpi(executor, 2026, 1)
+
+
+@pytest.mark.api
+def test_stats_by_assignee_reads_rollup(api_client, team, django_assert_max_num_queries):
+    creator, executor = team
+    make_task(creator, executor, status=Task.Status.DONE)
+    make_task(creator, executor, due=dt(2026, 2, 3))
+    client = auth(api_client, creator)
+
+    with django_assert_max_num_queries(3):
+        resp = client.get("/api/tasks/cabinet/creator/stats/by-assignee/", {"month": "2026-01"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["results"] == [
+        {
+            "assignee_id": executor.id,
+            "assignee_email": executor.email,
+            "assignee_name": "Исполнитель",
+            "total": 1,
+            "done": 1,
+            "done_on_time": 0,
+            "done_late": 1,
+            "in_progress": 0,
+            "overdue": 0,
+        }
+    ]
+
+    resp = client.get("/api/tasks/cabinet/creator/stats/by-assignee/")
+    assert resp.data["results"][0]["total"] == 2
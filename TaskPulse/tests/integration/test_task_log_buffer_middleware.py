@@ -0,0 +1,73 @@
+import pytest
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.log_buffer import TaskLogBufferMiddleware
+from tasks.models import Task, TaskChangeLog
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(
+        email="logbuf_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executor = User.objects.create_user(email="logbuf_exec@example.com", password="pass12345")
+    return creator, executor
+
+
+def test_api_update_writes_change_log_after_commit(api_client, team, django_capture_on_commit_callbacks):
+    creator, executor = team
+    task = Task.objects.create(title="Через API", description="", creator=creator, assignee=executor)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth(api_client, creator).patch(
+            f"/api/tasks/{task.id}/", {"priority": Task.Priority.HIGH}, format="json"
+        )
+        assert resp.status_code == status.HTTP_200_OK, resp.content
+        assert not TaskChangeLog.objects.filter(task=task).exists()
+
+    assert list(TaskChangeLog.objects.filter(task=task).values_list("field", flat=True)) == ["priority"]
+
+
+def test_rolled_back_block_discards_its_logs(team, django_capture_on_commit_callbacks):
+    """Откат atomic-блока внутри запроса не оставляет журналов (и не ломает ответ FK-ошибкой)."""
+
+    creator, executor = team
+    kept = Task.objects.create(title="Останется", description="", creator=creator, assignee=executor)
+
+    def view(request):
+        try:
+            with transaction.atomic():
+                doomed = Task.objects.create(title="Откатится", description="", creator=creator)
+                doomed.status = Task.Status.DONE
+                doomed.save()
+                kept.status = Task.Status.IN_PROGRESS
+                kept.save()
+                raise ValueError("откат")
+        except ValueError:
+            pass
+        kept.refresh_from_db()
+        kept.priority = Task.Priority.HIGH
+        kept.save()
+        return HttpResponse("ok")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = TaskLogBufferMiddleware(view)(RequestFactory().post("/"))
+
+    assert response.status_code == 200
+    assert not Task.objects.filter(title="Откатится").exists()
+    assert list(TaskChangeLog.objects.values_list("task_id", "field")) == [(kept.id, "priority")]
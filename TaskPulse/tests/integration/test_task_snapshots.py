@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as dj_timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task, TaskChangeLog, TaskDailySnapshot
+from tasks.services.snapshots import snapshot_day
+from tasks.tasks_reports import snapshot_task_states
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+URL = "/api/tasks/reports/trend/"
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def dt(y, m, d, hh=12):
+    return datetime(y, m, d, hh, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(
+        email="snap_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executor = User.objects.create_user(email="snap_exec@example.com", password="pass12345")
+    return creator, executor
+
+
+def snapshot_rows(day):
+    return {
+        row.assignee_id: (row.open, row.in_progress, row.overdue, row.done)
+        for row in TaskDailySnapshot.objects.filter(day=day)
+    }
+
+
+def log_status(task, old, new, at):
+    log = TaskChangeLog.objects.create(task=task, field="status", old_value=old, new_value=new)
+    TaskChangeLog.objects.filter(pk=log.pk).update(changed_at=at)
+
+
+def test_snapshot_day_counts_current_states_and_is_idempotent(team):
+    creator, executor = team
+    for task_status in (Task.Status.NEW, Task.Status.IN_PROGRESS, Task.Status.OVERDUE, Task.Status.DONE):
+        Task.objects.create(title="S", creator=creator, assignee=executor, status=task_status)
+    Task.objects.create(title="Без исполнителя", creator=creator)
+
+    day = dj_timezone.localdate()
+    assert snapshot_day(day) == 2
+    assert snapshot_day(day) == 2
+
+    assert snapshot_rows(day) == {executor.id: (3, 1, 1, 1), None: (1, 0, 0, 0)}
+
+
+def test_nightly_task_snapshots_previous_day(team):
+    creator, executor = team
+    task = Task.objects.create(title="S", creator=creator, assignee=executor)
+    Task.objects.filter(pk=task.pk).update(created_at=dj_timezone.now() - timedelta(days=2))
+
+    snapshot_task_states()
+
+    assert snapshot_rows(dj_timezone.localdate() - timedelta(days=1)) == {executor.id: (1, 0, 0, 0)}
+
+
+def test_backfill_replays_status_change_log(team):
+    creator, executor = team
+    task = Task.objects.create(title="Replay", creator=creator, assignee=executor, status=Task.Status.DONE)
+    Task.objects.filter(pk=task.pk).update(created_at=dt(2026, 1, 1))
+    TaskChangeLog.objects.filter(task=task).delete()
+    log_status(task, "new", "in_progress", dt(2026, 1, 2))
+    log_status(task, "in_progress", "overdue", dt(2026, 1, 4))
+    log_status(task, "overdue", "done", dt(2026, 1, 5))
+
+    call_command("backfill_task_snapshots", "--from", "2025-12-31", "--to", "2026-01-05", stdout=open("/dev/null", "w"))
+
+    assert snapshot_rows(date(2025, 12, 31)) == {}
+    assert snapshot_rows(date(2026, 1, 1)) == {executor.id: (1, 0, 0, 0)}
+    assert snapshot_rows(date(2026, 1, 3)) == {executor.id: (1, 1, 0, 0)}
+    assert snapshot_rows(date(2026, 1, 4)) == {executor.id: (1, 0, 1, 0)}
+    assert snapshot_rows(date(2026, 1, 5)) == {executor.id: (0, 0, 0, 1)}
+
+
+@pytest.mark.api
+def test_trend_endpoint_reads_only_snapshots(api_client, team):
+    creator, executor = team
+    other = User.objects.create_user(email="snap_other@example.com", password="pass12345")
+    TaskDailySnapshot.objects.bulk_create(
+        [
+            TaskDailySnapshot(day=date(2026, 1, 1), creator=creator, assignee=executor, open=3, in_progress=1),
+            TaskDailySnapshot(day=date(2026, 1, 1), creator=creator, assignee=other, open=2, done=1),
+            TaskDailySnapshot(day=date(2026, 1, 2), creator=creator, assignee=executor, open=2, done=1),
+            TaskDailySnapshot(day=date(2026, 1, 3), creator=other, assignee=executor, open=9),
+        ]
+    )
+    client = auth(api_client, creator)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(URL, {"from": "2026-01-01", "to": "2026-01-31"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["points"] == [
+        {"day": "2026-01-01", "open": 5, "in_progress": 1, "overdue": 0, "done": 1},
+        {"day": "2026-01-02", "open": 2, "in_progress": 0, "overdue": 0, "done": 1},
+    ]
+    assert not any("tasks_task\"" in q["sql"] or "tasks_taskchangelog" in q["sql"] for q in ctx.captured_queries)
+
+    resp = client.get(URL, {"from": "2026-01-01", "to": "2026-01-31", "assignee": other.id})
+    assert [p["open"] for p in resp.data["points"]] == [2]
+
+
+@pytest.mark.api
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"from": "2026-01-05", "to": "2026-01-01"},
+        {"from": "2025-01-01", "to": "2026-06-01"},
+        {"from": "2026-01-01", "to": "2026-01-02", "assignee": "x"},
+    ],
+)
+def test_trend_endpoint_validates_params(api_client, team, params):
+    creator, _executor = team
+
+    resp = auth(api_client, creator).get(URL, params)
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.api
+def test_trend_endpoint_is_for_creators_only(api_client):
+    executor = User.objects.create_user(email="snap_only_exec@example.com", password="pass12345", role=User.Role.EXECUTOR)
+
+    resp = auth(api_client, executor).get(URL, {"from": "2026-01-01", "to": "2026-01-02"})
+
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
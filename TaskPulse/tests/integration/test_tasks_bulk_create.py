@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from integrations.models import TelegramOutbox, TelegramProfile
+from integrations.tasks import dispatch_telegram_outbox
+from tasks.models import Task, TaskChangeLog
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def make_team(size: int) -> tuple[User, list[User]]:
+    creator = User.objects.create_user(
+        email="bulk_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executors = []
+    for i in range(size):
+        executor = User.objects.create_user(
+            email=f"bulk_exec{i}@example.com", password="pass12345", role=User.Role.EXECUTOR
+        )
+        TelegramProfile.objects.create(user=executor, telegram_user_id=500000 + i, chat_id=600000 + i)
+        executors.append(executor)
+    return creator, executors
+
+
+def payload(executors: list[User], count: int) -> list[dict]:
+    return [
+        {
+            "title": f"Bulk {i}",
+            "priority": Task.Priority.HIGH,
+            "assignee": executors[i % len(executors)].id,
+            "due_at": "2026-02-01T10:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def test_bulk_create_inserts_tasks_and_notifies_once(api_client, monkeypatch, django_capture_on_commit_callbacks):
+    creator, executors = make_team(3)
+    kicks = []
+    monkeypatch.setattr(dispatch_telegram_outbox, "delay", lambda: kicks.append(1))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = auth(api_client, creator).post("/api/tasks/bulk/", data=payload(executors, 6), format="json")
+
+    assert resp.status_code == status.HTTP_201_CREATED, resp.data
+    assert resp.data["count"] == 6
+    assert Task.objects.filter(creator=creator, title__startswith="Bulk").count() == 6
+    assert len(kicks) == 1
+    assert sorted(TelegramOutbox.objects.values_list("chat_id", flat=True)) == sorted(
+        [e.telegram_profile.chat_id for e in executors] * 2
+    )
+    assert not TaskChangeLog.objects.exists()
+
+
+def test_bulk_create_sets_completed_at_for_done_items(api_client):
+    creator, executors = make_team(1)
+    items = payload(executors, 2)
+    items[0]["status"] = Task.Status.DONE
+
+    resp = auth(api_client, creator).post("/api/tasks/bulk/", data=items, format="json")
+
+    assert resp.status_code == status.HTTP_201_CREATED, resp.data
+    done, new = Task.objects.filter(pk__in=resp.data["ids"]).order_by("id")
+    assert done.status == Task.Status.DONE and done.completed_at is not None
+    assert new.completed_at is None
+
+
+def test_bulk_create_query_count_does_not_grow(api_client):
+    creator, executors = make_team(3)
+    client = auth(api_client, creator)
+
+    with CaptureQueriesContext(connection) as small:
+        client.post("/api/tasks/bulk/", data=payload(executors, 3), format="json")
+    with CaptureQueriesContext(connection) as large:
+        client.post("/api/tasks/bulk/", data=payload(executors, 60), format="json")
+
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+
+def test_bulk_create_is_all_or_nothing(api_client):
+    creator, executors = make_team(1)
+    items = payload(executors, 2)
+    items[1]["assignee"] = 999999
+
+    resp = auth(api_client, creator).post("/api/tasks/bulk/", data={"tasks": items}, format="json")
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert "assignee" in resp.data[1]
+    assert not Task.objects.filter(creator=creator).exists()
+
+
+def test_bulk_create_rejects_empty_payload(api_client):
+    creator, _executors = make_team(0)
+
+    resp = auth(api_client, creator).post("/api/tasks/bulk/", data=[], format="json")
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from integrations.models import TelegramOutbox, TelegramProfile
+from integrations.tasks import dispatch_telegram_outbox
+from tasks.models import Task, TaskChangeLog, TaskTombstone
+from tasks.services.bulk import bulk_reassign, bulk_set_status, bulk_shift_due
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def make_board(count: int):
+    creator = User.objects.create_user(
+        email="bulkupd_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executor = User.objects.create_user(
+        email="bulkupd_exec@example.com", password="pass12345", role=User.Role.EXECUTOR
+    )
+    tasks = [
+        Task.objects.create(
+            title=f"Board {i}",
+            description="",
+            creator=creator,
+            assignee=executor,
+            due_at=datetime(2026, 1, 10, 12, 0, tzinfo=timezone.utc),
+        )
+        for i in range(count)
+    ]
+    return creator, executor, tasks
+
+
+def test_bulk_set_status_logs_and_skips_unchanged():
+    creator, _executor, tasks = make_board(3)
+    Task.objects.filter(pk=tasks[0].pk).update(status=Task.Status.DONE)
+
+    updated = bulk_set_status([t.pk for t in tasks], Task.Status.DONE, changed_by=creator)
+
+    assert sorted(updated) == sorted(t.pk for t in tasks[1:])
+    assert Task.objects.filter(status=Task.Status.DONE).count() == 3
+    logs = TaskChangeLog.objects.filter(field="status")
+    assert logs.count() == 2
+    assert {(log.old_value, log.new_value, log.changed_by_id) for log in logs} == {
+        (Task.Status.NEW, Task.Status.DONE, creator.id)
+    }
+
+
+def test_bulk_set_status_query_count_does_not_grow():
+    _creator, _executor, tasks = make_board(12)
+
+    with CaptureQueriesContext(connection) as small:
+        bulk_set_status([t.pk for t in tasks[:2]], Task.Status.IN_PROGRESS)
+    with CaptureQueriesContext(connection) as large:
+        bulk_set_status([t.pk for t in tasks[2:]], Task.Status.IN_PROGRESS)
+
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+
+def test_bulk_set_done_notifies_creator_in_one_batch(monkeypatch, django_capture_on_commit_callbacks):
+    creator, _executor, tasks = make_board(3)
+    TelegramProfile.objects.create(user=creator, telegram_user_id=710001, chat_id=710001)
+    kicks = []
+    monkeypatch.setattr(dispatch_telegram_outbox, "delay", lambda: kicks.append(1))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_set_status([t.pk for t in tasks], Task.Status.DONE)
+
+    assert len(kicks) == 1
+    assert list(TelegramOutbox.objects.values_list("chat_id", flat=True)) == [710001] * 3
+
+
+def test_bulk_reassign_writes_tombstones_for_old_assignee():
+    creator, executor, tasks = make_board(2)
+    other = User.objects.create_user(email="bulkupd_other@example.com", password="pass12345")
+
+    updated = bulk_reassign([t.pk for t in tasks], other, changed_by=creator)
+
+    assert sorted(updated) == sorted(t.pk for t in tasks)
+    assert Task.objects.filter(assignee=other).count() == 2
+    assert TaskTombstone.objects.filter(user_id=executor.id).count() == 2
+    assert TaskChangeLog.objects.filter(field="assignee", new_value=str(other.id)).count() == 2
+
+
+def test_bulk_shift_due_moves_deadline_and_touches_updated_at():
+    _creator, _executor, tasks = make_board(2)
+    before = {t.pk: t.updated_at for t in tasks}
+
+    bulk_shift_due([t.pk for t in tasks], timedelta(days=2))
+
+    for task in Task.objects.filter(pk__in=before):
+        assert task.due_at == datetime(2026, 1, 12, 12, 0, tzinfo=timezone.utc)
+        assert task.updated_at > before[task.pk]
+
+
+@pytest.mark.api
+def test_bulk_update_api_only_touches_own_tasks(api_client):
+    creator, executor, tasks = make_board(2)
+    stranger = User.objects.create_user(email="bulkupd_stranger@example.com", password="pass12345")
+    foreign = Task.objects.create(title="Foreign", description="", creator=stranger, assignee=executor)
+
+    resp = auth(api_client, creator).post(
+        "/api/tasks/bulk-update/",
+        data={"ids": [tasks[0].pk, foreign.pk], "operation": "set_status", "status": "done"},
+        format="json",
+    )
+
+    assert resp.status_code == status.HTTP_200_OK, resp.data
+    assert resp.data["updated"] == [tasks[0].pk]
+    assert resp.data["skipped"] == [foreign.pk]
+    foreign.refresh_from_db()
+    assert foreign.status == Task.Status.NEW
+
+
+@pytest.mark.api
+def test_bulk_update_api_validates_operation_params(api_client):
+    creator, _executor, tasks = make_board(1)
+
+    resp = auth(api_client, creator).post(
+        "/api/tasks/bulk-update/",
+        data={"ids": [tasks[0].pk], "operation": "shift_due"},
+        format="json",
+    )
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert "days" in resp.data
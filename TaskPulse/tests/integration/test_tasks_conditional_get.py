@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task, TaskMessage
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def create_pair():
+    creator = User.objects.create_user(
+        email="etag_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executor = User.objects.create_user(
+        email="etag_exec@example.com", password="pass12345", role=User.Role.EXECUTOR
+    )
+    task = Task.objects.create(title="ETag", description="", creator=creator, assignee=executor)
+    return creator, executor, task
+
+
+def test_tasks_list_returns_304_when_unchanged(api_client):
+    creator, _executor, _task = create_pair()
+    client = auth(api_client, creator)
+
+    first = client.get("/api/tasks/")
+    assert first.status_code == status.HTTP_200_OK
+    etag = first["ETag"]
+    # у списков только ETag: Max(updated_at) не меняется при удалении задачи
+    assert "Last-Modified" not in first
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second["ETag"] == etag
+    task_selects = [q["sql"] for q in ctx.captured_queries if 'FROM "tasks_task"' in q["sql"]]
+    # только агрегат count/max, без выборки строк задач
+    assert len(task_selects) == 1
+    assert "COUNT(" in task_selects[0]
+
+
+def test_tasks_list_etag_changes_after_update(api_client):
+    creator, _executor, task = create_pair()
+    client = auth(api_client, creator)
+
+    etag = client.get("/api/tasks/")["ETag"]
+    task.title = "ETag changed"
+    task.save()
+
+    resp = client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp["ETag"] != etag
+
+
+def test_tasks_list_ignores_if_modified_since_after_delete(api_client):
+    creator, executor, _task = create_pair()
+    Task.objects.create(title="Уйдёт", description="", creator=creator, assignee=executor)
+    client = auth(api_client, creator)
+    assert len(client.get("/api/tasks/").data) == 2
+
+    Task.objects.filter(title="Уйдёт").delete()
+    since = http_date((timezone.now() + timedelta(minutes=1)).timestamp())
+    resp = client.get("/api/tasks/", HTTP_IF_MODIFIED_SINCE=since)
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert len(resp.data) == 1
+
+
+def test_expanded_list_etag_changes_after_log_only_write(api_client, django_capture_on_commit_callbacks):
+    """confirm_on_time пишет только журнал (updated_at не меняется) — ?expand=changes не должен дать 304."""
+
+    _creator, executor, task = create_pair()
+    client = auth(api_client, executor)
+    url = "/api/tasks/?expand=changes"
+    detail_url = f"/api/tasks/{task.id}/?expand=changes"
+    etag = client.get(url)["ETag"]
+    detail_etag = client.get(detail_url)["ETag"]
+    plain_etag = client.get("/api/tasks/")["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        confirm = client.post(f"/api/tasks/{task.id}/confirm-on-time/", {"comment": "успею"}, format="json")
+    assert confirm.status_code == status.HTTP_200_OK, confirm.data
+
+    resp = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == status.HTTP_200_OK
+    assert [change["field"] for change in resp.data[0]["changes"]] == ["confirm_on_time"]
+    assert client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code == status.HTTP_200_OK
+    # без expand журнал в ответе не участвует — список по-прежнему актуален
+    assert client.get("/api/tasks/", HTTP_IF_NONE_MATCH=plain_etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_tasks_list_etag_depends_on_query(api_client):
+    creator, _executor, _task = create_pair()
+    client = auth(api_client, creator)
+
+    etag = client.get("/api/tasks/")["ETag"]
+    resp = client.get("/api/tasks/?fields=id,title", HTTP_IF_NONE_MATCH=etag)
+
+    assert resp.status_code == status.HTTP_200_OK
+
+
+def test_task_detail_returns_304_when_unchanged(api_client):
+    creator, _executor, task = create_pair()
+    client = auth(api_client, creator)
+
+    first = client.get(f"/api/tasks/{task.id}/")
+    resp = client.get(f"/api/tasks/{task.id}/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    # у одной задачи Last-Modified остаётся: удалённая задача даёт 404, а не 304
+    assert first["Last-Modified"]
+
+
+def test_task_detail_foreign_task_is_not_conditional(api_client):
+    """Чужая задача не даёт 304 и не раскрывает валидаторы."""
+
+    _creator, _executor, task = create_pair()
+    stranger = User.objects.create_user(email="etag_stranger@example.com", password="pass12345")
+
+    resp = auth(api_client, stranger).get(f"/api/tasks/{task.id}/", HTTP_IF_NONE_MATCH="*")
+
+    assert resp.status_code in (status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND)
+    assert "ETag" not in resp
+
+
+def test_executor_cabinet_returns_304_when_unchanged(api_client):
+    _creator, executor, _task = create_pair()
+    client = auth(api_client, executor)
+
+    etag = client.get("/api/tasks/cabinet/executor/tasks/")["ETag"]
+    resp = client.get("/api/tasks/cabinet/executor/tasks/", HTTP_IF_NONE_MATCH=etag)
+
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_conversation_messages_returns_304_until_new_message(api_client):
+    creator, executor, task = create_pair()
+    client = auth(api_client, creator)
+    TaskMessage.objects.create(task=task, sender=creator, text="hi")
+    url = f"/api/tasks/conversation-messages/?user_id={executor.id}"
+
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    TaskMessage.objects.create(task=task, sender=executor, text="hello")
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
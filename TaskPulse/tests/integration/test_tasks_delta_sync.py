@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task, TaskTombstone
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def make_users():
+    creator = User.objects.create_user(
+        email="sync_creator@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    executor = User.objects.create_user(
+        email="sync_exec@example.com", password="pass12345", role=User.Role.EXECUTOR
+    )
+    other = User.objects.create_user(
+        email="sync_other@example.com", password="pass12345", role=User.Role.EXECUTOR
+    )
+    return creator, executor, other
+
+
+def create_task(creator: User, assignee: User | None, title: str = "Sync") -> Task:
+    return Task.objects.create(title=title, description="", creator=creator, assignee=assignee)
+
+
+def age_tasks(*tasks: Task, by: timedelta = timedelta(minutes=10)) -> None:
+    """Сдвигаем updated_at в прошлое, чтобы задачи оказались «до курсора»."""
+
+    for task in tasks:
+        Task.objects.filter(pk=task.pk).update(updated_at=task.updated_at - by)
+
+
+def test_changes_without_since_returns_visible_snapshot(api_client):
+    creator, executor, other = make_users()
+    mine = create_task(creator, executor)
+    create_task(other, other, title="Чужая")
+
+    resp = auth(api_client, executor).get("/api/tasks/changes/")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert [t["id"] for t in resp.data["tasks"]] == [mine.id]
+    assert resp.data["deleted"] == []
+    assert resp.data["cursor"]
+
+
+def test_changes_since_returns_only_updated_tasks(api_client):
+    creator, executor, _other = make_users()
+    old = create_task(creator, executor, title="Old")
+    fresh = create_task(creator, executor, title="Fresh")
+    age_tasks(old, fresh)
+    client = auth(api_client, creator)
+
+    cursor = client.get("/api/tasks/changes/").data["cursor"]
+    fresh.title = "Fresh updated"
+    fresh.save()
+
+    resp = client.get("/api/tasks/changes/", {"since": cursor})
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert [t["id"] for t in resp.data["tasks"]] == [fresh.id]
+
+
+def test_changes_reports_deleted_tasks(api_client):
+    creator, executor, _other = make_users()
+    task = create_task(creator, executor)
+    age_tasks(task)
+    client = auth(api_client, executor)
+    cursor = client.get("/api/tasks/changes/").data["cursor"]
+
+    task_id = task.id
+    task.delete()
+
+    resp = client.get("/api/tasks/changes/", {"since": cursor})
+
+    assert resp.data["tasks"] == []
+    assert resp.data["deleted"] == [{"id": task_id, "reason": TaskTombstone.Reason.DELETED}]
+
+
+def test_changes_reports_lost_visibility_after_reassignment(api_client):
+    creator, executor, other = make_users()
+    task = create_task(creator, executor)
+    age_tasks(task)
+    client = auth(api_client, executor)
+    cursor = client.get("/api/tasks/changes/").data["cursor"]
+
+    task.assignee = other
+    task.save()
+
+    resp = client.get("/api/tasks/changes/", {"since": cursor})
+
+    assert resp.data["tasks"] == []
+    assert resp.data["deleted"] == [{"id": task.id, "reason": TaskTombstone.Reason.UNASSIGNED}]
+
+
+def test_changes_invalid_since_returns_400(api_client):
+    creator, _executor, _other = make_users()
+
+    resp = auth(api_client, creator).get("/api/tasks/changes/", {"since": "yesterday"})
+
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
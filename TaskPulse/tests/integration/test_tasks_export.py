@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task
+from tasks.services import export as export_service
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+URL = "/api/tasks/export/"
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+@pytest.fixture
+def board():
+    creator = User.objects.create_user(email="export_creator@example.com", password="pass12345", role=User.Role.CREATOR)
+    executor = User.objects.create_user(email="export_exec@example.com", password="pass12345", role=User.Role.EXECUTOR)
+    other = User.objects.create_user(email="export_other@example.com", password="pass12345", role=User.Role.CREATOR)
+    tasks = [
+        Task.objects.create(title=f"Выгрузка {i}", description="", creator=creator, assignee=executor)
+        for i in range(5)
+    ]
+    Task.objects.create(title="Чужая", description="", creator=other)
+    tasks[0].status = Task.Status.DONE
+    tasks[0].save()
+    return creator, executor, tasks
+
+
+def read_stream(resp) -> str:
+    assert resp.streaming
+    return b"".join(resp.streaming_content).decode("utf-8")
+
+
+def test_export_csv_streams_only_own_tasks(api_client, board, monkeypatch):
+    creator, executor, tasks = board
+    monkeypatch.setattr(export_service, "EXPORT_CHUNK_SIZE", 2)
+
+    resp = auth(api_client, creator).get(URL)
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp["Content-Type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(read_stream(resp))))
+    assert [int(row["id"]) for row in rows] == [t.pk for t in tasks]
+    assert rows[0]["status"] == Task.Status.DONE
+    assert rows[0]["assignee_email"] == executor.email
+
+
+def test_export_ndjson_with_changes(api_client, board):
+    creator, _executor, tasks = board
+
+    resp = auth(api_client, creator).get(URL, {"format": "ndjson", "include": "changes"})
+
+    assert resp.status_code == status.HTTP_200_OK
+    records = [json.loads(line) for line in read_stream(resp).splitlines()]
+    assert [record["id"] for record in records] == [t.pk for t in tasks]
+    assert records[0]["id"] == tasks[0].pk
+    assert (records[0]["change_field"], records[0]["change_new_value"]) == ("status", Task.Status.DONE)
+
+
+def test_export_with_changes_keeps_never_edited_tasks(api_client, board):
+    creator, _executor, tasks = board
+    tasks[0].priority = Task.Priority.HIGH
+    tasks[0].save()
+
+    resp = auth(api_client, creator).get(URL, {"include": "changes"})
+
+    rows = list(csv.DictReader(io.StringIO(read_stream(resp))))
+    assert [(int(row["id"]), row["change_field"]) for row in rows[:2]] == [
+        (tasks[0].pk, "status"),
+        (tasks[0].pk, "priority"),
+    ]
+    untouched = rows[2]
+    assert int(untouched["id"]) == tasks[1].pk
+    assert untouched["title"] == tasks[1].title
+    assert all(untouched[name] == "" for name in ("change_id", "change_field", "change_at", "changed_by_id"))
+    assert len(rows) == 2 + 4
+
+
+def test_export_header_is_sent_before_rows_are_fetched(api_client, board):
+    """Первый байт уходит до запроса к БД; строки читаются одним запросом по мере отдачи."""
+
+    creator = board[0]
+    resp = auth(api_client, creator).get(URL)
+    chunks = iter(resp.streaming_content)
+
+    with CaptureQueriesContext(connection) as before:
+        header = next(chunks)
+    with CaptureQueriesContext(connection) as rest:
+        body = b"".join(chunks)
+
+    assert header.startswith(b"id,title,")
+    assert before.captured_queries == []
+    assert len(rest.captured_queries) == 1
+    assert body.count(b"\r\n") == 5
+
+
+def test_export_requires_creator_role(api_client, board):
+    _creator, executor, _tasks = board
+
+    resp = auth(api_client, executor).get(URL)
+
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,136 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task
+from tasks.pagination import TaskKeysetPagination
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def create_tasks(creator: User, assignee: User, count: int, **extra) -> list[Task]:
+    """Создаём пачку задач для листания."""
+
+    return [
+        Task.objects.create(
+            title=f"Task {i}",
+            description="",
+            creator=creator,
+            assignee=assignee,
+            **extra,
+        )
+        for i in range(count)
+    ]
+
+
+def collect_pages(client, url: str) -> tuple[list[int], int]:
+    """Проходит все страницы по ссылкам next, возвращает (ids, число страниц)."""
+
+    ids: list[int] = []
+    pages = 0
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == status.HTTP_200_OK, resp.data
+        ids.extend(item["id"] for item in resp.data["results"])
+        url = resp.data["next"]
+        pages += 1
+    return ids, pages
+
+
+def test_tasks_list_without_page_size_is_plain_list(api_client):
+    """Без cursor/page_size ответ остаётся списком (контракт фронтенда)."""
+
+    creator = User.objects.create_user(email="pg_plain@example.com", password="pass12345")
+    create_tasks(creator, creator, 3)
+
+    resp = auth(api_client, creator).get("/api/tasks/")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert isinstance(resp.data, list)
+    assert len(resp.data) == 3
+
+
+def test_tasks_list_cursor_walks_all_rows_once(api_client):
+    """Листание по next отдаёт каждую задачу ровно один раз в порядке -updated_at, -id."""
+
+    creator = User.objects.create_user(email="pg_walk@example.com", password="pass12345")
+    tasks = create_tasks(creator, creator, 7)
+    # одинаковый updated_at — порядок должен держаться на id
+    Task.objects.filter(pk__in=[t.pk for t in tasks]).update(updated_at=tasks[0].updated_at)
+
+    ids, pages = collect_pages(auth(api_client, creator), "/api/tasks/?page_size=3")
+
+    assert pages == 3
+    assert ids == sorted((t.pk for t in tasks), reverse=True)
+
+
+def test_tasks_list_cursor_with_nullable_ordering(api_client):
+    """Сортировка по due_at (есть NULL) не теряет и не дублирует строки."""
+
+    creator = User.objects.create_user(email="pg_due@example.com", password="pass12345")
+    with_due = create_tasks(creator, creator, 3, due_at="2026-01-10T12:00:00Z")
+    without_due = create_tasks(creator, creator, 2)
+
+    ids, _ = collect_pages(auth(api_client, creator), "/api/tasks/?ordering=due_at&page_size=2")
+
+    assert ids == [t.pk for t in with_due] + [t.pk for t in without_due]
+
+
+def test_not_null_ordering_omits_nulls_last_and_uses_index(api_client):
+    """-updated_at (NOT NULL) без NULLS LAST — обратный проход по idx_task_updated_id без Sort."""
+
+    creator = User.objects.create_user(email="pg_idx@example.com", password="pass12345")
+    create_tasks(creator, creator, 3)
+    client = auth(api_client, creator)
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get("/api/tasks/?page_size=2").status_code == status.HTTP_200_OK
+    page_sql = [q["sql"] for q in ctx.captured_queries if 'ORDER BY "tasks_task"."updated_at" DESC' in q["sql"]]
+    assert page_sql and "NULLS LAST" not in page_sql[0]
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get("/api/tasks/?ordering=due_at&page_size=2").status_code == status.HTTP_200_OK
+    assert any('"tasks_task"."due_at" ASC NULLS LAST' in q["sql"] for q in ctx.captured_queries)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    paginator = TaskKeysetPagination()
+    paginator.model, paginator.field, paginator.descending = Task, "updated_at", True
+    plan = Task.objects.order_by(*paginator._order_by())[:51].explain()
+    assert "idx_task_updated_id" in plan
+    assert "Sort" not in plan
+
+
+def test_tasks_list_invalid_cursor_returns_404(api_client):
+    creator = User.objects.create_user(email="pg_bad@example.com", password="pass12345")
+
+    resp = auth(api_client, creator).get("/api/tasks/?cursor=not-a-cursor")
+
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_creator_cabinet_tasks_paginated(api_client):
+    """Кабинет создателя поддерживает ту же пагинацию."""
+
+    creator = User.objects.create_user(
+        email="pg_cab@example.com", password="pass12345", role=User.Role.CREATOR
+    )
+    tasks = create_tasks(creator, None, 5)
+
+    ids, pages = collect_pages(
+        auth(api_client, creator), "/api/tasks/cabinet/creator/tasks/?page_size=2"
+    )
+
+    assert pages == 3
+    assert sorted(ids) == sorted(t.pk for t in tasks)
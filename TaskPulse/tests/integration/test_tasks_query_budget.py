@@ -0,0 +1,76 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task, TaskAttachment
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def create_tasks_with_results(creator: User, count: int) -> list[Task]:
+    """Задачи, у каждой по общему вложению и по два файла-результата."""
+
+    tasks = []
+    for i in range(count):
+        task = Task.objects.create(title=f"Budget {i}", description="", creator=creator, assignee=creator)
+        for kind, name in (
+                (TaskAttachment.Kind.GENERAL, "general.txt"),
+                (TaskAttachment.Kind.RESULT, "old_result.txt"),
+                (TaskAttachment.Kind.RESULT, "result.txt"),
+        ):
+            TaskAttachment.objects.create(
+                task=task,
+                kind=kind,
+                uploaded_by=creator,
+                file=SimpleUploadedFile(name=name, content=b"x", content_type="text/plain"),
+            )
+        tasks.append(task)
+    return tasks
+
+
+def count_list_queries(client) -> tuple[int, list]:
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get("/api/tasks/")
+    assert resp.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries), resp.data
+
+
+def test_tasks_list_query_count_does_not_grow_with_tasks(api_client):
+    """Число запросов списка задач не зависит от количества задач (result_file без N+1)."""
+
+    creator = User.objects.create_user(email="budget@example.com", password="pass12345")
+    client = auth(api_client, creator)
+
+    create_tasks_with_results(creator, 2)
+    small, _ = count_list_queries(client)
+
+    create_tasks_with_results(creator, 8)
+    large, data = count_list_queries(client)
+
+    assert len(data) == 10
+    assert large == small
+
+
+def test_result_file_is_latest_result_attachment(api_client):
+    """result_file указывает на последний файл-результат, а не на общее вложение."""
+
+    creator = User.objects.create_user(email="budget_latest@example.com", password="pass12345")
+    (task,) = create_tasks_with_results(creator, 1)
+    latest = task.attachments.filter(kind=TaskAttachment.Kind.RESULT).order_by("-created_at").first()
+
+    resp = auth(api_client, creator).get(f"/api/tasks/{task.id}/")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["result_file"] == latest.file.url
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from tasks.models import Task
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration, pytest.mark.api]
+
+
+def auth(api_client, user: User):
+    """Авторизация APIClient через TokenAuthentication."""
+
+    token, _ = Token.objects.get_or_create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def create_task(creator: User, **extra) -> Task:
+    return Task.objects.create(
+        title="Sparse",
+        description="Очень длинное описание " * 50,
+        creator=creator,
+        assignee=creator,
+        **extra,
+    )
+
+
+def task_queries(ctx) -> list[str]:
+    """SQL-запросы к таблицам задач (без запросов авторизации)."""
+
+    return [q["sql"] for q in ctx.captured_queries if '"tasks_' in q["sql"]]
+
+
+def test_fields_param_limits_response_and_columns(api_client):
+    """?fields= отдаёт только запрошенные поля и не читает description и связи."""
+
+    creator = User.objects.create_user(email="sparse@example.com", password="pass12345")
+    create_task(creator)
+    client = auth(api_client, creator)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get("/api/tasks/?fields=id,title,status,due_at")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert set(resp.data[0].keys()) == {"id", "title", "status", "due_at"}
+
+    # агрегат для ETag не в счёт — проверяем выборку строк
+    sql = [q for q in task_queries(ctx) if "COUNT(" not in q]
+    assert len(sql) == 1
+    assert '"description"' not in sql[0]
+    assert "accounts_user" not in sql[0]
+
+
+def test_default_list_does_not_load_changes_and_actions(api_client):
+    """Без ?expand= журналы изменений и действий не подгружаются."""
+
+    creator = User.objects.create_user(email="sparse_default@example.com", password="pass12345")
+    create_task(creator)
+    client = auth(api_client, creator)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get("/api/tasks/")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert "changes" not in resp.data[0]
+    sql = " ".join(task_queries(ctx))
+    assert "tasks_taskchangelog" not in sql
+    assert "tasks_taskactionlog" not in sql
+
+
+def test_expand_changes_renders_change_log(api_client):
+    creator = User.objects.create_user(email="sparse_expand@example.com", password="pass12345")
+    task = create_task(creator)
+    task.status = Task.Status.IN_PROGRESS
+    task.save()
+
+    resp = auth(api_client, creator).get(f"/api/tasks/{task.id}/?fields=id,status&expand=changes")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert set(resp.data.keys()) == {"id", "status", "changes"}
+    assert resp.data["changes"][0]["field"] == "status"
+    assert resp.data["changes"][0]["new_value"] == Task.Status.IN_PROGRESS
+
+
+def test_unknown_fields_return_400(api_client):
+    creator = User.objects.create_user(email="sparse_bad@example.com", password="pass12345")
+    client = auth(api_client, creator)
+
+    assert client.get("/api/tasks/?fields=id,password").status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get("/api/tasks/?expand=creator").status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_confirm_on_time_loads_only_permission_columns(api_client):
+    """confirm-on-time не тянет описание задачи и связанные таблицы."""
+
+    creator = User.objects.create_user(email="sparse_confirm@example.com", password="pass12345")
+    task = create_task(creator)
+    client = auth(api_client, creator)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post(f"/api/tasks/{task.id}/confirm-on-time/", data={}, format="json")
+
+    assert resp.status_code == status.HTTP_200_OK
+    select_task = [q for q in task_queries(ctx) if q.startswith("SELECT") and 'FROM "tasks_task"' in q]
+    assert len(select_task) == 1
+    assert '"description"' not in select_task[0]
+    sql = " ".join(task_queries(ctx))
+    assert "tasks_taskattachment" not in sql
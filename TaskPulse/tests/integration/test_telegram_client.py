@@ -0,0 +1,136 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from integrations import telegram_client
+from integrations.telegram_client import TelegramClient, get_telegram_client
+from integrations.utils_telegram import send_telegram_message
+
+pytestmark = [pytest.mark.integration]
+
+
+class StubBotApi(BaseHTTPRequestHandler):
+    """Заглушка Bot API: отвечает по очереди из server.replies, запоминает запросы."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.seen.append({"path": self.path, "body": body, "port": self.client_address[1]})
+        status, reply = self.server.replies.pop(0) if self.server.replies else (
+            200, {"ok": True, "result": {"message_id": len(self.server.seen)}}
+        )
+        data = json.dumps(reply).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubBotApi)
+    server.seen, server.replies = [], []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(telegram_client.time, "sleep", calls.append)
+    return calls
+
+
+def _client(server, **kwargs) -> TelegramClient:
+    return TelegramClient(token="T", base_url=f"http://127.0.0.1:{server.server_port}/", **kwargs)
+
+
+def test_messages_reuse_one_pooled_connection(stub):
+    client = _client(stub)
+
+    results = [client.send_message(42, f"msg {i}") for i in range(3)]
+
+    assert [r.message_id for r in results] == [1, 2, 3]
+    assert all(r.ok and r.attempts == 1 and r.error is None for r in results)
+    assert stub.seen[0]["path"] == "/botT/sendMessage"
+    assert stub.seen[0]["body"] == {"chat_id": 42, "text": "msg 0", "parse_mode": "HTML"}
+    assert len({req["port"] for req in stub.seen}) == 1
+
+
+def test_rate_limit_waits_retry_after(stub, sleeps):
+    stub.replies = [(429, {"ok": False, "description": "Too Many Requests", "parameters": {"retry_after": 3}})]
+
+    result = _client(stub).send_message(42, "hi")
+
+    assert result.ok and result.attempts == 2
+    assert sleeps == [3.0]
+
+
+def test_rate_limit_above_cap_is_not_waited(stub, sleeps):
+    stub.replies = [(429, {"ok": False, "parameters": {"retry_after": 60}})]
+
+    result = _client(stub, max_retry_after=10).send_message(42, "hi")
+
+    assert (result.ok, result.error, result.status_code, result.attempts) == (False, "rate_limited", 429, 1)
+    assert sleeps == []
+
+
+def test_rate_limit_wait_can_be_disabled_per_call(stub, sleeps):
+    stub.replies = [(429, {"ok": False, "parameters": {"retry_after": 3}})]
+
+    result = _client(stub).send_message(42, "hi", max_retry_after=0)
+
+    assert (result.ok, result.error, result.retry_after, result.attempts) == (False, "rate_limited", 3.0, 1)
+    assert sleeps == []
+
+
+def test_server_errors_are_retried_with_backoff_up_to_limit(stub, sleeps):
+    stub.replies = [(502, {"ok": False})] * 5
+
+    result = _client(stub, max_retries=2, backoff=0.5).send_message(42, "hi")
+
+    assert (result.ok, result.error, result.attempts) == (False, "server_error", 3)
+    assert sleeps == [0.5, 1.0]
+
+
+def test_client_errors_are_not_retried(stub, sleeps):
+    stub.replies = [(400, {"ok": False, "description": "Bad Request: chat not found"})]
+
+    result = _client(stub).send_message(42, "hi")
+
+    assert (result.ok, result.error, result.attempts) == (False, "api_error", 1)
+    assert result.description == "Bad Request: chat not found"
+    assert sleeps == []
+
+
+def test_connection_error_is_classified(sleeps):
+    client = TelegramClient(token="T", base_url="http://127.0.0.1:9", max_retries=1)
+
+    result = client.send_message(42, "hi")
+
+    assert (result.ok, result.error, result.attempts) == (False, "connection", 2)
+
+
+def test_send_telegram_message_uses_shared_client_from_settings(stub, settings):
+    settings.TELEGRAM_BOT_TOKEN = "S"
+    settings.TELEGRAM_API_BASE_URL = f"http://127.0.0.1:{stub.server_port}"
+
+    result = send_telegram_message(7, "через настройки", reply_markup={"inline_keyboard": []})
+
+    assert result.ok and result.message_id == 1
+    assert stub.seen[0]["path"] == "/botS/sendMessage"
+    assert stub.seen[0]["body"]["reply_markup"] == {"inline_keyboard": []}
+    assert get_telegram_client() is get_telegram_client()
+
+    settings.TELEGRAM_BOT_TOKEN = ""
+    assert send_telegram_message(7, "x").error == "not_configured"
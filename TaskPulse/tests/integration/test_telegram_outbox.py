@@ -0,0 +1,266 @@
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from integrations import outbox, rate_limit
+from integrations.models import TelegramOutbox
+from integrations.tasks import dispatch_telegram_outbox
+from integrations.telegram_client import SendResult
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+@pytest.fixture
+def clock():
+    """Ведра лимитера в памяти с управляемым временем."""
+
+    now = [1000.0]
+    rate_limit.get_buckets().clock = lambda: now[0]
+    return now
+
+
+@pytest.fixture
+def telegram(monkeypatch):
+    """Заглушка отправки: отвечает из очереди replies (по умолчанию — успех)."""
+
+    stub = SimpleNamespace(sent=[], replies=[], on_send=None)
+
+    def fake_send(chat_id, text, reply_markup=None, max_retry_after=None):
+        # диспетчер не должен спать по 429 внутри клиента
+        assert max_retry_after == 0
+        stub.sent.append((chat_id, text, reply_markup))
+        if stub.on_send:
+            stub.on_send()
+        if stub.replies:
+            return stub.replies.pop(0)
+        return SendResult(ok=True, message_id=100 + len(stub.sent), attempts=1)
+
+    monkeypatch.setattr("integrations.outbox.send_telegram_message", fake_send)
+    return stub
+
+
+def _make_ready():
+    TelegramOutbox.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+
+
+def _advance(clock, seconds=1):
+    """Проходит время: часы лимитера вперёд, отметки outbox назад."""
+
+    clock[0] += seconds
+    TelegramOutbox.objects.update(
+        available_at=F("available_at") - timedelta(seconds=seconds),
+        throttled_since=F("throttled_since") - timedelta(seconds=seconds),
+    )
+
+
+def test_dispatch_sends_rows_and_marks_them_sent(clock, telegram):
+    markup = {"inline_keyboard": [[{"text": "Ок", "callback_data": "confirm_on_time:1"}]]}
+    outbox.enqueue_telegram_messages([(1, "первое", markup), (2, "второе", None)])
+
+    counts = outbox.dispatch_batch()
+
+    assert counts == {"claimed": 2, "sent": 2, "deferred": 0, "failed": 0, "lost": 0}
+    assert telegram.sent == [(1, "первое", markup), (2, "второе", None)]
+    assert list(TelegramOutbox.objects.order_by("id").values_list("status", "message_id", "attempts")) == [
+        ("sent", 101, 1),
+        ("sent", 102, 1),
+    ]
+    assert outbox.backlog_stats() == {"pending": 0, "sending": 0, "sent": 2, "failed": 0}
+
+
+def test_claim_leases_rows_until_lease_expires():
+    outbox.enqueue_telegram_message(1, "x")
+
+    assert [row[1] for row in outbox.claim_batch(10, lease_seconds=60)] == [1]
+    assert TelegramOutbox.objects.get().status == TelegramOutbox.Status.SENDING
+    assert outbox.claim_batch(10, lease_seconds=60) == []
+
+    # диспетчер умер посреди отправки — после аренды строку забирает другой
+    _make_ready()
+    assert [row[1] for row in outbox.claim_batch(10, lease_seconds=60)] == [1]
+
+
+def test_row_reclaimed_mid_batch_is_not_sent_twice(clock, telegram):
+    outbox.enqueue_telegram_messages([(1, "a", None), (2, "b", None)])
+    second = TelegramOutbox.objects.get(chat_id=2)
+    stolen = []
+
+    def takeover():
+        # пока шла первая отправка, аренда второй строки истекла и её забрал другой диспетчер
+        if not stolen:
+            TelegramOutbox.objects.filter(pk=second.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+            stolen.extend(outbox.claim_batch(10, lease_seconds=60))
+
+    telegram.on_send = takeover
+
+    counts = outbox.dispatch_batch()
+
+    assert [row[0] for row in stolen] == [second.pk]
+    assert (counts["sent"], counts["lost"]) == (1, 1)
+    assert telegram.sent == [(1, "a", None)]
+    second.refresh_from_db()
+    assert (second.status, second.available_at) == (TelegramOutbox.Status.SENDING, stolen[0][5])
+
+
+def test_outcome_is_not_written_over_foreign_lease(clock, telegram):
+    outbox.enqueue_telegram_message(1, "x")
+    row = TelegramOutbox.objects.get()
+
+    def takeover():
+        TelegramOutbox.objects.filter(pk=row.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+        outbox.claim_batch(10, lease_seconds=60)
+
+    telegram.on_send = takeover
+    telegram.replies = [SendResult(ok=False, status_code=400, error="api_error", description="chat not found")]
+
+    outbox.dispatch_batch()
+
+    row.refresh_from_db()
+    assert (row.status, row.attempts, row.last_error) == ("sending", 0, "")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_dispatchers_skip_locked_rows(monkeypatch):
+    # без обёртки теста в транзакцию on_commit сработал бы сразу
+    monkeypatch.setattr(dispatch_telegram_outbox, "delay", lambda: None)
+    outbox.enqueue_telegram_messages([(1, "a", None), (2, "b", None)])
+    first = TelegramOutbox.objects.order_by("id").first()
+    locked, release = threading.Event(), threading.Event()
+
+    def other_dispatcher():
+        with transaction.atomic():
+            TelegramOutbox.objects.select_for_update().get(pk=first.pk)
+            locked.set()
+            release.wait(5)
+        connection.close()
+
+    thread = threading.Thread(target=other_dispatcher)
+    thread.start()
+    try:
+        assert locked.wait(5)
+        claimed = outbox.claim_batch(10, lease_seconds=60)
+    finally:
+        release.set()
+        thread.join()
+
+    assert [row[1] for row in claimed] == [2]
+
+
+def test_rows_to_one_chat_are_staggered_and_throttle_counted_once(clock, telegram):
+    outbox.enqueue_telegram_messages([(7, f"msg {i}", None) for i in range(5)])
+
+    first = outbox.dispatch_batch()
+    assert (first["sent"], first["deferred"]) == (1, 4)
+    # лимитер спрошен один раз, остальные строки чата — следом с шагом 1 с
+    waits = sorted(
+        (row.available_at - timezone.now()).total_seconds()
+        for row in TelegramOutbox.objects.filter(status=TelegramOutbox.Status.PENDING)
+    )
+    assert [round(w) for w in waits] == [1, 2, 3, 4]
+    assert rate_limit.throttle_stats() == {"throttled": 0, "throttled_seconds": 0.0}
+
+    claimed = first["claimed"]
+    for _ in range(5):
+        _advance(clock)
+        claimed += outbox.dispatch_batch()["claimed"]
+
+    assert [text for _chat, text, _markup in telegram.sent] == [f"msg {i}" for i in range(5)]
+    # каждая отложенная строка забрана ещё ровно один раз
+    assert claimed == 5 + 4
+    stats = rate_limit.throttle_stats()
+    assert stats["throttled"] == 4
+    assert stats["throttled_seconds"] == pytest.approx(1 + 2 + 3 + 4, abs=0.5)
+
+
+def test_telegram_429_defers_by_retry_after_without_spending_attempt(clock, telegram):
+    telegram.replies = [SendResult(ok=False, status_code=429, error="rate_limited", retry_after=25)]
+    outbox.enqueue_telegram_message(1, "x")
+
+    assert outbox.dispatch_batch()["deferred"] == 1
+
+    row = TelegramOutbox.objects.get()
+    assert (row.status, row.attempts, row.last_error) == ("pending", 0, "rate_limited")
+    assert timedelta(seconds=20) < row.available_at - timezone.now() <= timedelta(seconds=25)
+    assert row.throttled_since is not None
+
+
+def _digest(n):
+    return f"{n} новых сообщений"
+
+
+def test_deferred_digest_keeps_collecting_messages(clock, telegram):
+    key = "task_chat:1:2"
+    outbox.enqueue_coalesced_message(7, key, 30, _digest)
+    outbox.enqueue_coalesced_message(7, key, 30, _digest)
+    rate_limit.acquire(7)  # чат только что получил сообщение — лимитер отложит сводку
+    _make_ready()
+
+    assert outbox.dispatch_batch()["deferred"] == 1
+    assert outbox.enqueue_coalesced_message(7, key, 30, _digest) == 3
+
+    row = TelegramOutbox.objects.get()
+    assert (row.status, row.coalesce_key, row.coalesced, row.text) == ("pending", key, 3, _digest(3))
+
+    _advance(clock)
+    assert outbox.dispatch_batch()["sent"] == 1
+    assert telegram.sent == [(7, _digest(3), None)]
+    assert TelegramOutbox.objects.get().coalesce_key is None
+
+
+def test_deferred_digest_yields_key_to_newer_digest(clock, telegram):
+    """Сообщение пришло во время отправки — новая сводка; отложенная остаётся без ключа."""
+
+    key = "task_chat:1:2"
+    outbox.enqueue_coalesced_message(7, key, 30, _digest)
+    _make_ready()
+    telegram.on_send = lambda: outbox.enqueue_coalesced_message(7, key, 30, _digest)
+    telegram.replies = [SendResult(ok=False, error="timeout")]
+
+    assert outbox.dispatch_batch()["deferred"] == 1
+
+    rows = list(TelegramOutbox.objects.order_by("id").values_list("status", "coalesce_key", "coalesced"))
+    assert rows == [("pending", None, 1), ("pending", key, 1)]
+
+
+def test_transient_errors_back_off_then_fail(settings, clock, telegram):
+    settings.TELEGRAM_OUTBOX_MAX_ATTEMPTS = 2
+    telegram.replies = [
+        SendResult(ok=False, error="timeout"),
+        SendResult(ok=False, status_code=502, error="server_error", description="Bad Gateway"),
+    ]
+    outbox.enqueue_telegram_message(1, "x")
+
+    outbox.dispatch_batch()
+    row = TelegramOutbox.objects.get()
+    assert (row.status, row.attempts, row.last_error) == ("pending", 1, "timeout")
+    assert row.available_at - timezone.now() > timedelta(seconds=25)
+
+    _make_ready()
+    clock[0] += 1
+    outbox.dispatch_batch()
+    row.refresh_from_db()
+    assert (row.status, row.attempts, row.last_error) == ("failed", 2, "server_error: Bad Gateway")
+
+
+def test_client_error_fails_row_immediately(clock, telegram):
+    telegram.replies = [SendResult(ok=False, status_code=400, error="api_error", description="chat not found")]
+    outbox.enqueue_telegram_message(1, "x")
+
+    assert outbox.dispatch_batch()["failed"] == 1
+    assert TelegramOutbox.objects.get().status == TelegramOutbox.Status.FAILED
+
+
+def test_dispatch_task_drains_backlog_in_batches(settings, clock, telegram):
+    settings.TELEGRAM_OUTBOX_BATCH_SIZE = 2
+    outbox.enqueue_telegram_messages([(chat, "x", None) for chat in range(1, 6)])
+
+    totals = dispatch_telegram_outbox()
+
+    assert totals["sent"] == 5
+    assert sorted(chat for chat, _text, _markup in telegram.sent) == [1, 2, 3, 4, 5]
+    assert outbox.next_ready_in() is None
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from integrations import rate_limit
+
+pytestmark = [pytest.mark.integration]
+
+
+@pytest.fixture
+def clock():
+    """Управляемое время для ведер в памяти."""
+
+    now = [1000.0]
+    rate_limit.get_buckets().clock = lambda: now[0]
+    return now
+
+
+def test_per_chat_bucket_refills_at_configured_rate(clock):
+    assert rate_limit.acquire(1) == 0
+    assert rate_limit.acquire(1) == pytest.approx(1.0)
+    assert rate_limit.acquire(2) == 0
+
+    clock[0] += 0.4
+    assert rate_limit.acquire(1) == pytest.approx(0.6)
+    clock[0] += 0.6
+    assert rate_limit.acquire(1) == 0
+
+
+def test_global_bucket_limits_across_chats(settings, clock):
+    settings.TELEGRAM_RATE_GLOBAL_PER_SECOND = 4
+    settings.TELEGRAM_RATE_GLOBAL_BURST = 3
+    rate_limit.get_buckets().clock = lambda: clock[0]
+
+    assert [rate_limit.acquire(chat) for chat in (1, 2, 3)] == [0, 0, 0]
+    assert rate_limit.acquire(4) == pytest.approx(0.25)
+    # отказ не списывает токены
+    clock[0] += 0.25
+    assert rate_limit.acquire(4) == 0
+
+
+@pytest.fixture
+def redis_url():
+    """Живой Redis для Lua-скрипта (TEST_REDIS_URL); без него тесты пропускаются."""
+
+    url = os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15")
+    if rate_limit.redis is None:
+        pytest.skip("нет пакета redis")
+    client = rate_limit.redis.Redis.from_url(url, socket_connect_timeout=0.5)
+    try:
+        client.ping()
+    except rate_limit.redis.RedisError:
+        pytest.skip(f"Redis недоступен: {url}")
+
+    def cleanup():
+        keys = list(client.scan_iter(f"{rate_limit.KEY_PREFIX}:*"))
+        if keys:
+            client.delete(*keys)
+
+    cleanup()
+    yield url
+    cleanup()
+    client.close()
+
+
+def test_redis_buckets_run_lua_script(redis_url):
+    buckets = rate_limit.RedisTokenBuckets(redis_url, (30.0, 30.0, 1.0, 1.0))
+
+    assert buckets.acquire(1) == 0
+    # время берётся из Redis (TIME): ждать почти секунду
+    assert 0.9 <= buckets.acquire(1) <= 1.0
+    assert buckets.acquire(2) == 0
+
+
+def test_redis_global_bucket_and_stats(redis_url):
+    buckets = rate_limit.RedisTokenBuckets(redis_url, (2.0, 2.0, 100.0, 100.0))
+
+    assert [buckets.acquire(chat) for chat in (1, 2)] == [0, 0]
+    assert 0.45 <= buckets.acquire(3) <= 0.5
+
+    buckets.record_throttle(1.5)
+    buckets.record_throttle(0.25)
+    assert buckets.stats() == {"throttled": 2, "throttled_seconds": 1.75}
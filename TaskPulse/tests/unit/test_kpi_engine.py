@@ -0,0 +1,85 @@
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from accounts.models import User
+from tasks.models import Task
+from tasks.services import kpi_engine
+from tasks.services.kpi import calc_user_month_kpi
+from tasks.services.kpi_engine import bulk_user_month_kpi
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+JAN, MAR = dt.date(2026, 1, 1), dt.date(2026, 3, 1)
+
+
+def _aware(y: int, m: int, d: int, hh: int = 12) -> dt.datetime:
+    return timezone.make_aware(dt.datetime(y, m, d, hh))
+
+
+@pytest.fixture
+def team():
+    creator = User.objects.create_user(email="engine_creator@example.com", password="pass12345")
+    alice = User.objects.create_user(email="engine_a@example.com", password="pass12345")
+    boris = User.objects.create_user(email="engine_b@example.com", password="pass12345")
+    idle = User.objects.create_user(email="engine_idle@example.com", password="pass12345")
+
+    for assignee, due, task_status, priority, completed in (
+            (alice, _aware(2026, 1, 5), Task.Status.DONE, Task.Priority.HIGH, _aware(2026, 1, 4)),
+            (alice, _aware(2026, 1, 31, 23), Task.Status.DONE, Task.Priority.HIGH, _aware(2026, 2, 2)),
+            (alice, _aware(2026, 2, 1, 0), Task.Status.NEW, Task.Priority.LOW, None),
+            (boris, _aware(2026, 3, 10), Task.Status.DONE, Task.Priority.MEDIUM, _aware(2026, 3, 10)),
+            (boris, _aware(2026, 3, 11), Task.Status.OVERDUE, Task.Priority.MEDIUM, None),
+            (boris, _aware(2026, 4, 1), Task.Status.NEW, Task.Priority.MEDIUM, None),  # вне диапазона
+            (None, _aware(2026, 1, 10), Task.Status.NEW, Task.Priority.MEDIUM, None),
+    ):
+        Task.objects.create(
+            title="Engine", creator=creator, assignee=assignee, due_at=due,
+            status=task_status, priority=priority, completed_at=completed,
+        )
+    # выполнена без completed_at (статус выставлен в обход save) — считается поздней
+    late = Task.objects.create(title="Raw", creator=creator, assignee=alice, due_at=_aware(2026, 1, 20))
+    Task.objects.filter(pk=late.pk).update(status=Task.Status.DONE, completed_at=None)
+    return alice, boris, idle
+
+
+def _expected(users):
+    return {
+        (user.id, f"2026-{month:02d}"): calc_user_month_kpi(user, 2026, month)
+        for user in users
+        for month in (1, 2, 3)
+    }
+
+
+@pytest.mark.parametrize("engine", ["sql", "numpy"])
+def test_engine_matches_calc_user_month_kpi(team, engine):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    alice, boris, idle = team
+
+    assert bulk_user_month_kpi(JAN, MAR, engine=engine) == _expected([alice, boris])
+    assert bulk_user_month_kpi(JAN, MAR, user_ids=[idle.id, alice.id], engine=engine) == _expected([alice, idle])
+
+
+def test_auto_engine_falls_back_to_sql_without_numpy(team, monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(kpi_engine, "np", None)
+    alice, boris, _idle = team
+
+    with django_assert_num_queries(1):
+        result = bulk_user_month_kpi(JAN, MAR)
+
+    assert result == _expected([alice, boris])
+    with pytest.raises(RuntimeError):
+        bulk_user_month_kpi(JAN, MAR, engine="numpy")
+
+
+def test_benchmark_command_compares_engines(team):
+    out = StringIO()
+
+    call_command("benchmark_kpi", "--from", "2026-01", "--to", "2026-03", "--repeat", "1", stdout=out)
+
+    assert "sql:" in out.getvalue()
+    assert "Готово." in out.getvalue()
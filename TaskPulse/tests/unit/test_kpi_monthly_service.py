@@ -49,8 +49,8 @@ def test_monthly_kpi_counts_done_on_time_and_late():
         due_at=dt(2026, 1, 20, 12, 0),
     )
 
-    Task.objects.filter(id=t1.id).update(updated_at=dt(2026, 1, 10, 11, 0))  # вовремя
-    Task.objects.filter(id=t2.id).update(updated_at=dt(2026, 1, 21, 12, 0))  # поздно
+    Task.objects.filter(id=t1.id).update(completed_at=dt(2026, 1, 10, 11, 0))  # вовремя
+    Task.objects.filter(id=t2.id).update(completed_at=dt(2026, 1, 21, 12, 0))  # поздно
 
     from tasks.services.kpi import calc_user_month_kpi
 
@@ -23,10 +23,10 @@ def _create_task(
         due_at: dt.datetime | None,
         status: str,
         priority: str,
-        updated_at: dt.datetime | None = None,
+        completed_at: dt.datetime | None = None,
 ) -> Task:
     """
-    Хелпер: создаёт задачу и (если нужно) принудительно выставляет updated_at.
+    Хелпер: создаёт задачу и (если нужно) принудительно выставляет completed_at.
     """
 
     task = Task.objects.create(
@@ -39,8 +39,8 @@ def _create_task(
         priority=priority,
     )
 
-    if updated_at is not None:
-        Task.objects.filter(pk=task.pk).update(updated_at=updated_at)
+    if completed_at is not None:
+        Task.objects.filter(pk=task.pk).update(completed_at=completed_at)
         task.refresh_from_db()
 
     return task
@@ -102,7 +102,7 @@ def test_kpi_done_on_time_vs_late(db):
         due_at=due_1,
         status=Task.Status.DONE,
         priority=Task.Priority.MEDIUM,
-        updated_at=_aware(2026, 1, 10, 11, 0),
+        completed_at=_aware(2026, 1, 10, 11, 0),
     )
 
     _create_task(
@@ -111,7 +111,7 @@ def test_kpi_done_on_time_vs_late(db):
         due_at=due_2,
         status=Task.Status.DONE,
         priority=Task.Priority.MEDIUM,
-        updated_at=_aware(2026, 1, 11, 13, 0),
+        completed_at=_aware(2026, 1, 11, 13, 0),
     )
 
     data = calc_user_month_kpi(assignee, 2026, 1)
@@ -138,7 +138,7 @@ def test_kpi_by_priority_breakdown(db):
         due_at=_aware(2026, 1, 5, 10, 0),
         status=Task.Status.DONE,
         priority=Task.Priority.LOW,
-        updated_at=_aware(2026, 1, 5, 9, 0),
+        completed_at=_aware(2026, 1, 5, 9, 0),
     )
     _create_task(
         creator=creator,
@@ -154,7 +154,7 @@ def test_kpi_by_priority_breakdown(db):
         due_at=_aware(2026, 1, 7, 10, 0),
         status=Task.Status.DONE,
         priority=Task.Priority.MEDIUM,
-        updated_at=_aware(2026, 1, 7, 11, 0),
+        completed_at=_aware(2026, 1, 7, 11, 0),
     )
 
     data = calc_user_month_kpi(assignee, 2026, 1)
@@ -200,3 +200,43 @@ def test_kpi_ignores_tasks_with_null_due_at(db):
 
     assert data["total"] == 0
     assert data["done"] == 0
+
+
+def test_kpi_is_single_query_with_month_range(db, django_assert_num_queries):
+    """Весь отчёт — один запрос, без EXTRACT по due_at."""
+
+    creator = User.objects.create_user(email="creator4@example.com", password="pass12345")
+    assignee = User.objects.create_user(email="exec4@example.com", password="pass12345")
+    for priority, _label in Task.Priority.choices:
+        _create_task(
+            creator=creator,
+            assignee=assignee,
+            due_at=_aware(2026, 1, 15),
+            status=Task.Status.DONE,
+            priority=priority,
+            completed_at=_aware(2026, 1, 14),
+        )
+
+    with django_assert_num_queries(1) as ctx:
+        data = calc_user_month_kpi(assignee, 2026, 1)
+
+    assert "EXTRACT" not in ctx.captured_queries[0]["sql"].upper()
+    assert data["done_on_time"] == len(Task.Priority.choices)
+
+
+def test_kpi_month_range_is_half_open(db):
+    """Начало месяца входит в отчёт, начало следующего — нет (включая декабрь)."""
+
+    creator = User.objects.create_user(email="creator5@example.com", password="pass12345")
+    assignee = User.objects.create_user(email="exec5@example.com", password="pass12345")
+    for due in (_aware(2025, 12, 1), _aware(2025, 12, 31, 23, 59), _aware(2026, 1, 1)):
+        _create_task(
+            creator=creator,
+            assignee=assignee,
+            due_at=due,
+            status=Task.Status.NEW,
+            priority=Task.Priority.LOW,
+        )
+
+    assert calc_user_month_kpi(assignee, 2025, 12)["total"] == 2
+    assert calc_user_month_kpi(assignee, 2026, 1)["total"] == 1
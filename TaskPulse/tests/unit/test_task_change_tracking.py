@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from tasks.models import Task, TaskChangeLog
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _task() -> Task:
+    creator = User.objects.create_user(email="track_creator@example.com", password="pass12345")
+    executor = User.objects.create_user(email="track_exec@example.com", password="pass12345")
+    task = Task.objects.create(title="Track", description="", creator=creator, assignee=executor)
+    return Task.objects.get(pk=task.pk)
+
+
+def test_save_without_tracked_changes_is_single_update():
+    """Загруженная из БД задача сохраняется одним UPDATE, без SELECT старых значений."""
+
+    task = _task()
+    task.title = "Новое название"
+
+    with CaptureQueriesContext(connection) as ctx:
+        task.save()
+
+    assert [q["sql"].split()[0] for q in ctx.captured_queries] == ["UPDATE"]
+    assert not TaskChangeLog.objects.exists()
+
+
+def test_status_change_is_logged_from_snapshot():
+    task = _task()
+    task.status = Task.Status.IN_PROGRESS
+
+    with CaptureQueriesContext(connection) as ctx:
+        task.save()
+
+    assert not any(q["sql"].startswith('SELECT "tasks_task"') for q in ctx.captured_queries)
+    log = TaskChangeLog.objects.get(task=task)
+    assert (log.field, log.old_value, log.new_value) == ("status", Task.Status.NEW, Task.Status.IN_PROGRESS)
+
+
+def test_snapshot_is_refreshed_after_save():
+    """Второе сохранение сравнивает уже с сохранённым значением."""
+
+    task = _task()
+    task.priority = Task.Priority.HIGH
+    task.save()
+    task.save()
+
+    assert TaskChangeLog.objects.filter(task=task, field="priority").count() == 1
+
+
+def test_update_fields_limits_logged_changes():
+    """Поля вне update_fields не сохраняются — и не попадают в журнал."""
+
+    task = _task()
+    task.status = Task.Status.DONE
+    task.title = "Только заголовок"
+    task.save(update_fields=["title", "updated_at"])
+
+    assert not TaskChangeLog.objects.exists()
+    assert getattr(task, "_old_status") == Task.Status.DONE
+
+
+def test_done_transition_notifies_creator(monkeypatch):
+    task = _task()
+    calls = []
+    monkeypatch.setattr("tasks.signals.notify_task_completed", lambda t: calls.append(t.pk))
+
+    task.status = Task.Status.DONE
+    task.save()
+    task.save()
+
+    assert calls == [task.pk]
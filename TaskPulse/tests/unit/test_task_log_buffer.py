@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from tasks.log_buffer import LogBuffer, buffered_logs
+from tasks.models import Task, TaskActionLog, TaskChangeLog
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _task() -> Task:
+    creator = User.objects.create_user(email="buf_creator@example.com", password="pass12345")
+    executor = User.objects.create_user(email="buf_exec@example.com", password="pass12345")
+    task = Task.objects.create(title="Buffer", description="", creator=creator, assignee=executor)
+    return Task.objects.get(pk=task.pk)
+
+
+def test_logs_outside_buffer_are_saved_immediately():
+    task = _task()
+
+    entry = TaskChangeLog.log(task, "status", "new", "done", reason="test")
+
+    assert entry.pk is not None
+    assert TaskChangeLog.objects.filter(task=task).count() == 1
+
+
+def test_save_with_three_changes_is_flushed_in_one_insert(django_capture_on_commit_callbacks):
+    """priority, status и due_at в одном save() — один INSERT в журнал после коммита."""
+
+    task = _task()
+    task.priority = Task.Priority.HIGH
+    task.status = Task.Status.IN_PROGRESS
+    task.due_at = timezone.now()
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        with buffered_logs():
+            with CaptureQueriesContext(connection) as ctx:
+                task.save()
+
+    assert not any("tasks_taskchangelog" in q["sql"] for q in ctx.captured_queries)
+    assert not TaskChangeLog.objects.exists()
+    flushes = [cb for cb in callbacks if isinstance(getattr(cb, "__self__", None), LogBuffer)]
+    assert len(flushes) == 1
+
+    with CaptureQueriesContext(connection) as flush_ctx:
+        flushes[0]()
+
+    inserts = [q for q in flush_ctx.captured_queries if q["sql"].startswith('INSERT INTO "tasks_taskchangelog"')]
+    assert len(inserts) == 1
+    assert set(TaskChangeLog.objects.filter(task=task).values_list("field", flat=True)) == {
+        "priority",
+        "status",
+        "due_at",
+    }
+
+
+def test_action_log_keeps_model_api(django_capture_on_commit_callbacks):
+    task = _task()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with buffered_logs():
+            entry = TaskActionLog.log_action(
+                task=task, action=TaskActionLog.Action.EXTEND_DUE_1D, comment="через буфер"
+            )
+            assert entry.pk is None
+
+    assert TaskActionLog.objects.get(task=task).comment == "через буфер"
+
+
+def test_empty_buffer_registers_no_callback(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with buffered_logs():
+            pass
+
+    assert callbacks == []